@@ -0,0 +1,77 @@
+"""
+Alembic environment.
+
+Runs in two modes:
+  * from the alembic CLI - builds an async engine from DATABASE_URL
+  * from app.database.init_db - reuses the connection passed in
+    config.attributes["connection"], so startup migrates on the app's engine
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+from app.database import Base
+import app.models  # noqa: F401  (register every table on Base.metadata)
+
+config = context.config
+target_metadata = Base.metadata
+
+# Search structures managed by raw DDL in migration 0007 (see app.search),
+# which autogenerate can't represent
+UNMANAGED_TABLE_PREFIX = "events_fts"
+UNMANAGED_COLUMNS = {"search_vector"}
+UNMANAGED_INDEXES = {"ix_events_search"}
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith(UNMANAGED_TABLE_PREFIX):
+        return False
+    if type_ == "column" and name in UNMANAGED_COLUMNS:
+        return False
+    if type_ == "index" and name in UNMANAGED_INDEXES:
+        return False
+    return True
+
+
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+        compare_type=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations():
+    engine = create_async_engine(get_settings().database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+def run_migrations_offline():
+    context.configure(
+        url=get_settings().database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+connection = config.attributes.get("connection")
+if context.is_offline_mode():
+    run_migrations_offline()
+elif connection is not None:
+    do_run_migrations(connection)
+else:
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
+    asyncio.run(run_async_migrations())
@@ -0,0 +1,119 @@
+"""initial schema
+
+The tables as originally created by Base.metadata.create_all. Databases
+that were created that way (before migrations existed) are stamped at this
+revision by init_db instead of re-running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("username", sa.String(100), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(255)),
+        sa.Column("trust_score", sa.Integer()),
+        sa.Column("events_hosted", sa.Integer()),
+        sa.Column("events_attended", sa.Integer()),
+        sa.Column("flake_count", sa.Integer()),
+        sa.Column("successful_events", sa.Integer()),
+        sa.Column("referral_code", sa.String(20)),
+        sa.Column("referred_by_id", sa.Integer(), nullable=True),
+        sa.Column("referral_points", sa.Integer()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("is_verified", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_referral_code", "users", ["referral_code"], unique=True)
+
+    op.create_table(
+        "events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("event_date", sa.DateTime(), nullable=False),
+        sa.Column("location_name", sa.String(255), nullable=False),
+        sa.Column("location_address", sa.String(500)),
+        sa.Column("location_notes", sa.Text()),
+        sa.Column("max_guests", sa.Integer(), nullable=False),
+        sa.Column("reserved_spots", sa.Integer()),
+        sa.Column("min_guests", sa.Integer()),
+        sa.Column("rsvp_deadline", sa.DateTime(), nullable=False),
+        sa.Column("confirmation_deadline", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.String(20)),
+        sa.Column("is_public", sa.Boolean()),
+        sa.Column("host_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_events_id", "events", ["id"])
+
+    op.create_table(
+        "event_food_items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("quantity_needed", sa.Integer()),
+        sa.Column("quantity_claimed", sa.Integer()),
+    )
+    op.create_index("ix_event_food_items_id", "event_food_items", ["id"])
+
+    op.create_table(
+        "rsvps",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), nullable=False),
+        sa.Column("food_item_id", sa.Integer(), sa.ForeignKey("event_food_items.id"), nullable=True),
+        sa.Column("status", sa.String(20)),
+        sa.Column("guest_count", sa.Integer()),
+        sa.Column("message", sa.Text()),
+        sa.Column("bringing_food_item", sa.String(255)),
+        sa.Column("food_notes", sa.Text()),
+        sa.Column("is_reserved", sa.Boolean()),
+        sa.Column("invited_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("confirmed_at", sa.DateTime(), nullable=True),
+        sa.Column("attended_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_rsvps_id", "rsvps", ["id"])
+
+    op.create_table(
+        "referrals",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("referrer_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("referred_user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("referral_code_used", sa.String(20), nullable=False),
+        sa.Column("bonus_awarded", sa.Boolean()),
+        sa.Column("bonus_amount", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("bonus_awarded_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_referrals_id", "referrals", ["id"])
+
+
+def downgrade():
+    op.drop_table("referrals")
+    op.drop_table("rsvps")
+    op.drop_table("event_food_items")
+    op.drop_table("events")
+    op.drop_table("users")
@@ -0,0 +1,38 @@
+"""composite indexes for the router query patterns
+
+  rsvps(event_id, status)              event RSVP lists, duplicate checks, counts
+  rsvps(user_id, created_at)           my-rsvps, newest first
+  rsvps(user_id, is_reserved, status)  my-invites
+  events(is_public, status, event_date, id)  public event list + keyset cursor
+  events(host_id, event_date, id)      my-events + keyset cursor
+  referrals(referrer_id, created_at)   referral stats and the per-user limit
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_rsvps_event_id_status", "rsvps", ["event_id", "status"])
+    op.create_index("ix_rsvps_user_id_created_at", "rsvps", ["user_id", "created_at"])
+    op.create_index("ix_rsvps_user_id_is_reserved_status", "rsvps", ["user_id", "is_reserved", "status"])
+    op.create_index("ix_events_is_public_status_event_date", "events", ["is_public", "status", "event_date", "id"])
+    op.create_index("ix_events_host_id_event_date", "events", ["host_id", "event_date", "id"])
+    op.create_index("ix_referrals_referrer_id_created_at", "referrals", ["referrer_id", "created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_referrals_referrer_id_created_at", table_name="referrals")
+    op.drop_index("ix_events_host_id_event_date", table_name="events")
+    op.drop_index("ix_events_is_public_status_event_date", table_name="events")
+    op.drop_index("ix_rsvps_user_id_is_reserved_status", table_name="rsvps")
+    op.drop_index("ix_rsvps_user_id_created_at", table_name="rsvps")
+    op.drop_index("ix_rsvps_event_id_status", table_name="rsvps")
@@ -0,0 +1,53 @@
+"""denormalized RSVP counters on events
+
+Adds the counter columns maintained by app.event_counters and backfills them
+from rsvps. Databases created by create_all after the columns were added to
+the model already have them, so existing columns are skipped.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = ("pending_rsvp_count", "confirmed_rsvp_count", "active_guest_count")
+
+
+def upgrade():
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("events")}
+    missing = [name for name in COUNTER_COLUMNS if name not in existing]
+    if missing:
+        with op.batch_alter_table("events") as batch_op:
+            for name in missing:
+                batch_op.add_column(sa.Column(name, sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute(
+        """
+        UPDATE events SET
+            pending_rsvp_count = (
+                SELECT count(*) FROM rsvps
+                WHERE rsvps.event_id = events.id AND rsvps.status = 'pending'
+            ),
+            confirmed_rsvp_count = (
+                SELECT count(*) FROM rsvps
+                WHERE rsvps.event_id = events.id AND rsvps.status = 'confirmed'
+            ),
+            active_guest_count = (
+                SELECT coalesce(sum(coalesce(rsvps.guest_count, 1)), 0) FROM rsvps
+                WHERE rsvps.event_id = events.id AND rsvps.status IN ('pending', 'confirmed')
+            )
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("events") as batch_op:
+        for name in reversed(COUNTER_COLUMNS):
+            batch_op.drop_column(name)
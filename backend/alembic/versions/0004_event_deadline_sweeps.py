@@ -0,0 +1,60 @@
+"""deadline flags and indexes for the scheduler sweeps
+
+  events.rsvps_closed, events.needs_completion   flags set by app.scheduler
+  events(rsvps_closed, rsvp_deadline)            close-RSVPs sweep
+  events(status, confirmation_deadline)          auto-cancel sweep
+  events(status, needs_completion, event_date)   needs-completion sweep
+
+Existing rows are backfilled so the first sweep has nothing to catch up on.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("events") as batch_op:
+        batch_op.add_column(sa.Column("rsvps_closed", sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.add_column(sa.Column("needs_completion", sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    events = sa.table(
+        "events",
+        sa.column("rsvps_closed", sa.Boolean()),
+        sa.column("needs_completion", sa.Boolean()),
+        sa.column("rsvp_deadline", sa.DateTime()),
+        sa.column("event_date", sa.DateTime()),
+        sa.column("status", sa.String()),
+    )
+    now = datetime.utcnow()  # Columns hold naive UTC
+    op.execute(events.update().where(events.c.rsvp_deadline <= now).values(rsvps_closed=True))
+    op.execute(
+        events.update()
+        .where(events.c.status == "confirmed", events.c.event_date <= now)
+        .values(needs_completion=True)
+    )
+
+    op.create_index("ix_events_rsvps_closed_rsvp_deadline", "events", ["rsvps_closed", "rsvp_deadline"])
+    op.create_index("ix_events_status_confirmation_deadline", "events", ["status", "confirmation_deadline"])
+    op.create_index(
+        "ix_events_status_needs_completion_event_date", "events", ["status", "needs_completion", "event_date"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_events_status_needs_completion_event_date", table_name="events")
+    op.drop_index("ix_events_status_confirmation_deadline", table_name="events")
+    op.drop_index("ix_events_rsvps_closed_rsvp_deadline", table_name="events")
+    with op.batch_alter_table("events") as batch_op:
+        batch_op.drop_column("needs_completion")
+        batch_op.drop_column("rsvps_closed")
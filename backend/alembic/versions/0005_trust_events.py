@@ -0,0 +1,67 @@
+"""trust ledger
+
+  trust_events                      append-only log of reputation changes
+  trust_events(user_id, id)         per-user replay in ledger order
+
+Every existing user gets an opening_balance row holding their current
+counters, so replaying the ledger reproduces today's values.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+COUNTERS = [
+    ("trust_score", "trust_delta"),
+    ("events_attended", "events_attended_delta"),
+    ("flake_count", "flake_count_delta"),
+    ("events_hosted", "events_hosted_delta"),
+    ("successful_events", "successful_events_delta"),
+    ("referral_points", "referral_points_delta"),
+]
+
+
+def upgrade():
+    trust_events = op.create_table(
+        "trust_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("kind", sa.String(length=30), nullable=False),
+        *(
+            sa.Column(delta, sa.Integer(), nullable=False, server_default="0")
+            for _, delta in COUNTERS
+        ),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), nullable=True),
+        sa.Column("rsvp_id", sa.Integer(), sa.ForeignKey("rsvps.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_trust_events_user_id_id", "trust_events", ["user_id", "id"])
+
+    users = sa.table("users", sa.column("id", sa.Integer()), *(sa.column(c, sa.Integer()) for c, _ in COUNTERS))
+    now = datetime.utcnow()  # Columns hold naive UTC
+    op.execute(
+        trust_events.insert().from_select(
+            ["user_id", "kind", *(delta for _, delta in COUNTERS), "created_at"],
+            sa.select(
+                users.c.id,
+                sa.literal("opening_balance"),
+                *(sa.func.coalesce(users.c[column], 0) for column, _ in COUNTERS),
+                sa.literal(now, sa.DateTime()),
+            ).order_by(users.c.id),
+        )
+    )
+
+
+def downgrade():
+    op.drop_index("ix_trust_events_user_id_id", table_name="trust_events")
+    op.drop_table("trust_events")
@@ -0,0 +1,92 @@
+"""full-text search over events
+
+SQLite:
+  events_fts                  external-content FTS5 table over events
+                              (title, description, location_name, location_address)
+  events_fts_ai/_ad/_au       triggers keeping it in sync with events
+
+PostgreSQL:
+  events.search_vector        stored generated tsvector of the same columns,
+                              weighted title > location > description
+  ix_events_search            GIN index on it
+
+The update trigger only fires when an indexed column changes, so counter
+and deadline updates never touch the index. SQLite drops triggers along with
+their table, so a later migration that recreates events in batch mode must
+create them again (SQLITE_TRIGGERS below).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "title, description, location_name, location_address"
+
+SQLITE_TRIGGERS = {
+    "events_fts_ai": f"""
+        CREATE TRIGGER events_fts_ai AFTER INSERT ON events BEGIN
+            INSERT INTO events_fts (rowid, {COLUMNS})
+            VALUES (new.id, new.title, new.description, new.location_name, new.location_address);
+        END
+    """,
+    "events_fts_ad": f"""
+        CREATE TRIGGER events_fts_ad AFTER DELETE ON events BEGIN
+            INSERT INTO events_fts (events_fts, rowid, {COLUMNS})
+            VALUES ('delete', old.id, old.title, old.description, old.location_name, old.location_address);
+        END
+    """,
+    "events_fts_au": f"""
+        CREATE TRIGGER events_fts_au AFTER UPDATE OF {COLUMNS} ON events BEGIN
+            INSERT INTO events_fts (events_fts, rowid, {COLUMNS})
+            VALUES ('delete', old.id, old.title, old.description, old.location_name, old.location_address);
+            INSERT INTO events_fts (rowid, {COLUMNS})
+            VALUES (new.id, new.title, new.description, new.location_name, new.location_address);
+        END
+    """,
+}
+
+EVENT_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(location_name, '') || ' ' || "
+    "coalesce(location_address, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')"
+)
+
+
+def create_sqlite_triggers():
+    for ddl in SQLITE_TRIGGERS.values():
+        op.execute(ddl)
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            f"CREATE VIRTUAL TABLE events_fts USING fts5({COLUMNS}, "
+            "content='events', content_rowid='id', "
+            "tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        create_sqlite_triggers()
+        op.execute("INSERT INTO events_fts (events_fts) VALUES ('rebuild')")
+    else:
+        op.execute(
+            f"ALTER TABLE events ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({EVENT_SEARCH_VECTOR_SQL}) STORED"
+        )
+        op.execute("CREATE INDEX ix_events_search ON events USING gin (search_vector)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS events_fts")
+    else:
+        op.execute("DROP INDEX IF EXISTS ix_events_search")
+        op.execute("ALTER TABLE events DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,38 @@
+"""event coordinates and geohash index for area searches
+
+  events.latitude, events.longitude   coordinates of the address (nullable)
+  events.geohash                      9-character geohash of the point (app.geo)
+  events(geohash)                     area searches as geohash range scans
+
+The columns are added with plain ALTER TABLE (not batch mode), so SQLite
+keeps the events table and the full-text triggers from 0007 in place.
+Existing events stay unlocated until geocode_events.py has run.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("events", sa.Column("latitude", sa.Float(), nullable=True))
+    op.add_column("events", sa.Column("longitude", sa.Float(), nullable=True))
+    op.add_column("events", sa.Column("geohash", sa.String(length=12), nullable=True))
+    op.create_index("ix_events_geohash", "events", ["geohash"])
+
+
+def downgrade():
+    op.drop_index("ix_events_geohash", table_name="events")
+    # Drop the columns without recreating events on SQLite (3.35+), which
+    # would lose the full-text triggers
+    op.drop_column("events", "geohash")
+    op.drop_column("events", "longitude")
+    op.drop_column("events", "latitude")
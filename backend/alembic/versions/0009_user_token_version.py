@@ -0,0 +1,38 @@
+"""token version on users, for revoking tokens without a per-request read
+
+  users.token_version    tokens carry it as their "ver" claim; bumping it
+                         revokes every token issued before
+  ix_users_revoked       partial index over the users whose tokens are
+                         refused (inactive or token_version > 0), read by
+                         app.revocation
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+REVOKED_USERS_PREDICATE = "is_active IS NOT TRUE OR token_version > 0"
+
+
+def upgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"))
+    op.create_index(
+        "ix_users_revoked", "users", ["id", "token_version"],
+        sqlite_where=sa.text(REVOKED_USERS_PREDICATE),
+        postgresql_where=sa.text(REVOKED_USERS_PREDICATE),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_users_revoked", table_name="users")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
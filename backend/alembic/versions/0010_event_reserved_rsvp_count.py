@@ -0,0 +1,39 @@
+"""reserved invite counter on events
+
+Adds events.reserved_rsvp_count (pending/confirmed invites), which lets
+invites take a reserved spot with one conditional UPDATE, and backfills it
+from rsvps.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("events") as batch_op:
+        batch_op.add_column(sa.Column("reserved_rsvp_count", sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute(
+        """
+        UPDATE events SET reserved_rsvp_count = (
+            SELECT count(*) FROM rsvps
+            WHERE rsvps.event_id = events.id
+              AND rsvps.is_reserved = true
+              AND rsvps.status IN ('pending', 'confirmed')
+        )
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("events") as batch_op:
+        batch_op.drop_column("reserved_rsvp_count")
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
@@ -5,10 +9,13 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.config import get_settings
 from app.database import get_db
+from app.cache import user_cache
+from app.revocation import token_revocations
 from app.models.user import User
 from app.schemas.user import TokenData
 
@@ -30,6 +37,85 @@ def get_password_hash(password: str) -> str:
     ).decode('utf-8')
 
 
+class PasswordHasher:
+    """Runs bcrypt in a bounded thread pool so hashing never blocks the event loop.
+
+    bcrypt releases the GIL, so the workers hash in parallel. At most
+    `max_pending` calls may be queued or running; beyond that callers get a
+    503 instead of piling more work behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0  # Submitted and not yet finished (queued + running)
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _call(self, fn, *args):
+        with self._lock:
+            self.running += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.busy_seconds += time.perf_counter() - start
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-ins in progress, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), self._call, fn, *args)
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "queue_depth": max(0, self.pending - self.running),
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "busy_seconds": round(self.busy_seconds, 3),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_max_pending)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -41,32 +127,122 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def _user_snapshot(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+async def load_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Load a user by id, going through the short-lived user cache.
+
+    A cached snapshot is attached to the session without a SELECT, so callers
+    get a normal persistent User they can modify and commit.
+    """
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        user_cache.set(user_id, _user_snapshot(user))
+    return user
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    """Remember users whose rows this transaction wrote"""
+    changed = [obj.id for obj in list(session.dirty) + list(session.deleted) if isinstance(obj, User)]
+    if changed:
+        session.info.setdefault("changed_user_ids", set()).update(changed)
+
+
+def mark_users_changed(db: AsyncSession, user_ids):
+    """Record users written by Core UPDATEs (which the flush hook can't see)
+    so their cached snapshots are dropped when the transaction commits"""
+    db.info.setdefault("changed_user_ids", set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    """Drop cached snapshots once the new values are committed"""
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _inactive_user_exception() -> HTTPException:
+    return HTTPException(status_code=400, detail="Inactive user")
+
+
+def decode_access_token(token: str) -> dict:
+    """Verified claims of an access token; 401 if it is invalid or expired"""
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         user_id_str = payload.get("sub")
         if user_id_str is None:
-            raise credentials_exception
-        user_id = int(user_id_str)
-        token_data = TokenData(user_id=user_id)
-    except (JWTError, ValueError):
-        raise credentials_exception
+            raise _credentials_exception()
+        token_data = TokenData(user_id=int(user_id_str))
+        token_version = int(payload.get("ver", 0))
+    except (JWTError, ValueError, TypeError):
+        raise _credentials_exception()
+    return {**payload, "user_id": token_data.user_id, "ver": token_version}
 
-    result = await db.execute(select(User).where(User.id == token_data.user_id))
-    user = result.scalar_one_or_none()
 
-    if user is None:
-        raise credentials_exception
+class Principal:
+    """The user a verified token speaks for: its id and claims, no database row"""
+    __slots__ = ("user_id", "token_version", "claims")
+
+    def __init__(self, user_id: int, token_version: int, claims: dict):
+        self.user_id = user_id
+        self.token_version = token_version
+        self.claims = claims
+
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    """Authenticate from the token alone, for endpoints that only need the user id.
+
+    Unlike get_current_user this never reads the users table. Deactivated
+    users and revoked tokens are refused through app.revocation, which is as
+    fresh as its last refresh (token_revocation_refresh_seconds).
+    """
+    claims = decode_access_token(token)
+    principal = Principal(claims["user_id"], claims["ver"], claims)
+
+    await token_revocations.ensure_loaded()
+    if token_revocations.is_revoked(principal.user_id, principal.token_version):
+        raise _credentials_exception()
+    if token_revocations.is_inactive(principal.user_id):
+        raise _inactive_user_exception()
+
+    return principal
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    claims = decode_access_token(token)
+
+    user = await load_user(db, claims["user_id"])
+
+    if user is None or claims["ver"] < user.token_version:
+        raise _credentials_exception()
     if not user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
+        raise _inactive_user_exception()
 
     return user
 
@@ -82,3 +258,10 @@ async def get_current_user_optional(
         return await get_current_user(token, db)
     except HTTPException:
         return None
+
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Require an authenticated admin (users.is_admin)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
@@ -9,10 +9,33 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite+aiosqlite:///./foodmaxxer.db"
 
+    # Connection pool (server databases such as postgresql+asyncpg)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30  # Seconds to wait for a free connection
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced
+
+    # SQL logging and per-request profiling (see app.profiling). Both are off
+    # unless enabled here, whatever debug is
+    sql_echo: bool = False  # Log every statement as it runs (very verbose)
+    sql_profiling_enabled: bool = False
+    sql_profiling_server_timing: bool = False  # Also send each request's SQL time as a Server-Timing header
+    sql_slow_query_ms: int = 100  # A single statement slower than this is logged
+    sql_repeated_statement_threshold: int = 5  # Same statement this often in one request: likely N+1
+
+    # SQLite
+    sqlite_busy_timeout_ms: int = 5000  # How long a writer waits for the lock
+
     # JWT Settings
     secret_key: str = "your-secret-key-change-in-production-use-env-var"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24 * 7  # 7 days
+    token_revocation_refresh_seconds: int = 30  # How often deactivated users and revoked tokens are reloaded
+
+    # Password hashing (bcrypt runs in a worker pool, off the event loop)
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64  # Further logins get 503 until the queue drains
 
     # Referral Settings
     referral_bonus_points: int = 100
@@ -25,6 +48,35 @@ class Settings(BaseSettings):
     # Event Settings
     min_days_before_event_to_confirm: int = 3
 
+    # Deadline scheduler (closes RSVPs, auto-cancels, flags events to complete)
+    scheduler_enabled: bool = True
+    scheduler_interval_seconds: int = 60
+
+    # Proxies whose X-Forwarded-Proto/For are trusted: comma-separated
+    # addresses or networks, "*" for any. Local only by default, as in
+    # uvicorn; deployments name their proxy (cloudbuild.yaml for Cloud Run)
+    forwarded_allow_ips: str = "127.0.0.1"
+
+    # Prometheus metrics at GET /metrics (per route, DB, caches, scheduler)
+    metrics_enabled: bool = True
+
+    # Geocoding of event addresses: "offline" (no network) or "nominatim"
+    geocoder: str = "offline"
+    geocoder_url: str = "https://nominatim.openstreetmap.org"
+    geocoder_user_agent: str = "FoodShare/1.0"
+    geocoder_timeout_seconds: float = 3.0
+
+    # Streaming exports
+    export_batch_size: int = 200  # Events fetched (with their RSVPs and food items) per round trip
+
+    # Caching
+    event_cache_enabled: bool = True
+    event_cache_size: int = 2048  # Event detail responses kept in memory
+    event_cache_ttl_seconds: int = 30
+    user_cache_enabled: bool = True
+    user_cache_size: int = 10000  # Authenticated users kept in memory
+    user_cache_ttl_seconds: int = 15
+
     class Config:
         env_file = ".env"
 
@@ -1,13 +1,64 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import os
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.config import get_settings
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-)
+
+def engine_options(database_url: str) -> dict:
+    """Engine keyword arguments for the database's dialect.
+
+    SQLite is a single file with one writer, so the default pool is kept and
+    lock waits are handled by busy_timeout (see _configure_sqlite). Server
+    databases get a sized pool that checks and recycles its connections.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+def make_engine(database_url: str) -> AsyncEngine:
+    """Async engine for database_url, sized and configured for its dialect"""
+    new_engine = create_async_engine(
+        database_url,
+        echo=settings.sql_echo,
+        **engine_options(database_url),
+    )
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return new_engine
+    file_backed = url.database not in (None, "", ":memory:")
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        """WAL lets readers run alongside the writer; busy_timeout makes a
+        writer wait for the lock instead of failing with 'database is locked'"""
+        cursor = dbapi_connection.cursor()
+        if file_backed:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.close()
+
+    return new_engine
+
+
+engine = make_engine(settings.database_url)
+
+
+def is_sqlite(bind=engine) -> bool:
+    """True when the engine or connection (or session.bind) talks to SQLite"""
+    return bind.dialect.name == "sqlite"
+
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -28,6 +79,27 @@ async def get_db():
             await session.close()
 
 
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+# Schema as created by create_all before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def run_migrations(connection):
+    """Upgrade the database to the latest Alembic revision"""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["connection"] = connection
+
+    tables = inspect(connection).get_table_names()
+    if "users" in tables and "alembic_version" not in tables:
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, "head")
+
+
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
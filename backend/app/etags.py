@@ -0,0 +1,97 @@
+"""
+Entity tags for conditional GETs.
+
+Read endpoints send a strong ETag derived from the rows behind the response
+(updated_at values, counters or the projected row values) and answer a
+matching If-None-Match with 304 before the response model is built.
+Responses carry Cache-Control: no-cache so browsers keep the body and
+revalidate on every fetch.
+
+The event detail validator is events.updated_at plus the host's
+users.updated_at. Every UPDATE of either row bumps it (onupdate), so a
+change to the host's trust score shows without touching their events.
+touch_events covers detail fields stored in other tables (food items) and
+drops the touched events' cached details (app.cache) once the transaction
+commits; mark_hosts_changed drops the cached details of a host's events the
+same way, from memory alone.
+"""
+import hashlib
+from datetime import datetime
+
+from fastapi import Request, Response
+from sqlalchemy import update, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.cache import event_response_cache
+from app.models.event import Event
+from app.serialization import dumps
+
+PUBLIC_CACHE_CONTROL = "no-cache"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag over plain values (ids, datetimes, counters, row tuples)"""
+    digest = hashlib.blake2b(dumps(parts), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match lists this ETag (weak comparison, per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str = PUBLIC_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def set_etag(response: Response, etag: str, cache_control: str = PUBLIC_CACHE_CONTROL):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def tagged_json_response(body: bytes, etag: str, cache_control: str = PUBLIC_CACHE_CONTROL) -> Response:
+    """A pre-serialized JSON body with its ETag"""
+    response = Response(content=body, media_type="application/json")
+    set_etag(response, etag, cache_control)
+    return response
+
+
+async def touch_events(db: AsyncSession, *criteria):
+    """Bump updated_at on matching events so their detail ETag changes, and
+    drop their cached details when the transaction commits"""
+    result = await db.execute(
+        update(Event)
+        .where(*criteria)
+        .values(updated_at=datetime.utcnow())
+        .returning(Event.id)
+        .execution_options(synchronize_session=False)
+    )
+    db.info.setdefault("touched_event_ids", set()).update(result.scalars().all())
+
+
+def mark_hosts_changed(db: AsyncSession, user_ids):
+    """Drop the cached details of events hosted by these users when the
+    transaction commits (their trust score is part of the details)"""
+    db.info.setdefault("changed_host_ids", set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_touched_events(session):
+    for event_id in session.info.pop("touched_event_ids", ()):
+        event_response_cache.invalidate(event_id)
+    host_ids = session.info.pop("changed_host_ids", None)
+    if host_ids:
+        event_response_cache.invalidate_where(lambda entry: entry[2] in host_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_touched_events(session):
+    session.info.pop("touched_event_ids", None)
+    session.info.pop("changed_host_ids", None)
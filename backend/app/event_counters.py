@@ -0,0 +1,211 @@
+"""
+Denormalized RSVP counters on events.
+
+Every write that moves an RSVP into or out of the pending/confirmed states
+adjusts the owning event's counters with a single atomic UPDATE in the
+caller's transaction, so readers never need to load an event's RSVPs to
+know how full it is.
+
+Admission uses the same counters: an RSVP takes its guests' spots with one
+conditional UPDATE that only matches while the event is open and has room,
+so concurrent RSVPs can't overbook it and nothing is locked. Capacity is
+counted in guests (active_guest_count), not RSVPs, and any other change
+that adds guests (a larger guest_count, a declined RSVP confirmed again)
+goes through the same guard.
+
+Invites hold reserved spots instead: reserved RSVPs are also counted in
+reserved_rsvp_count, and a change that adds reserved RSVPs is guarded
+against reserved_spots rather than the public capacity.
+"""
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select, update, func, case, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.event import Event, EventStatus
+from app.models.rsvp import RSVP, RSVPStatus
+
+ACTIVE_STATUSES = (RSVPStatus.PENDING.value, RSVPStatus.CONFIRMED.value)
+RECOMPUTE_BATCH_SIZE = 1000
+
+_STATUS_COLUMNS = {
+    RSVPStatus.PENDING.value: "pending_rsvp_count",
+    RSVPStatus.CONFIRMED.value: "confirmed_rsvp_count",
+}
+
+# SQL mirror of Event.available_spots, for filtering in the database
+AVAILABLE_SPOTS = (
+    Event.max_guests
+    - func.coalesce(Event.reserved_spots, 0)
+    - Event.active_guest_count
+)
+
+
+def counter_deltas(
+    old_status: Optional[str],
+    new_status: Optional[str],
+    old_guest_count: int = 1,
+    new_guest_count: Optional[int] = None,
+    reserved: bool = False,
+) -> Dict[str, int]:
+    """Counter changes for an RSVP moving from old_status to new_status.
+
+    A status of None means the RSVP doesn't exist on that side (creation).
+    Pass reserved for invites so reserved_rsvp_count follows them too.
+    """
+    if new_guest_count is None:
+        new_guest_count = old_guest_count
+
+    deltas: Dict[str, int] = {}
+    if old_status in _STATUS_COLUMNS:
+        column = _STATUS_COLUMNS[old_status]
+        deltas[column] = deltas.get(column, 0) - 1
+        deltas["active_guest_count"] = deltas.get("active_guest_count", 0) - (old_guest_count or 1)
+        if reserved:
+            deltas["reserved_rsvp_count"] = deltas.get("reserved_rsvp_count", 0) - 1
+    if new_status in _STATUS_COLUMNS:
+        column = _STATUS_COLUMNS[new_status]
+        deltas[column] = deltas.get(column, 0) + 1
+        deltas["active_guest_count"] = deltas.get("active_guest_count", 0) + (new_guest_count or 1)
+        if reserved:
+            deltas["reserved_rsvp_count"] = deltas.get("reserved_rsvp_count", 0) + 1
+
+    return {column: delta for column, delta in deltas.items() if delta}
+
+
+def _counter_values(deltas: Dict[str, int]) -> dict:
+    return {
+        column: getattr(Event, column) + delta
+        for column, delta in deltas.items()
+    }
+
+
+async def apply_counter_deltas(db: AsyncSession, event_id: int, deltas: Dict[str, int]):
+    """Apply precomputed counter deltas to one event"""
+    if not deltas:
+        return
+    await db.execute(update(Event).where(Event.id == event_id).values(**_counter_values(deltas)))
+
+
+async def apply_counter_deltas_if_room(
+    db: AsyncSession,
+    event_id: int,
+    deltas: Dict[str, int],
+    open_only: bool = False,
+) -> bool:
+    """Apply counter deltas unless the guests they add don't fit.
+
+    Checks capacity and applies the deltas in the same UPDATE; returns False
+    (and changes nothing) when the event lacks room for the added guests or,
+    with open_only, is no longer open. Deltas that add reserved RSVPs are
+    checked against reserved_spots instead of the public capacity. Deltas
+    that add no guests always fit.
+    """
+    if not deltas:
+        return True
+    conditions = [Event.id == event_id]
+    if open_only:
+        conditions.append(Event.status == EventStatus.OPEN.value)
+    added_reserved = deltas.get("reserved_rsvp_count", 0)
+    added_guests = deltas.get("active_guest_count", 0)
+    if added_reserved > 0:
+        conditions.append(Event.reserved_rsvp_count + added_reserved <= func.coalesce(Event.reserved_spots, 0))
+    elif added_guests > 0:
+        conditions.append(AVAILABLE_SPOTS >= added_guests)
+
+    result = await db.execute(
+        update(Event)
+        .where(*conditions)
+        .values(**_counter_values(deltas))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def admit_rsvp(
+    db: AsyncSession,
+    event_id: int,
+    guest_count: int = 1,
+    status: str = RSVPStatus.PENDING.value,
+) -> bool:
+    """Take the spots for a new RSVP's guests if the event is open and has room.
+
+    Returns False (and changes nothing) when the event is full or no longer open.
+    """
+    deltas = counter_deltas(None, status, guest_count)
+    return await apply_counter_deltas_if_room(db, event_id, deltas, open_only=True)
+
+
+async def apply_rsvp_transition(
+    db: AsyncSession,
+    event_id: int,
+    old_status: Optional[str],
+    new_status: Optional[str],
+    old_guest_count: int = 1,
+    new_guest_count: Optional[int] = None,
+    reserved: bool = False,
+):
+    """Keep the event's counters in step with one RSVP change"""
+    deltas = counter_deltas(old_status, new_status, old_guest_count, new_guest_count, reserved)
+    await apply_counter_deltas(db, event_id, deltas)
+
+
+async def reset_event_counters(db: AsyncSession, event_id: int):
+    """Zero the counters (used when every active RSVP is cancelled at once)"""
+    await db.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(pending_rsvp_count=0, confirmed_rsvp_count=0, active_guest_count=0, reserved_rsvp_count=0)
+    )
+
+
+async def recompute_event_counters(db: AsyncSession, event_ids: Optional[Iterable[int]] = None) -> int:
+    """Rebuild counters from the rsvps table. Returns the number of events reset.
+
+    Counts come from one grouped pass over rsvps and are written back with a
+    primary-key executemany, after zeroing the events in scope (events with
+    no active RSVPs have no group).
+    """
+    if event_ids is not None:
+        event_ids = list(event_ids)
+
+    reset = update(Event).values(
+        pending_rsvp_count=0, confirmed_rsvp_count=0, active_guest_count=0, reserved_rsvp_count=0
+    )
+    if event_ids is not None:
+        reset = reset.where(Event.id.in_(event_ids))
+    result = await db.execute(reset.execution_options(synchronize_session=False))
+
+    counts = (
+        select(
+            RSVP.event_id,
+            func.sum(case((RSVP.status == RSVPStatus.PENDING.value, 1), else_=0)),
+            func.sum(case((RSVP.status == RSVPStatus.CONFIRMED.value, 1), else_=0)),
+            func.sum(func.coalesce(RSVP.guest_count, 1)),
+            func.sum(case((RSVP.is_reserved == True, 1), else_=0)),
+        )
+        .where(RSVP.status.in_(ACTIVE_STATUSES))
+        .group_by(RSVP.event_id)
+    )
+    if event_ids is not None:
+        counts = counts.where(RSVP.event_id.in_(event_ids))
+    rows = [
+        {"b_id": event_id, "pending": pending, "confirmed": confirmed, "guests": guests, "reserved": reserved}
+        for event_id, pending, confirmed, guests, reserved in (await db.execute(counts)).all()
+    ]
+
+    events = Event.__table__
+    stmt = (
+        events.update()
+        .where(events.c.id == bindparam("b_id"))
+        .values(
+            pending_rsvp_count=bindparam("pending"),
+            confirmed_rsvp_count=bindparam("confirmed"),
+            active_guest_count=bindparam("guests"),
+            reserved_rsvp_count=bindparam("reserved"),
+        )
+    )
+    for start in range(0, len(rows), RECOMPUTE_BATCH_SIZE):
+        await db.execute(stmt, rows[start:start + RECOMPUTE_BATCH_SIZE])
+
+    return result.rowcount
@@ -0,0 +1,63 @@
+"""
+Food item claims.
+
+A claim is a single guarded UPDATE: the row is only incremented while
+quantity_claimed < quantity_needed, so concurrent RSVPs can't over-claim an
+item or lose each other's increments, and no row is locked or re-read. The
+affected row count says whether the claim won.
+"""
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.event import EventFoodItem
+
+
+async def claim_food_item(db: AsyncSession, event_id: int, food_item_id: int):
+    """Claim one unit of a food item, raising 400 if it's missing or fully claimed"""
+    result = await db.execute(
+        update(EventFoodItem)
+        .where(
+            EventFoodItem.id == food_item_id,
+            EventFoodItem.event_id == event_id,
+            EventFoodItem.quantity_claimed < EventFoodItem.quantity_needed,
+        )
+        .values(quantity_claimed=EventFoodItem.quantity_claimed + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        return
+
+    # Lost the race or bad id; only the failure path pays for this lookup
+    exists = await db.execute(
+        select(EventFoodItem.id).where(
+            EventFoodItem.id == food_item_id,
+            EventFoodItem.event_id == event_id,
+        )
+    )
+    if exists.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Food item not found for this event"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="This food item has already been fully claimed"
+    )
+
+
+async def release_food_item(db: AsyncSession, food_item_id: Optional[int]):
+    """Give back one unit of a claim (never below zero)"""
+    if food_item_id is None:
+        return
+    await db.execute(
+        update(EventFoodItem)
+        .where(
+            EventFoodItem.id == food_item_id,
+            EventFoodItem.quantity_claimed > 0,
+        )
+        .values(quantity_claimed=EventFoodItem.quantity_claimed - 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,155 @@
+"""
+Geohash spatial index for events.
+
+Each located event stores latitude, longitude and the 9-character geohash of
+the point (a cell of about 5 x 5 m). Points in the same cell share a prefix,
+and a cell is a contiguous range of geohash strings, so an area query is a
+handful of range scans on the plain B-tree index ix_events_geohash. That
+works the same on SQLite and PostgreSQL, with no extension needed.
+
+An area search:
+  1. covers the bounding box with at most MAX_COVER_CELLS cells of the
+     finest precision that fits, merging adjacent cells into one range
+  2. filters the candidates to the box (and, for a radius, the circle)
+  3. orders them by distance from the reference point
+
+Distances use the equirectangular approximation, which needs only arithmetic
+in SQL. It is well within 1% of the great-circle distance at the radii this
+app allows. Boxes do not wrap across the antimeridian.
+"""
+import math
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+from app.models.event import Event
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+MAX_COVER_CELLS = 16
+
+KM_PER_DEGREE = math.pi / 180 * 6371.0  # Along a meridian (mean Earth radius)
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash of a point (bits alternate longitude, latitude)"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        rng, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of a geohash cell in degrees"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def _cell_indexes(low: float, high: float, origin: float, size: float, count: int) -> range:
+    first = int((low - origin) // size)
+    last = int((high - origin) // size)
+    return range(max(first, 0), min(last, count - 1) + 1)
+
+
+def covering_cells(south: float, west: float, north: float, east: float) -> List[str]:
+    """Geohash cells covering a bounding box, at the finest precision that
+    needs no more than MAX_COVER_CELLS of them. Empty when even single
+    characters need more (a box spanning much of the globe)."""
+    best: List[str] = []
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size(precision)
+        rows = _cell_indexes(south, north, -90.0, height, round(180.0 / height))
+        columns = _cell_indexes(west, east, -180.0, width, round(360.0 / width))
+        if len(rows) * len(columns) > MAX_COVER_CELLS:
+            break
+        best = [
+            encode_geohash(-90.0 + (row + 0.5) * height, -180.0 + (column + 0.5) * width, precision)
+            for row in rows
+            for column in columns
+        ]
+    return sorted(set(best))
+
+
+def _successor(cell: str) -> Optional[str]:
+    """The first geohash after every string starting with `cell` (None past the end)"""
+    while cell:
+        position = BASE32.index(cell[-1])
+        if position + 1 < len(BASE32):
+            return cell[:-1] + BASE32[position + 1]
+        cell = cell[:-1]
+    return None
+
+
+def geohash_ranges(cells: List[str]) -> List[Tuple[str, Optional[str]]]:
+    """Half-open [start, end) string ranges for sorted cells, merging neighbours"""
+    ranges: List[List] = []
+    for cell in cells:
+        end = _successor(cell)
+        if ranges and ranges[-1][1] == cell:
+            ranges[-1][1] = end
+        else:
+            ranges.append([cell, end])
+    return [(start, end) for start, end in ranges]
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(south, west, north, east) of the box around a circle, clamped to valid coordinates"""
+    dlat = radius_km / KM_PER_DEGREE
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+    return (
+        max(latitude - dlat, -90.0),
+        max(longitude - dlng, -180.0),
+        min(latitude + dlat, 90.0),
+        min(longitude + dlng, 180.0),
+    )
+
+
+def squared_distance_km(latitude: float, longitude: float):
+    """SQL expression: squared equirectangular distance (km^2) from a point to each event"""
+    dy = (Event.latitude - latitude) * KM_PER_DEGREE
+    dx = (Event.longitude - longitude) * (KM_PER_DEGREE * math.cos(math.radians(latitude)))
+    return dx * dx + dy * dy
+
+
+def within_box(south: float, west: float, north: float, east: float):
+    """SQL criteria for events inside a box: geohash ranges for the index,
+    then the exact coordinates"""
+    criteria = [
+        Event.latitude.between(south, north),
+        Event.longitude.between(west, east),
+    ]
+    cells = covering_cells(south, west, north, east)
+    if cells:
+        criteria.insert(0, or_(*(
+            and_(Event.geohash >= start, Event.geohash < end) if end else Event.geohash >= start
+            for start, end in geohash_ranges(cells)
+        )))
+    return and_(*criteria)
+
+
+def set_event_location(event: Event, latitude: Optional[float], longitude: Optional[float]):
+    """Store an event's coordinates with their geohash (None clears them)"""
+    if latitude is None or longitude is None:
+        event.latitude = event.longitude = event.geohash = None
+        return
+    event.latitude = latitude
+    event.longitude = longitude
+    event.geohash = encode_geohash(latitude, longitude)
@@ -0,0 +1,104 @@
+"""
+Pluggable geocoding: turn an event's free-text address into coordinates.
+
+GEOCODER selects the implementation:
+  offline    (default) no network. It knows the places it was given and
+             addresses written as coordinates ("37.7599, -122.4148"). Anything
+             else stays unlocated. Tests and local development use it.
+  nominatim  an OpenStreetMap Nominatim server (GEOCODER_URL), queried with
+             httpx. Failures and timeouts leave the event unlocated rather
+             than failing the request.
+
+Routes take the geocoder from the get_geocoder dependency, so tests can
+swap it with app.dependency_overrides[get_geocoder].
+"""
+import logging
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.config import get_settings
+from app.geo import set_event_location
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[float, float]
+
+_COORDINATES = re.compile(r"^\s*(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$")
+
+
+def _normalize(address: str) -> str:
+    return " ".join(address.lower().split())
+
+
+class Geocoder(ABC):
+    @abstractmethod
+    async def geocode(self, address: str) -> Optional[Coordinates]:
+        """(latitude, longitude) of an address, or None if it can't be located"""
+
+
+class OfflineGeocoder(Geocoder):
+    def __init__(self, places: Optional[Dict[str, Coordinates]] = None):
+        self.places = {_normalize(address): point for address, point in (places or {}).items()}
+
+    async def geocode(self, address: str) -> Optional[Coordinates]:
+        match = _COORDINATES.match(address)
+        if match:
+            latitude, longitude = float(match.group(1)), float(match.group(2))
+            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                return latitude, longitude
+        return self.places.get(_normalize(address))
+
+
+class NominatimGeocoder(Geocoder):
+    def __init__(self, base_url: str, user_agent: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.user_agent = user_agent
+        self.timeout = timeout
+
+    async def geocode(self, address: str) -> Optional[Coordinates]:
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout, headers={"User-Agent": self.user_agent}) as client:
+                response = await client.get(
+                    f"{self.base_url}/search",
+                    params={"q": address, "format": "jsonv2", "limit": 1},
+                )
+                response.raise_for_status()
+                results = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.warning("Geocoding failed for %r: %s", address, exc)
+            return None
+        if not results:
+            return None
+        return float(results[0]["lat"]), float(results[0]["lon"])
+
+
+@lru_cache()
+def get_geocoder() -> Geocoder:
+    settings = get_settings()
+    if settings.geocoder == "nominatim":
+        return NominatimGeocoder(
+            settings.geocoder_url,
+            settings.geocoder_user_agent,
+            settings.geocoder_timeout_seconds,
+        )
+    return OfflineGeocoder()
+
+
+async def locate_event(
+    event,
+    latitude: Optional[float],
+    longitude: Optional[float],
+    address: Optional[str],
+    geocoder: Geocoder,
+):
+    """Set an event's coordinates: the given ones, else the geocoded address
+    (unlocated when neither is available)"""
+    if latitude is None and address:
+        located = await geocoder.geocode(address)
+        if located is not None:
+            latitude, longitude = located
+    set_event_location(event, latitude, longitude)
@@ -1,19 +1,15 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 from contextlib import asynccontextmanager
 
-from app.database import init_db
-
-
-class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
-    """Ensure redirects use HTTPS when behind a proxy (Cloud Run)."""
-    async def dispatch(self, request: Request, call_next):
-        # If X-Forwarded-Proto is https, update the scope so FastAPI knows
-        if request.headers.get("x-forwarded-proto") == "https":
-            request.scope["scheme"] = "https"
-        return await call_next(request)
-from app.routers import auth_router, users_router, events_router, rsvps_router, referrals_router
+from app.database import init_db, engine
+from app.auth import password_hasher
+from app.scheduler import deadline_scheduler
+from app.revocation import token_revocations
+from app.metrics import MetricsMiddleware, instrument_engine, render_metrics, CONTENT_TYPE
+from app.profiling import SQLProfilerMiddleware, profile_engine
+from app.middleware import ProxyHeadersMiddleware, RequestIDMiddleware, TimingMiddleware
+from app.routers import auth_router, users_router, events_router, rsvps_router, referrals_router, exports_router
 from app.routers.invites import router as invites_router
 from app.config import get_settings
 
@@ -24,8 +20,14 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     # Startup
     await init_db()
+    await token_revocations.refresh()
+    token_revocations.start()
+    deadline_scheduler.start()
     yield
     # Shutdown
+    await deadline_scheduler.stop()
+    await token_revocations.stop()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -47,9 +49,6 @@ if os.environ.get("FRONTEND_URL"):
 # Allow all .run.app domains for Cloud Run
 allowed_origins.append("https://*.run.app")
 
-# HTTPS redirect fix for Cloud Run (must be before CORS)
-app.add_middleware(HTTPSRedirectMiddleware)
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all for Cloud Run (can restrict later)
@@ -58,6 +57,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL profile: N+1 and slow query warnings in the log
+if settings.sql_profiling_enabled:
+    profile_engine(engine, settings.sql_slow_query_ms, settings.sql_repeated_statement_threshold)
+    app.add_middleware(SQLProfilerMiddleware, server_timing=settings.sql_profiling_server_timing)
+
+# Pure ASGI (see app.middleware). Added last runs first: the request ID is
+# set before the proxy headers are read and the SQL profile is taken
+app.add_middleware(TimingMiddleware)
+app.add_middleware(
+    ProxyHeadersMiddleware,
+    trusted_hosts=[host.strip() for host in settings.forwarded_allow_ips.split(",") if host.strip()],
+)
+app.add_middleware(RequestIDMiddleware)
+
+# Outermost, so the timings cover the whole middleware stack
+if settings.metrics_enabled:
+    instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(users_router)
@@ -65,6 +83,7 @@ app.include_router(events_router)
 app.include_router(rsvps_router)
 app.include_router(referrals_router)
 app.include_router(invites_router)
+app.include_router(exports_router)
 
 
 @app.get("/")
@@ -79,3 +98,16 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/scheduler")
+async def scheduler_health():
+    """Deadline sweep metrics: runs, rows affected and durations per sweep"""
+    return deadline_scheduler.stats()
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Prometheus text exposition of the app's metrics (see app.metrics)"""
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
@@ -0,0 +1,341 @@
+"""
+Prometheus metrics, served in the text exposition format at GET /metrics.
+
+HTTP: MetricsMiddleware is plain ASGI (no BaseHTTPMiddleware task or body
+buffering). Per method and route template (e.g. /api/events/{event_id},
+from the route FastAPI matched; requests matching no route are
+"unmatched") it records requests by status, latency and response size
+histograms, and the database work each request did. Requests in flight are
+counted per route at scrape time from the requests still running, so the
+middleware never has to resolve a route up front.
+
+Database: instrument_engine() times every wait for a pooled connection and
+every query. Each request gets histograms of its query count and query
+time, and checkout waits are labelled with the request's route (route
+"background" outside requests, e.g. the deadline scheduler).
+
+Also exported: pool connections in use, the TTL caches, the password
+hasher and the deadline scheduler sweeps.
+
+Everything is plain counters in process memory and a scrape only formats
+them: no locks, no I/O, no queries. With several workers each process
+reports its own numbers.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+UNMATCHED = "unmatched"
+BACKGROUND = "background"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _family(name: str, kind: str, documentation: str, labelnames: Sequence[str],
+            samples: Iterable[Tuple[Sequence, float]]) -> List[str]:
+    """Text lines for a metric whose samples are computed at scrape time"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labelnames, labels)} {_number(value)}" for labels, value in samples)
+    return lines
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        return _family(self.name, "counter", self.documentation, self.labelnames, list(self._values.items()))
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class RequestRecord:
+    """What one running request has done so far"""
+    __slots__ = ("scope", "queries", "query_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+_current_request: ContextVar[Optional[RequestRecord]] = ContextVar("metrics_request", default=None)
+
+
+def route_template(scope) -> str:
+    """The matched route's path template, e.g. /api/events/{event_id}"""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return template or UNMATCHED
+
+
+def _request_labels(record: Optional[RequestRecord]) -> Labels:
+    if record is None:
+        return ("", BACKGROUND)
+    return (record.scope["method"], route_template(record.scope))
+
+
+class Metrics:
+    def __init__(self):
+        route = ("method", "route")
+        self.active: set = set()
+        self.requests = Counter(
+            "foodshare_http_requests_total", "HTTP requests by route and status", ("method", "route", "status"),
+        )
+        self.duration = Histogram(
+            "foodshare_http_request_duration_seconds", "Time to the end of the response body", route,
+            LATENCY_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "foodshare_http_response_size_bytes", "Response body size", route, SIZE_BUCKETS,
+        )
+        self.request_queries = Histogram(
+            "foodshare_db_queries_per_request", "Queries run by one request", route, QUERY_COUNT_BUCKETS,
+        )
+        self.request_query_time = Histogram(
+            "foodshare_db_query_seconds_per_request", "Time one request spent executing queries", route,
+            LATENCY_BUCKETS,
+        )
+        self.checkout_wait = Histogram(
+            "foodshare_db_checkout_seconds", "Wait for a pooled database connection", route, CHECKOUT_BUCKETS,
+        )
+        self.queries = Counter("foodshare_db_queries_total", "Queries executed, in requests or not")
+        self.query_time = Counter("foodshare_db_query_seconds_total", "Time spent executing queries")
+        self.pool = None
+
+    def request_finished(self, record: RequestRecord, status: int, size: int, seconds: float):
+        method, route = _request_labels(record)
+        key = (method, route)
+        self.requests.inc((method, route, str(status)))
+        self.duration.observe(key, seconds)
+        self.response_size.observe(key, size)
+        self.request_queries.observe(key, record.queries)
+        self.request_query_time.observe(key, record.query_seconds)
+
+    def query_finished(self, seconds: float):
+        self.queries.inc()
+        self.query_time.inc(amount=seconds)
+        record = _current_request.get()
+        if record is not None:
+            record.queries += 1
+            record.query_seconds += seconds
+
+    def connection_checked_out(self, seconds: float):
+        self.checkout_wait.observe(_request_labels(_current_request.get()), seconds)
+
+    def in_flight(self) -> List[Tuple[Labels, int]]:
+        counts: Dict[Labels, int] = {}
+        for record in list(self.active):
+            labels = _request_labels(record)
+            counts[labels] = counts.get(labels, 0) + 1
+        return list(counts.items())
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route HTTP metrics (see module docstring)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        record = RequestRecord(scope)
+        status = 500  # Unless the app starts a response
+        size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        token = _current_request.set(record)
+        metrics.active.add(record)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            seconds = time.perf_counter() - start
+            metrics.active.discard(record)
+            _current_request.reset(token)
+            metrics.request_finished(record, status, size, seconds)
+
+
+def instrument_engine(engine):
+    """Time connection checkouts and queries on an (async) engine.
+
+    Checkouts are timed by wrapping the pool's connect(); a pool replaced
+    by engine.dispose() is not instrumented.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _query_finished(conn, cursor, statement, parameters, context, executemany):
+        metrics.query_finished(time.perf_counter() - conn.info["metrics_query_start"].pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _query_failed(context):
+        starts = context.connection.info.get("metrics_query_start") if context.connection is not None else None
+        if starts:
+            metrics.query_finished(time.perf_counter() - starts.pop())
+
+    pool = sync_engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            metrics.connection_checked_out(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+    metrics.pool = pool
+
+
+def _pool_lines() -> List[str]:
+    pool = metrics.pool
+    if pool is None or not hasattr(pool, "checkedout"):
+        return []
+    samples = [(("in_use",), pool.checkedout()), (("idle",), pool.checkedin())]
+    return _family("foodshare_db_pool_connections", "gauge", "Pooled database connections", ("state",), samples)
+
+
+def _cache_lines() -> List[str]:
+    from app.cache import event_response_cache, user_cache
+
+    caches = [cache.stats() for cache in (event_response_cache, user_cache)]
+    lines = _family(
+        "foodshare_cache_entries", "gauge", "Entries held by an in-process cache", ("cache",),
+        [((stats["name"],), stats["size"]) for stats in caches],
+    )
+    for counter in ("hits", "misses", "evictions", "expirations", "invalidations"):
+        lines += _family(
+            f"foodshare_cache_{counter}_total", "counter", f"Cache {counter}", ("cache",),
+            [((stats["name"],), stats[counter]) for stats in caches],
+        )
+    return lines
+
+
+def _hasher_lines() -> List[str]:
+    from app.auth import password_hasher
+
+    stats = password_hasher.stats()
+    return (
+        _family("foodshare_password_hash_queue_depth", "gauge", "bcrypt calls waiting for a worker", (),
+                [((), stats["queue_depth"])])
+        + _family("foodshare_password_hash_running", "gauge", "bcrypt calls running", (), [((), stats["running"])])
+        + _family("foodshare_password_hash_completed_total", "counter", "bcrypt calls completed", (),
+                  [((), stats["completed"])])
+        + _family("foodshare_password_hash_rejected_total", "counter", "bcrypt calls refused with 503", (),
+                  [((), stats["rejected"])])
+        + _family("foodshare_password_hash_busy_seconds_total", "counter", "Time spent hashing", (),
+                  [((), stats["busy_seconds"])])
+    )
+
+
+def _scheduler_lines() -> List[str]:
+    from app.scheduler import deadline_scheduler
+
+    sweeps = list(deadline_scheduler.sweep_stats.items())
+    lines = _family(
+        "foodshare_scheduler_running", "gauge", "Whether the deadline scheduler is running", (),
+        [((), int(deadline_scheduler.stats()["running"]))],
+    )
+    for name, kind, documentation, attribute in (
+        ("foodshare_scheduler_sweep_runs_total", "counter", "Deadline sweep runs", "runs"),
+        ("foodshare_scheduler_sweep_errors_total", "counter", "Deadline sweeps that failed", "errors"),
+        ("foodshare_scheduler_sweep_rows_total", "counter", "Rows changed by deadline sweeps", "rows_affected"),
+        ("foodshare_scheduler_sweep_seconds_total", "counter", "Time spent in deadline sweeps", "total_seconds"),
+        ("foodshare_scheduler_sweep_last_seconds", "gauge", "Duration of the last sweep", "last_seconds"),
+    ):
+        lines += _family(name, kind, documentation, ("sweep",),
+                         [((sweep,), getattr(stats, attribute)) for sweep, stats in sweeps])
+    return lines
+
+
+def render_metrics() -> str:
+    """Every metric in the Prometheus text format"""
+    lines = []
+    for metric in (metrics.requests, metrics.duration, metrics.response_size,
+                   metrics.request_queries, metrics.request_query_time, metrics.checkout_wait,
+                   metrics.queries, metrics.query_time):
+        lines += metric.render()
+    lines += _family(
+        "foodshare_http_requests_in_flight", "gauge", "Requests being handled", ("method", "route"),
+        metrics.in_flight(),
+    )
+    lines += _pool_lines() + _cache_lines() + _hasher_lines() + _scheduler_lines()
+    return "\n".join(lines) + "\n"
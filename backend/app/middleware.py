@@ -0,0 +1,171 @@
+"""
+Pure ASGI middleware for the plumbing every request goes through.
+
+These are plain ASGI callables rather than BaseHTTPMiddleware subclasses:
+BaseHTTPMiddleware runs the rest of the app in a separate task and pipes
+the response body through a memory stream, which costs time on every
+request and holds back streamed bodies. Here each layer is one extra
+function call, and at most one closure wraps `send` to add a header.
+`python -m benchmarks.bench_middleware` compares the two.
+
+- ProxyHeadersMiddleware: behind a trusted proxy (forwarded_allow_ips, e.g.
+  Cloud Run's front end), takes the scheme from X-Forwarded-Proto, so redirects and url_for use
+  https, and the client address from X-Forwarded-For.
+- RequestIDMiddleware: gives each request an ID, taken from a well-formed
+  incoming X-Request-ID or generated. It is echoed in the response and
+  available as current_request_id() (and request.state.request_id).
+- TimingMiddleware: adds Server-Timing: app;dur=<ms>, the time until the
+  response started.
+"""
+import ipaddress
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional, Sequence
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+# Incoming IDs are reused only if short and made of safe characters
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    """ID of the request being handled, or None outside a request"""
+    return _request_id.get()
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def append_header(message, name: bytes, value: bytes):
+    """http.response.start message with one more header"""
+    return {**message, "headers": [*message.get("headers", ()), (name, value)]}
+
+
+class TrustedProxies:
+    """Peers whose forwarding headers are believed: "*", addresses or networks"""
+
+    def __init__(self, hosts: Sequence[str]):
+        self.any = "*" in hosts
+        self.networks = []
+        self.names = set()
+        for host in hosts:
+            if host == "*":
+                continue
+            try:
+                self.networks.append(ipaddress.ip_network(host, strict=False))
+            except ValueError:
+                self.names.add(host)  # e.g. "unix:" or a hostname
+
+    def __contains__(self, host: Optional[str]) -> bool:
+        if self.any:
+            return True
+        if host is None:
+            return False
+        if host in self.names:
+            return True
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+
+class ProxyHeadersMiddleware:
+    """Take scheme and client address from X-Forwarded-* set by a trusted proxy.
+
+    The client is the nearest X-Forwarded-For entry that is not itself a
+    trusted proxy (the leftmost one when every peer is trusted).
+    """
+
+    def __init__(self, app, trusted_hosts: Sequence[str] = ("127.0.0.1",)):
+        self.app = app
+        self.trusted = TrustedProxies(trusted_hosts)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            peer = scope.get("client")
+            if (peer[0] if peer else None) in self.trusted:
+                proto = _header(scope, b"x-forwarded-proto")
+                if proto:
+                    proto = proto.split(",")[0].strip().lower()
+                    if scope["type"] == "websocket":
+                        proto = {"https": "wss", "http": "ws"}.get(proto, proto)
+                    if proto in ("http", "https", "ws", "wss"):
+                        scope["scheme"] = proto
+
+                forwarded_for = _header(scope, b"x-forwarded-for")
+                if forwarded_for:
+                    client = self._client_host(forwarded_for)
+                    if client:
+                        scope["client"] = (client, 0)
+
+        await self.app(scope, receive, send)
+
+    def _client_host(self, forwarded_for: str) -> Optional[str]:
+        hosts = [host.strip() for host in forwarded_for.split(",") if host.strip()]
+        if not hosts:
+            return None
+        if self.trusted.any:
+            return hosts[0]
+        for host in reversed(hosts):
+            if host not in self.trusted:
+                return host
+        return hosts[0]
+
+
+class RequestIDMiddleware:
+    """Tag each request with an ID and echo it as X-Request-ID"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = _header(scope, REQUEST_ID_HEADER)
+        request_id = incoming if incoming and _REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        encoded = request_id.encode("latin-1")
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message = append_header(message, REQUEST_ID_HEADER, encoded)
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_id.reset(token)
+
+
+class TimingMiddleware:
+    """Add Server-Timing: app;dur=<ms until the response started>"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                elapsed = (time.perf_counter() - start) * 1000
+                message = append_header(message, b"server-timing", f"app;dur={elapsed:.2f}".encode("latin-1"))
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
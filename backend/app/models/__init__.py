@@ -2,5 +2,6 @@ from app.models.user import User
 from app.models.event import Event, EventFoodItem
 from app.models.rsvp import RSVP
 from app.models.referral import Referral
+from app.models.trust_event import TrustEvent
 
-__all__ = ["User", "Event", "EventFoodItem", "RSVP", "Referral"]
+__all__ = ["User", "Event", "EventFoodItem", "RSVP", "Referral", "TrustEvent"]
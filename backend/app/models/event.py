@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Text, Enum, Index, false
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -15,6 +15,16 @@ class EventStatus(str, enum.Enum):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_is_public_status_event_date", "is_public", "status", "event_date", "id"),
+        Index("ix_events_host_id_event_date", "host_id", "event_date", "id"),
+        # Deadline sweeps (app.scheduler)
+        Index("ix_events_rsvps_closed_rsvp_deadline", "rsvps_closed", "rsvp_deadline"),
+        Index("ix_events_status_confirmation_deadline", "status", "confirmation_deadline"),
+        Index("ix_events_status_needs_completion_event_date", "status", "needs_completion", "event_date"),
+        # Area searches (app.geo)
+        Index("ix_events_geohash", "geohash"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -26,6 +36,11 @@ class Event(Base):
     location_address = Column(String(500))
     location_notes = Column(Text)  # e.g., "Apartment 4B, buzz #123"
 
+    # Coordinates (set by app.geo.set_event_location, None until located)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
+
     # Capacity
     max_guests = Column(Integer, nullable=False)
     reserved_spots = Column(Integer, default=0)  # Spots reserved for specific invites
@@ -35,10 +50,24 @@ class Event(Base):
     rsvp_deadline = Column(DateTime, nullable=False)  # Last day to RSVP
     confirmation_deadline = Column(DateTime, nullable=False)  # When host must confirm
 
+    # RSVP counters (denormalized, maintained by app.event_counters)
+    pending_rsvp_count = Column(Integer, default=0, server_default="0", nullable=False)
+    confirmed_rsvp_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Sum of guest_count over pending/confirmed RSVPs; available_spots and the
+    # admission guard (AVAILABLE_SPOTS) count capacity in these guests
+    active_guest_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Pending/confirmed invites (is_reserved RSVPs); invites are admitted
+    # while this stays within reserved_spots
+    reserved_rsvp_count = Column(Integer, default=0, server_default="0", nullable=False)
+
     # Status
     status = Column(String(20), default=EventStatus.DRAFT.value)
     is_public = Column(Boolean, default=True)  # Can anyone find it, or invite-only?
 
+    # Deadline flags (set by the scheduler's sweeps)
+    rsvps_closed = Column(Boolean, default=False, server_default=false(), nullable=False)  # rsvp_deadline has passed
+    needs_completion = Column(Boolean, default=False, server_default=false(), nullable=False)  # Confirmed and in the past
+
     # Host
     host_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     host = relationship("User", back_populates="hosted_events")
@@ -48,19 +77,20 @@ class Event(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    food_items = relationship("EventFoodItem", back_populates="event", cascade="all, delete-orphan")
+    food_items = relationship(
+        "EventFoodItem", back_populates="event", cascade="all, delete-orphan", order_by="EventFoodItem.id"
+    )
     rsvps = relationship("RSVP", back_populates="event", cascade="all, delete-orphan")
 
     @property
     def available_spots(self):
-        """Calculate available spots for public RSVPs"""
-        confirmed_rsvps = len([r for r in self.rsvps if r.status in ["confirmed", "pending"]])
-        return max(0, self.max_guests - self.reserved_spots - confirmed_rsvps)
+        """Calculate available spots for public RSVPs (in guests, not RSVPs)"""
+        return max(0, self.max_guests - (self.reserved_spots or 0) - (self.active_guest_count or 0))
 
     @property
     def confirmed_guest_count(self):
         """Count of confirmed RSVPs"""
-        return len([r for r in self.rsvps if r.status == "confirmed"])
+        return self.confirmed_rsvp_count or 0
 
     @property
     def can_be_confirmed(self):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -6,6 +6,9 @@ from app.database import Base
 
 class Referral(Base):
     __tablename__ = "referrals"
+    __table_args__ = (
+        Index("ix_referrals_referrer_id_created_at", "referrer_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
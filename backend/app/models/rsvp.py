@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -16,6 +16,11 @@ class RSVPStatus(str, enum.Enum):
 
 class RSVP(Base):
     __tablename__ = "rsvps"
+    __table_args__ = (
+        Index("ix_rsvps_event_id_status", "event_id", "status"),
+        Index("ix_rsvps_user_id_created_at", "user_id", "created_at"),
+        Index("ix_rsvps_user_id_is_reserved_status", "user_id", "is_reserved", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
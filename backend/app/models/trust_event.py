@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from datetime import datetime
+import enum
+from app.database import Base
+
+
+class TrustEventKind(str, enum.Enum):
+    OPENING_BALANCE = "opening_balance"  # Counters as they stood when the ledger started
+    ACCOUNT_CREATED = "account_created"  # Starting trust score of a new user
+    ATTENDED = "attended"  # Guest marked as attended
+    NO_SHOW = "no_show"  # Guest marked as a no-show
+    HOSTED_EVENT = "hosted_event"  # Host completed an event
+    REFERRAL_BONUS = "referral_bonus"  # Someone registered with the user's code
+
+
+class TrustEvent(Base):
+    """Append-only ledger of changes to a user's reputation counters.
+
+    The counters on users are a materialization of this table: replaying a
+    user's rows in id order (trust clamped at 0 after each row) reproduces them.
+    """
+    __tablename__ = "trust_events"
+    __table_args__ = (
+        Index("ix_trust_events_user_id_id", "user_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    kind = Column(String(30), nullable=False)
+
+    # Deltas applied to the matching users columns
+    trust_delta = Column(Integer, default=0, server_default="0", nullable=False)
+    events_attended_delta = Column(Integer, default=0, server_default="0", nullable=False)
+    flake_count_delta = Column(Integer, default=0, server_default="0", nullable=False)
+    events_hosted_delta = Column(Integer, default=0, server_default="0", nullable=False)
+    successful_events_delta = Column(Integer, default=0, server_default="0", nullable=False)
+    referral_points_delta = Column(Integer, default=0, server_default="0", nullable=False)
+
+    # What caused it
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=True)
+    rsvp_id = Column(Integer, ForeignKey("rsvps.id"), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,12 +1,24 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float, Index, false, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 from app.database import Base
 
 
+# Users whose tokens are refused (app.revocation); the partial index holds
+# only them, and queries must repeat this predicate verbatim to use it
+REVOKED_USERS_PREDICATE = "is_active IS NOT TRUE OR token_version > 0"
+
+
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index(
+            "ix_users_revoked", "id", "token_version",
+            sqlite_where=text(REVOKED_USERS_PREDICATE),
+            postgresql_where=text(REVOKED_USERS_PREDICATE),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -29,6 +41,8 @@ class User(Base):
     # Account Status
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
+    is_admin = Column(Boolean, default=False, server_default=false(), nullable=False)  # Ops access to admin-wide endpoints
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)  # Bump to revoke every issued token
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
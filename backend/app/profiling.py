@@ -0,0 +1,223 @@
+"""
+Per-request SQL profiling: what each request asked of the database.
+
+profile_engine() hooks the engine's cursor events and attributes every
+statement, its duration and its row count to the request running it (a
+contextvar set by SQLProfilerMiddleware). When a request ends, its profile
+is checked for:
+
+- repeated statements: the same SQL text run sql_repeated_statement_threshold
+  or more times in one request, the usual sign of an N+1 loop that should be
+  one IN (...) query or an eager load;
+- slow statements: any single execution over sql_slow_query_ms.
+
+Requests with findings are logged as a warning and every profile is logged
+at DEBUG, each with the summary in the record's `sql_profile` attribute for
+structured log handlers. With sql_profiling_server_timing the response
+also gets a Server-Timing header (shown in the browser's network panel). It
+counts the queries run before the response started, so a streamed body's
+later batches only show up in the log. The header reveals query counts to
+clients, so it is off unless asked for.
+
+Slow statements outside requests (the deadline scheduler) are logged too.
+
+Nothing is installed unless profiling is enabled, so a disabled profiler
+costs nothing. Row counts are the driver's rowcount for writes and the
+rows the async driver buffered for reads; server-side (streaming) cursors
+report none.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.metrics import route_template
+from app.middleware import current_request_id, append_header
+
+logger = logging.getLogger(__name__)
+
+# Characters of SQL kept in logs and headers
+STATEMENT_PREVIEW = 200
+
+
+def _preview(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > STATEMENT_PREVIEW:
+        return statement[:STATEMENT_PREVIEW] + "..."
+    return statement
+
+
+def _row_count(cursor) -> Optional[int]:
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is not None and rowcount >= 0:
+        return rowcount
+    rows = getattr(cursor, "_rows", None)  # Buffered result of the async adapters
+    return len(rows) if rows is not None else None
+
+
+class StatementStats:
+    __slots__ = ("executions", "seconds", "max_seconds", "rows")
+
+    def __init__(self):
+        self.executions = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+
+
+class RequestProfile:
+    """Statements run by one request, keyed by their SQL text"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.request_id = current_request_id()
+        self.statements: Dict[str, StatementStats] = {}
+        self.slow: List[dict] = []
+        self.queries = 0
+        self.seconds = 0.0
+        self.rows = 0
+
+    def add(self, statement: str, seconds: float, rows: Optional[int], slow_seconds: float):
+        stats = self.statements.get(statement)
+        if stats is None:
+            stats = self.statements[statement] = StatementStats()
+        stats.executions += 1
+        stats.seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        self.queries += 1
+        self.seconds += seconds
+        if rows is not None:
+            stats.rows += rows
+            self.rows += rows
+        if seconds >= slow_seconds:
+            self.slow.append({"statement": _preview(statement), "ms": round(seconds * 1000, 2), "rows": rows})
+
+    def repeated(self, threshold: int) -> List[dict]:
+        """Statements run at least `threshold` times, most executed first"""
+        found = [
+            {
+                "statement": _preview(statement),
+                "executions": stats.executions,
+                "ms": round(stats.seconds * 1000, 2),
+                "rows": stats.rows,
+            }
+            for statement, stats in self.statements.items()
+            if stats.executions >= threshold
+        ]
+        return sorted(found, key=lambda item: item["executions"], reverse=True)
+
+    def summary(self, repeated_threshold: int) -> dict:
+        return {
+            "method": self.method,
+            "route": self.route or self.path,
+            "request_id": self.request_id,
+            "queries": self.queries,
+            "distinct_statements": len(self.statements),
+            "ms": round(self.seconds * 1000, 2),
+            "rows": self.rows,
+            "repeated": self.repeated(repeated_threshold),
+            "slow": self.slow,
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+class SQLProfiler:
+    def __init__(self, slow_query_ms: float = 100, repeated_threshold: int = 5):
+        self.slow_seconds = slow_query_ms / 1000
+        self.repeated_threshold = repeated_threshold
+
+    def query_finished(self, statement: str, seconds: float, rows: Optional[int]):
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.add(statement, seconds, rows, self.slow_seconds)
+        elif seconds >= self.slow_seconds:
+            logger.warning(
+                "Slow query outside a request: %.1f ms, %s rows: %s", seconds * 1000, rows, _preview(statement),
+                extra={"sql_profile": {"ms": round(seconds * 1000, 2), "rows": rows, "statement": _preview(statement)}},
+            )
+
+    def request_finished(self, profile: RequestProfile):
+        summary = profile.summary(self.repeated_threshold)
+        if summary["repeated"] or summary["slow"]:
+            findings = [f"{item['executions']}x {item['statement']}" for item in summary["repeated"]]
+            findings += [f"slow {item['ms']} ms: {item['statement']}" for item in summary["slow"]]
+            logger.warning(
+                "SQL %s %s: %d queries in %.1f ms; %s",
+                summary["method"], summary["route"], summary["queries"], summary["ms"], "; ".join(findings),
+                extra={"sql_profile": summary},
+            )
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "SQL %s %s: %d queries in %.1f ms, %d rows",
+                summary["method"], summary["route"], summary["queries"], summary["ms"], summary["rows"],
+                extra={"sql_profile": summary},
+            )
+
+    def server_timing(self, profile: RequestProfile) -> bytes:
+        desc = f"{profile.queries} queries, {profile.rows} rows"
+        repeated = profile.repeated(self.repeated_threshold)
+        if repeated:
+            desc += f", {len(repeated)} repeated"
+        if profile.slow:
+            desc += f", {len(profile.slow)} slow"
+        return f'sql;dur={profile.seconds * 1000:.2f};desc="{desc}"'.encode("latin-1")
+
+
+sql_profiler = SQLProfiler()
+
+
+class SQLProfilerMiddleware:
+    """Pure ASGI middleware giving each request an SQL profile (see module docstring)"""
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                message = append_header(message, b"server-timing", sql_profiler.server_timing(profile))
+            await send(message)
+
+        token = _current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current_profile.reset(token)
+            if "route" in scope:
+                profile.route = route_template(scope)
+            sql_profiler.request_finished(profile)
+
+
+def profile_engine(engine, slow_query_ms: float, repeated_threshold: int):
+    """Attribute the engine's statements to the running request's profile"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    sql_profiler.slow_seconds = slow_query_ms / 1000
+    sql_profiler.repeated_threshold = repeated_threshold
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _statement_started(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["profile_query_start"].pop()
+        sql_profiler.query_finished(statement, seconds, _row_count(cursor))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _statement_failed(context):
+        starts = context.connection.info.get("profile_query_start") if context.connection is not None else None
+        if starts:
+            sql_profiler.query_finished(context.statement or "", time.perf_counter() - starts.pop(), None)
@@ -0,0 +1,101 @@
+"""
+Token revocation that costs no database read per request.
+
+get_current_principal (app.auth) accepts a valid JWT on its own, so some
+other mechanism has to refuse tokens whose user has been deactivated or
+whose tokens were revoked. Every token carries the user's
+users.token_version as its "ver" claim (absent on older tokens, read as 0).
+Each process keeps the few users whose tokens are refused in memory:
+
+  * inactive users (is_active not true): every token is refused
+  * users with token_version > 0: tokens with an older "ver" are refused
+
+The set is loaded at startup and refreshed every
+token_revocation_refresh_seconds. Each refresh is one query over a partial
+index that holds only those users (migration 0009), so it stays small
+however many users there are. A check is then a dict lookup.
+
+To revoke every token a user holds:
+    UPDATE users SET token_version = token_version + 1 WHERE id = ...
+Setting is_active = false refuses them all as well. Either change takes
+effect within one refresh interval, like a change under the user cache's
+TTL does for get_current_user.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Set
+
+from sqlalchemy import select, text
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models.user import User, REVOKED_USERS_PREDICATE
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def revoked_users_query():
+    """Inactive users and users with a bumped token_version (ix_users_revoked)"""
+    return select(User.id, User.token_version, User.is_active).where(text(REVOKED_USERS_PREDICATE))
+
+
+class TokenRevocations:
+    """Users whose tokens are refused, refreshed from the database every `interval` seconds"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.inactive: Set[int] = set()
+        self.min_version: Dict[int, int] = {}  # user id -> oldest token_version still accepted
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def is_inactive(self, user_id: int) -> bool:
+        return user_id in self.inactive
+
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        """True if tokens of this version were revoked for the user"""
+        return token_version < self.min_version.get(user_id, 0)
+
+    async def refresh(self):
+        """Reload the revoked users (one indexed query)"""
+        async with async_session_maker() as db:
+            result = await db.execute(revoked_users_query())
+            rows = result.all()
+        self.inactive = {row.id for row in rows if not row.is_active}
+        self.min_version = {row.id: row.token_version for row in rows if row.token_version}
+        self.loaded_at = time.monotonic()
+
+    async def ensure_loaded(self):
+        """Load the set on first use when the app runs without its lifespan (e.g. in scripts)"""
+        if self.loaded_at is not None:
+            return
+        async with self._lock:
+            if self.loaded_at is None:
+                await self.refresh()
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Token revocation refresh failed")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever(), name="token-revocations")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+token_revocations = TokenRevocations(settings.token_revocation_refresh_seconds)
@@ -7,8 +7,10 @@ from datetime import timedelta
 from app.database import get_db
 from app.models.user import User
 from app.models.referral import Referral
+from app.models.trust_event import TrustEventKind
 from app.schemas.user import UserCreate, UserResponse, Token, UserLogin
-from app.auth import verify_password, get_password_hash, create_access_token, get_current_user
+from app.auth import verify_password_async, get_password_hash_async, create_access_token, get_current_user
+from app.trust import append_trust_events, record_trust_events, trust_event
 from app.config import get_settings
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
@@ -63,13 +65,17 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     new_user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash_async(user_data.password),
         full_name=user_data.full_name,
         referred_by_id=referrer.id if referrer else None,
         trust_score=settings.default_trust_score,
     )
 
     db.add(new_user)
+    await db.flush()
+    await append_trust_events(db, [trust_event(
+        new_user.id, TrustEventKind.ACCOUNT_CREATED, trust=new_user.trust_score,
+    )])
     await db.commit()
     await db.refresh(new_user)
 
@@ -81,7 +87,9 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
             referral_code_used=user_data.referral_code.upper(),
         )
         referral.award_bonus(settings.referral_bonus_points)
-        referrer.referral_points += settings.referral_bonus_points
+        await record_trust_events(db, [trust_event(
+            referrer.id, TrustEventKind.REFERRAL_BONUS, referral_points=settings.referral_bonus_points,
+        )])
 
         db.add(referral)
         await db.commit()
@@ -109,7 +117,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -123,7 +131,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
         )
 
     access_token = create_access_token(
-        data={"sub": str(user.id)},
+        data={"sub": str(user.id), "ver": user.token_version},
         expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
     )
 
@@ -1,32 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, update, case, tuple_, and_, or_
 from sqlalchemy.orm import selectinload
 from datetime import datetime, timedelta
 from typing import List, Optional
+import math
 
-from app.database import get_db
+from app.database import get_db, is_sqlite
 from app.models.user import User
 from app.models.event import Event, EventFoodItem, EventStatus
 from app.models.rsvp import RSVP, RSVPStatus
+from app.models.trust_event import TrustEventKind
 from app.schemas.event import (
     EventCreate,
     EventResponse,
     EventUpdate,
     EventListResponse,
+    EventListPage,
+    NearbyEventResponse,
+    NearbyEventPage,
     FoodItemCreate,
     FoodItemResponse,
+    naive_utc,
 )
-from app.auth import get_current_user
+from app.auth import get_current_user, get_current_principal, Principal
+from app.cache import event_response_cache
+from app.event_counters import AVAILABLE_SPOTS, reset_event_counters
+from app.trust import record_trust_events, trust_event
+from app.serialization import trusted, dumps, json_response
+from app.etags import make_etag, etag_matches, not_modified, set_etag, tagged_json_response, touch_events
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    encode_cursor,
+    decode_cursor,
+    encode_rank_cursor,
+    decode_rank_cursor,
+)
+from app.search import search_terms, apply_event_search
+from app.geo import bounding_box, squared_distance_km, within_box, set_event_location
+from app.geocoding import Geocoder, get_geocoder, locate_event
 from app.config import get_settings
 
 router = APIRouter(prefix="/api/events", tags=["Events"])
 settings = get_settings()
 
+MAX_NEARBY_RADIUS_KM = 200
+
+
+def confirmation_deadline_for(event_date: datetime) -> datetime:
+    """When the host must confirm: min_days_before_event_to_confirm days
+    before the event, or the event date itself for events that are closer
+    than that (their usual deadline has already passed)"""
+    deadline = event_date - timedelta(days=settings.min_days_before_event_to_confirm)
+    if deadline <= datetime.utcnow():
+        return event_date
+    return deadline
 
-def event_to_response(event: Event) -> EventResponse:
-    """Convert Event model to EventResponse schema"""
-    return EventResponse(
+
+def event_to_response(event: Event) -> dict:
+    """Convert Event model to an EventResponse payload"""
+    return trusted(
+        EventResponse,
         id=event.id,
         title=event.title,
         description=event.description,
@@ -34,6 +69,8 @@ def event_to_response(event: Event) -> EventResponse:
         location_name=event.location_name,
         location_address=event.location_address,
         location_notes=event.location_notes,
+        latitude=event.latitude,
+        longitude=event.longitude,
         max_guests=event.max_guests,
         reserved_spots=event.reserved_spots,
         min_guests=event.min_guests,
@@ -47,8 +84,11 @@ def event_to_response(event: Event) -> EventResponse:
         available_spots=event.available_spots,
         confirmed_guest_count=event.confirmed_guest_count,
         can_be_confirmed=event.can_be_confirmed,
+        rsvps_closed=event.rsvps_closed,
+        needs_completion=event.needs_completion,
         food_items=[
-            FoodItemResponse(
+            trusted(
+                FoodItemResponse,
                 id=fi.id,
                 name=fi.name,
                 description=fi.description,
@@ -67,6 +107,7 @@ def event_to_response(event: Event) -> EventResponse:
 async def create_event(
     event_data: EventCreate,
     current_user: User = Depends(get_current_user),
+    geocoder: Geocoder = Depends(get_geocoder),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new dinner party event"""
@@ -98,9 +139,7 @@ async def create_event(
         )
 
     # Calculate confirmation deadline (X days before event)
-    confirmation_deadline = event_data.event_date - timedelta(
-        days=settings.min_days_before_event_to_confirm
-    )
+    confirmation_deadline = confirmation_deadline_for(event_data.event_date)
 
     # Create the event
     new_event = Event(
@@ -119,6 +158,9 @@ async def create_event(
         host_id=current_user.id,
         status=EventStatus.OPEN.value,
     )
+    await locate_event(
+        new_event, event_data.latitude, event_data.longitude, event_data.location_address, geocoder
+    )
 
     db.add(new_event)
     await db.flush()  # Get the event ID
@@ -138,105 +180,265 @@ async def create_event(
     # Reload with relationships
     result = await db.execute(
         select(Event)
-        .options(selectinload(Event.host), selectinload(Event.food_items), selectinload(Event.rsvps))
+        .options(selectinload(Event.host), selectinload(Event.food_items))
         .where(Event.id == new_event.id)
     )
     event = result.scalar_one()
 
-    return event_to_response(event)
+    return json_response(event_to_response(event), status_code=status.HTTP_201_CREATED)
+
+
+def event_list_query():
+    """Projection for event list rows: only the listed columns plus the host's
+    username and trust score, returned as plain rows (no ORM objects)"""
+    return (
+        select(
+            Event.id,
+            Event.title,
+            Event.event_date,
+            Event.location_name,
+            Event.max_guests,
+            case((AVAILABLE_SPOTS > 0, AVAILABLE_SPOTS), else_=0).label("available_spots"),
+            Event.confirmed_rsvp_count.label("confirmed_guest_count"),
+            Event.status,
+            User.username.label("host_username"),
+            User.trust_score.label("host_trust_score"),
+        )
+        .select_from(Event)
+        .outerjoin(User, User.id == Event.host_id)
+    )
 
 
-@router.get("/", response_model=List[EventListResponse])
-async def list_events(
-    status_filter: Optional[str] = Query(None, alias="status"),
-    upcoming_only: bool = True,
-    db: AsyncSession = Depends(get_db)
-):
-    """List public events (optionally filtered by status)"""
-    query = select(Event).options(selectinload(Event.host), selectinload(Event.rsvps))
+def build_event_page(rows, limit: int) -> dict:
+    """Trim the extra lookahead row and derive the next cursor from the last item"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor(rows[-1].event_date, rows[-1].id)
+    return trusted(
+        EventListPage,
+        items=[trusted(EventListResponse, **row._mapping) for row in rows],
+        next_cursor=next_cursor,
+    )
 
-    # Only show public events
-    query = query.where(Event.is_public == True)
 
-    # Filter by status
+def public_listing_filters(query, status_filter: Optional[str], upcoming_only: bool):
+    """Public events only, in the given status (default: open or confirmed)
+    and, with upcoming_only, still in the future"""
+    query = query.where(Event.is_public == True)
     if status_filter:
         query = query.where(Event.status == status_filter)
     else:
-        # Default: show open and confirmed events
         query = query.where(Event.status.in_([EventStatus.OPEN.value, EventStatus.CONFIRMED.value]))
-
-    # Filter upcoming events
     if upcoming_only:
         query = query.where(Event.event_date > datetime.utcnow())
+    return query
+
+
+@router.get("/", response_model=EventListPage)
+async def list_events(
+    request: Request,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    upcoming_only: bool = True,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    min_available_spots: Optional[int] = Query(None, ge=1),
+    host_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """List public events ordered by date, one page at a time (optionally filtered).
+
+    The ETag covers the fetched rows, so a matching If-None-Match gets a 304
+    without building or serializing the page.
+    """
+    # Public events, open or confirmed by default, upcoming unless asked otherwise
+    query = public_listing_filters(event_list_query(), status_filter, upcoming_only)
+
+    # Date range
+    if date_from:
+        query = query.where(Event.event_date >= naive_utc(date_from))
+    if date_to:
+        query = query.where(Event.event_date < naive_utc(date_to))
+
+    if min_available_spots:
+        query = query.where(AVAILABLE_SPOTS >= min_available_spots)
+
+    if host_id:
+        query = query.where(Event.host_id == host_id)
+
+    # Resume after the last row of the previous page
+    if cursor:
+        query = query.where(tuple_(Event.event_date, Event.id) > tuple_(*decode_cursor(cursor)))
 
     # Order by event date
-    query = query.order_by(Event.event_date)
+    query = query.order_by(Event.event_date, Event.id).limit(limit + 1)
 
     result = await db.execute(query)
-    events = result.scalars().all()
-
-    return [
-        EventListResponse(
-            id=e.id,
-            title=e.title,
-            event_date=e.event_date,
-            location_name=e.location_name,
-            max_guests=e.max_guests,
-            available_spots=e.available_spots,
-            confirmed_guest_count=e.confirmed_guest_count,
-            status=e.status,
-            host_username=e.host.username if e.host else None,
-            host_trust_score=e.host.trust_score if e.host else None,
-        )
-        for e in events
-    ]
+    rows = result.all()
+
+    etag = make_etag("events", [tuple(row) for row in rows])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = json_response(build_event_page(rows, limit))
+    set_etag(response, etag)
+    return response
 
 
-@router.get("/my-events", response_model=List[EventListResponse])
+@router.get("/my-events", response_model=EventListPage)
 async def list_my_events(
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    """List events hosted by the current user"""
-    query = (
-        select(Event)
-        .options(selectinload(Event.host), selectinload(Event.rsvps))
-        .where(Event.host_id == current_user.id)
-        .order_by(Event.event_date.desc())
-    )
+    """List events hosted by the current user, newest first"""
+    query = event_list_query().where(Event.host_id == principal.user_id)
+
+    if cursor:
+        query = query.where(tuple_(Event.event_date, Event.id) < tuple_(*decode_cursor(cursor)))
+
+    query = query.order_by(Event.event_date.desc(), Event.id.desc()).limit(limit + 1)
 
     result = await db.execute(query)
-    events = result.scalars().all()
-
-    return [
-        EventListResponse(
-            id=e.id,
-            title=e.title,
-            event_date=e.event_date,
-            location_name=e.location_name,
-            max_guests=e.max_guests,
-            available_spots=e.available_spots,
-            confirmed_guest_count=e.confirmed_guest_count,
-            status=e.status,
-            host_username=e.host.username if e.host else None,
-            host_trust_score=e.host.trust_score if e.host else None,
-        )
-        for e in events
-    ]
+    rows = result.all()
+
+    return json_response(build_event_page(rows, limit))
+
+
+@router.get("/search", response_model=EventListPage)
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    upcoming_only: bool = True,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over public events' title, description and location,
+    best matches first (see app.search). Filters match GET /api/events."""
+    terms = search_terms(q)
+    if not terms:
+        return json_response(trusted(EventListPage, items=[]))
+
+    query, rank = apply_event_search(event_list_query(), terms, is_sqlite(db.bind))
+    query = public_listing_filters(query.add_columns(rank.label("search_rank")), status_filter, upcoming_only)
+
+    if cursor:
+        query = query.where(tuple_(rank, Event.id) > tuple_(*decode_rank_cursor(cursor)))
+
+    query = query.order_by(rank, Event.id).limit(limit + 1)
+
+    result = await db.execute(query)
+    rows = result.all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = []
+    for row in rows:
+        item = dict(row._mapping)
+        item.pop("search_rank")
+        items.append(trusted(EventListResponse, **item))
+    next_cursor = encode_rank_cursor(rows[-1].search_rank, rows[-1].id) if has_more and rows else None
+    return json_response(trusted(EventListPage, items=items, next_cursor=next_cursor))
+
+
+@router.get("/nearby", response_model=NearbyEventPage)
+async def nearby_events(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10, gt=0, le=MAX_NEARBY_RADIUS_KM),
+    south: Optional[float] = Query(None, ge=-90, le=90),
+    west: Optional[float] = Query(None, ge=-180, le=180),
+    north: Optional[float] = Query(None, ge=-90, le=90),
+    east: Optional[float] = Query(None, ge=-180, le=180),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    upcoming_only: bool = True,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Public events within radius_km of (lat, lng), nearest first.
+
+    Pass south/west/north/east (e.g. a map viewport) to search that box
+    instead of the circle; results are still ordered by distance from
+    (lat, lng). Filters match GET /api/events. Events without coordinates
+    never match.
+    """
+    box = (south, west, north, east)
+    if any(edge is not None for edge in box):
+        if any(edge is None for edge in box) or south > north or west > east:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Give south, west, north and east together, with south <= north and west <= east"
+            )
+        area = within_box(*box)
+    else:
+        area = within_box(*bounding_box(lat, lng, radius_km))
+
+    distance = squared_distance_km(lat, lng)
+    query = event_list_query().add_columns(distance.label("squared_distance")).where(area)
+    if south is None:
+        query = query.where(distance <= radius_km * radius_km)
+    query = public_listing_filters(query, status_filter, upcoming_only)
+
+    # Resume after the last row of the previous page
+    if cursor:
+        query = query.where(tuple_(distance, Event.id) > tuple_(*decode_rank_cursor(cursor)))
+
+    query = query.order_by(distance, Event.id).limit(limit + 1)
+
+    result = await db.execute(query)
+    rows = result.all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = []
+    for row in rows:
+        item = dict(row._mapping)
+        squared = item.pop("squared_distance")
+        items.append(trusted(NearbyEventResponse, **item, distance_km=round(math.sqrt(squared), 1)))
+    next_cursor = encode_rank_cursor(rows[-1].squared_distance, rows[-1].id) if has_more and rows else None
+    return json_response(trusted(NearbyEventPage, items=items, next_cursor=next_cursor))
 
 
 @router.get("/{event_id}", response_model=EventResponse)
 async def get_event(
     event_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get event details"""
+    """Get event details (served from the in-process response cache when warm).
+
+    A request whose If-None-Match matches gets a 304; on a cache miss that
+    check costs only a lookup of events.updated_at and the host's updated_at.
+    """
+    cached = event_response_cache.get(event_id)
+    if cached is not None:
+        etag, body, _ = cached
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return tagged_json_response(body, etag)
+
+    if request.headers.get("if-none-match"):
+        result = await db.execute(
+            select(Event.updated_at, User.updated_at)
+            .outerjoin(User, User.id == Event.host_id)
+            .where(Event.id == event_id)
+        )
+        row = result.one_or_none()
+        if row is not None:
+            etag = make_etag("event", event_id, *row)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
     result = await db.execute(
         select(Event)
         .options(
             selectinload(Event.host),
             selectinload(Event.food_items),
-            selectinload(Event.rsvps)
         )
         .where(Event.id == event_id)
     )
@@ -248,14 +450,18 @@ async def get_event(
             detail="Event not found"
         )
 
-    return event_to_response(event)
+    etag = make_etag("event", event_id, event.updated_at, event.host.updated_at if event.host else None)
+    body = dumps(event_to_response(event))
+    event_response_cache.set(event_id, (etag, body, event.host_id))
+    return tagged_json_response(body, etag)
 
 
 @router.patch("/{event_id}", response_model=EventResponse)
 async def update_event(
     event_id: int,
     event_update: EventUpdate,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
+    geocoder: Geocoder = Depends(get_geocoder),
     db: AsyncSession = Depends(get_db)
 ):
     """Update an event (host only)"""
@@ -264,7 +470,6 @@ async def update_event(
         .options(
             selectinload(Event.host),
             selectinload(Event.food_items),
-            selectinload(Event.rsvps)
         )
         .where(Event.id == event_id)
     )
@@ -276,7 +481,7 @@ async def update_event(
             detail="Event not found"
         )
 
-    if event.host_id != current_user.id:
+    if event.host_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the host can update this event"
@@ -290,19 +495,35 @@ async def update_event(
 
     # Update fields
     update_data = event_update.model_dump(exclude_unset=True)
+    latitude = update_data.pop("latitude", None)
+    longitude = update_data.pop("longitude", None)
     for field, value in update_data.items():
         setattr(event, field, value)
 
+    # Explicit coordinates win; a new address without them is geocoded again
+    if "latitude" in event_update.model_fields_set:
+        set_event_location(event, latitude, longitude)
+    elif "location_address" in update_data:
+        await locate_event(event, None, None, event.location_address, geocoder)
+
+    # Keep the derived deadline and the scheduler's flags in step with the dates
+    if "event_date" in update_data:
+        event.confirmation_deadline = confirmation_deadline_for(event.event_date)
+    now = datetime.utcnow()
+    event.rsvps_closed = event.rsvp_deadline <= now
+    event.needs_completion = event.status == EventStatus.CONFIRMED.value and event.event_date <= now
+
     await db.commit()
+    event_response_cache.invalidate(event_id)
     await db.refresh(event)
 
-    return event_to_response(event)
+    return json_response(event_to_response(event))
 
 
 @router.post("/{event_id}/confirm", response_model=EventResponse)
 async def confirm_event(
     event_id: int,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Confirm an event (host only). Requires minimum RSVPs to be met."""
@@ -311,7 +532,6 @@ async def confirm_event(
         .options(
             selectinload(Event.host),
             selectinload(Event.food_items),
-            selectinload(Event.rsvps)
         )
         .where(Event.id == event_id)
     )
@@ -323,7 +543,7 @@ async def confirm_event(
             detail="Event not found"
         )
 
-    if event.host_id != current_user.id:
+    if event.host_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the host can confirm this event"
@@ -343,15 +563,16 @@ async def confirm_event(
 
     event.status = EventStatus.CONFIRMED.value
     await db.commit()
+    event_response_cache.invalidate(event_id)
     await db.refresh(event)
 
-    return event_to_response(event)
+    return json_response(event_to_response(event))
 
 
 @router.post("/{event_id}/cancel", response_model=EventResponse)
 async def cancel_event(
     event_id: int,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Cancel an event (host only)"""
@@ -360,7 +581,6 @@ async def cancel_event(
         .options(
             selectinload(Event.host),
             selectinload(Event.food_items),
-            selectinload(Event.rsvps)
         )
         .where(Event.id == event_id)
     )
@@ -372,7 +592,7 @@ async def cancel_event(
             detail="Event not found"
         )
 
-    if event.host_id != current_user.id:
+    if event.host_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the host can cancel this event"
@@ -387,20 +607,28 @@ async def cancel_event(
     event.status = EventStatus.CANCELLED.value
 
     # Cancel all RSVPs
-    for rsvp in event.rsvps:
-        if rsvp.status in [RSVPStatus.PENDING.value, RSVPStatus.CONFIRMED.value]:
-            rsvp.status = RSVPStatus.CANCELLED.value
+    await db.execute(
+        update(RSVP)
+        .where(
+            RSVP.event_id == event.id,
+            RSVP.status.in_([RSVPStatus.PENDING.value, RSVPStatus.CONFIRMED.value])
+        )
+        .values(status=RSVPStatus.CANCELLED.value)
+        .execution_options(synchronize_session=False)
+    )
+    await reset_event_counters(db, event.id)
 
     await db.commit()
+    event_response_cache.invalidate(event_id)
     await db.refresh(event)
 
-    return event_to_response(event)
+    return json_response(event_to_response(event))
 
 
 @router.post("/{event_id}/complete", response_model=EventResponse)
 async def complete_event(
     event_id: int,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Mark event as completed (host only). Should be called after the event."""
@@ -409,7 +637,6 @@ async def complete_event(
         .options(
             selectinload(Event.host),
             selectinload(Event.food_items),
-            selectinload(Event.rsvps).selectinload(RSVP.user)
         )
         .where(Event.id == event_id)
     )
@@ -421,7 +648,7 @@ async def complete_event(
             detail="Event not found"
         )
 
-    if event.host_id != current_user.id:
+    if event.host_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the host can complete this event"
@@ -434,23 +661,28 @@ async def complete_event(
         )
 
     event.status = EventStatus.COMPLETED.value
+    event.needs_completion = False
 
-    # Update host stats
-    current_user.events_hosted += 1
-    current_user.successful_events += 1
-    current_user.trust_score += settings.successful_event_bonus
+    # Update host stats through the trust ledger
+    await record_trust_events(db, [trust_event(
+        principal.user_id, TrustEventKind.HOSTED_EVENT,
+        trust=settings.successful_event_bonus, events_hosted=1, successful_events=1,
+        event_id=event.id,
+    )])
 
     await db.commit()
+    event_response_cache.invalidate(event_id)
     await db.refresh(event)
+    await db.refresh(event.host)
 
-    return event_to_response(event)
+    return json_response(event_to_response(event))
 
 
 @router.post("/{event_id}/food-items", response_model=FoodItemResponse)
 async def add_food_item(
     event_id: int,
     food_item: FoodItemCreate,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Add a food item to the event's list (host only)"""
@@ -463,7 +695,7 @@ async def add_food_item(
             detail="Event not found"
         )
 
-    if event.host_id != current_user.id:
+    if event.host_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the host can add food items"
@@ -477,10 +709,13 @@ async def add_food_item(
     )
 
     db.add(new_food_item)
+    await touch_events(db, Event.id == event_id)
     await db.commit()
+    event_response_cache.invalidate(event_id)
     await db.refresh(new_food_item)
 
-    return FoodItemResponse(
+    return json_response(trusted(
+        FoodItemResponse,
         id=new_food_item.id,
         name=new_food_item.name,
         description=new_food_item.description,
@@ -488,4 +723,4 @@ async def add_food_item(
         quantity_claimed=new_food_item.quantity_claimed,
         is_fully_claimed=new_food_item.is_fully_claimed,
         remaining_needed=new_food_item.remaining_needed,
-    )
+    ))
@@ -0,0 +1,92 @@
+"""
+Streaming NDJSON exports.
+
+Each line is one event as GET /api/events/{id} returns it, plus an "rsvps"
+list with the host's view of every RSVP. Events are read with a streaming
+(server-side on PostgreSQL) cursor in batches of EXPORT_BATCH_SIZE; each
+batch loads its RSVPs and food items with one IN query per relationship and
+is written out. Nothing keeps a written batch alive (the session's identity
+map holds unmodified objects by weak reference), so memory stays flat
+however many events match, and the first lines go out while later batches
+are still being read.
+
+The stream opens its own session because it outlives the request's
+dependencies. Errors after the first line can no longer change the status
+code; the connection is cut instead, so a truncated export never ends
+cleanly.
+"""
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.auth import get_current_user, get_current_admin
+from app.database import async_session_maker
+from app.models.user import User
+from app.models.event import Event
+from app.models.rsvp import RSVP
+from app.routers.events import event_to_response
+from app.routers.rsvps import rsvp_to_response
+from app.serialization import dumps
+from app.config import get_settings
+
+router = APIRouter(prefix="/api/export", tags=["Export"])
+settings = get_settings()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def event_export_record(event: Event) -> dict:
+    """One export line: the event detail payload plus its RSVPs (host view)"""
+    record = event_to_response(event)
+    record["rsvps"] = [
+        rsvp_to_response(rsvp, rsvp.user)
+        for rsvp in sorted(event.rsvps, key=lambda rsvp: rsvp.id)
+    ]
+    return record
+
+
+async def stream_event_export(*criteria) -> AsyncIterator[bytes]:
+    """Yield NDJSON for the matching events in id order, one chunk per batch"""
+    async with async_session_maker() as db:
+        result = await db.stream_scalars(
+            select(Event)
+            .options(
+                selectinload(Event.host),
+                selectinload(Event.food_items),
+                selectinload(Event.rsvps).selectinload(RSVP.user),
+            )
+            .where(*criteria)
+            .order_by(Event.id)
+            .execution_options(yield_per=settings.export_batch_size)
+        )
+        async for events in result.partitions():
+            yield b"".join(dumps(event_export_record(event)) + b"\n" for event in events)
+
+
+def ndjson_response(chunks: AsyncIterator[bytes], filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.get("/my-events")
+async def export_my_events(current_user: User = Depends(get_current_user)):
+    """Stream every event the current user hosts, with RSVPs and food items, as NDJSON"""
+    return ndjson_response(
+        stream_event_export(Event.host_id == current_user.id),
+        f"foodshare-events-{current_user.id}.ndjson",  # Usernames need not be ASCII; headers must be
+    )
+
+
+@router.get("/events")
+async def export_all_events(admin: User = Depends(get_current_admin)):
+    """Stream every event on the platform, with RSVPs and food items, as NDJSON (admins only)"""
+    return ndjson_response(stream_event_export(), "foodshare-events.ndjson")
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, insert
 from sqlalchemy.orm import selectinload
 from datetime import datetime
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 
 from app.database import get_db
 from app.models.user import User
 from app.models.event import Event, EventStatus
 from app.models.rsvp import RSVP, RSVPStatus
-from app.auth import get_current_user
+from app.auth import get_current_user, get_current_principal, Principal
+from app.cache import event_response_cache
+from app.serialization import trusted, json_response
+from app.event_counters import apply_rsvp_transition, apply_counter_deltas_if_room, counter_deltas
 
 router = APIRouter(prefix="/api/invites", tags=["Invites"])
 
@@ -32,18 +35,35 @@ class InviteResponse(BaseModel):
         from_attributes = True
 
 
+class InviteBatchCreate(BaseModel):
+    event_id: int
+    usernames: List[str] = Field(..., min_length=1, max_length=100)
+
+
+class InviteOutcome(BaseModel):
+    username: str
+    ok: bool
+    invite: Optional[InviteResponse] = None
+    error: Optional[str] = None
+
+
+class InviteBatchResponse(BaseModel):
+    event_id: int
+    invited: int
+    failed: int
+    results: List[InviteOutcome]  # One per distinct username, in request order
+
+
 @router.post("/", response_model=InviteResponse, status_code=status.HTTP_201_CREATED)
 async def create_invite(
     invite_data: InviteCreate,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Invite a user to an event (creates a reserved RSVP)"""
     # Get the event
     result = await db.execute(
-        select(Event)
-        .options(selectinload(Event.rsvps))
-        .where(Event.id == invite_data.event_id)
+        select(Event).where(Event.id == invite_data.event_id)
     )
     event = result.scalar_one_or_none()
 
@@ -54,7 +74,7 @@ async def create_invite(
         )
 
     # Check if user is the host
-    if event.host_id != current_user.id:
+    if event.host_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the host can invite guests"
@@ -85,19 +105,24 @@ async def create_invite(
         )
 
     # Check if user is already invited/RSVP'd
-    existing = next(
-        (r for r in event.rsvps if r.user_id == invitee.id and r.status not in [RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value]),
-        None
+    result = await db.execute(
+        select(RSVP.id)
+        .where(
+            RSVP.event_id == event.id,
+            RSVP.user_id == invitee.id,
+            RSVP.status.notin_([RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value])
+        )
+        .limit(1)
     )
-    if existing:
+    if result.scalar_one_or_none() is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is already invited or has RSVP'd"
         )
 
-    # Check reserved spots
-    reserved_rsvps = len([r for r in event.rsvps if r.is_reserved and r.status not in [RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value]])
-    if reserved_rsvps >= event.reserved_spots:
+    # Take a reserved spot; the UPDATE only matches while one is free
+    deltas = counter_deltas(None, RSVPStatus.PENDING.value, reserved=True)
+    if not await apply_counter_deltas_if_room(db, event.id, deltas):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No more reserved spots available"
@@ -114,6 +139,7 @@ async def create_invite(
 
     db.add(new_rsvp)
     await db.commit()
+    event_response_cache.invalidate(event.id)
     await db.refresh(new_rsvp)
 
     return InviteResponse(
@@ -126,10 +152,135 @@ async def create_invite(
     )
 
 
+@router.post("/batch", response_model=InviteBatchResponse)
+async def create_invites(
+    batch: InviteBatchCreate,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Invite several users to an event at once (creates reserved RSVPs).
+
+    Usernames are resolved with one query and the reserved spots for the
+    whole batch are taken with one conditional UPDATE. When fewer are free,
+    the batch is trimmed to the spots left and invites go out in request
+    order. Each username gets its own outcome.
+    """
+    result = await db.execute(select(Event).where(Event.id == batch.event_id))
+    event = result.scalar_one_or_none()
+
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    if event.host_id != principal.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the host can invite guests"
+        )
+
+    if event.status not in [EventStatus.DRAFT.value, EventStatus.OPEN.value]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot invite to this event"
+        )
+
+    usernames = list(dict.fromkeys(name.strip() for name in batch.usernames if name.strip()))
+
+    # Resolve every username in one query
+    result = await db.execute(
+        select(User.id, User.username).where(User.username.in_(usernames))
+    )
+    user_ids = {row.username: row.id for row in result.all()}
+
+    # Who already has an invite or RSVP
+    result = await db.execute(
+        select(RSVP.user_id)
+        .where(
+            RSVP.event_id == event.id,
+            RSVP.user_id.in_(list(user_ids.values())),
+            RSVP.status.notin_([RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value])
+        )
+    )
+    already_invited = set(result.scalars().all())
+
+    errors = {}
+    to_invite = []
+    for username in usernames:
+        user_id = user_ids.get(username)
+        if user_id is None:
+            errors[username] = "User not found"
+        elif user_id == event.host_id:
+            errors[username] = "Hosts cannot invite themselves"
+        elif user_id in already_invited:
+            errors[username] = "User is already invited or has RSVP'd"
+        else:
+            to_invite.append(username)
+
+    # Take the reserved spots with a conditional UPDATE; if the whole batch
+    # doesn't fit, trim it to the spots left (which concurrent invites may
+    # still be taking) and try again
+    deltas = counter_deltas(None, RSVPStatus.PENDING.value, reserved=True)
+    while to_invite and not await apply_counter_deltas_if_room(
+        db, event.id, {column: delta * len(to_invite) for column, delta in deltas.items()}
+    ):
+        result = await db.execute(
+            select(func.coalesce(Event.reserved_spots, 0) - Event.reserved_rsvp_count)
+            .where(Event.id == event.id)
+        )
+        spots_left = max(min(result.scalar_one(), len(to_invite) - 1), 0)
+        for username in to_invite[spots_left:]:
+            errors[username] = "No more reserved spots available"
+        del to_invite[spots_left:]
+
+    invites = {}
+    if to_invite:
+        invited_at = datetime.utcnow()
+        result = await db.execute(
+            insert(RSVP).returning(RSVP.id, RSVP.user_id),
+            [
+                {
+                    "user_id": user_ids[username],
+                    "event_id": event.id,
+                    "status": RSVPStatus.PENDING.value,
+                    "is_reserved": True,
+                    "invited_at": invited_at,
+                }
+                for username in to_invite
+            ],
+        )
+        rsvp_ids = {row.user_id: row.id for row in result.all()}
+        await db.commit()
+        event_response_cache.invalidate(event.id)
+
+        for username in to_invite:
+            invites[username] = InviteResponse(
+                id=rsvp_ids[user_ids[username]],
+                user_id=user_ids[username],
+                event_id=event.id,
+                username=username,
+                status=RSVPStatus.PENDING.value,
+                invited_at=invited_at,
+            )
+
+    return InviteBatchResponse(
+        event_id=event.id,
+        invited=len(invites),
+        failed=len(errors),
+        results=[
+            InviteOutcome(username=username, ok=True, invite=invites[username])
+            if username in invites
+            else InviteOutcome(username=username, ok=False, error=errors[username])
+            for username in usernames
+        ],
+    )
+
+
 @router.get("/event/{event_id}", response_model=List[InviteResponse])
 async def get_event_invites(
     event_id: int,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all invites for an event (host only)"""
@@ -142,7 +293,7 @@ async def get_event_invites(
             detail="Event not found"
         )
 
-    if event.host_id != current_user.id:
+    if event.host_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the host can view invites"
@@ -155,8 +306,9 @@ async def get_event_invites(
     )
     invites = result.scalars().all()
 
-    return [
-        InviteResponse(
+    return json_response([
+        trusted(
+            InviteResponse,
             id=i.id,
             user_id=i.user_id,
             event_id=i.event_id,
@@ -165,43 +317,44 @@ async def get_event_invites(
             invited_at=i.invited_at or i.created_at,
         )
         for i in invites
-    ]
+    ])
 
 
 @router.get("/my-invites", response_model=List[InviteResponse])
 async def get_my_invites(
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all invites for the current user"""
+    """Get all invites for the current user (one query; the username comes from a join)"""
     result = await db.execute(
-        select(RSVP)
-        .options(selectinload(RSVP.event))
+        select(RSVP, User.username)
+        .join(User, User.id == RSVP.user_id)
         .where(
-            RSVP.user_id == current_user.id,
+            RSVP.user_id == principal.user_id,
             RSVP.is_reserved == True,
             RSVP.status == RSVPStatus.PENDING.value
         )
     )
-    invites = result.scalars().all()
+    invites = result.all()
 
-    return [
-        InviteResponse(
+    return json_response([
+        trusted(
+            InviteResponse,
             id=i.id,
             user_id=i.user_id,
             event_id=i.event_id,
-            username=current_user.username,
+            username=username,
             status=i.status,
             invited_at=i.invited_at or i.created_at,
         )
-        for i in invites
-    ]
+        for i, username in invites
+    ])
 
 
 @router.post("/{invite_id}/accept")
 async def accept_invite(
     invite_id: int,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Accept an invite"""
@@ -216,7 +369,7 @@ async def accept_invite(
             detail="Invite not found"
         )
 
-    if invite.user_id != current_user.id:
+    if invite.user_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="This invite is not for you"
@@ -230,8 +383,12 @@ async def accept_invite(
 
     invite.status = RSVPStatus.CONFIRMED.value
     invite.confirmed_at = datetime.utcnow()
+    await apply_rsvp_transition(
+        db, invite.event_id, RSVPStatus.PENDING.value, invite.status, invite.guest_count, reserved=invite.is_reserved
+    )
 
     await db.commit()
+    event_response_cache.invalidate(invite.event_id)
 
     return {"message": "Invite accepted", "status": "confirmed"}
 
@@ -239,7 +396,7 @@ async def accept_invite(
 @router.post("/{invite_id}/decline")
 async def decline_invite(
     invite_id: int,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Decline an invite"""
@@ -254,7 +411,7 @@ async def decline_invite(
             detail="Invite not found"
         )
 
-    if invite.user_id != current_user.id:
+    if invite.user_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="This invite is not for you"
@@ -267,7 +424,11 @@ async def decline_invite(
         )
 
     invite.status = RSVPStatus.DECLINED.value
+    await apply_rsvp_transition(
+        db, invite.event_id, RSVPStatus.PENDING.value, invite.status, invite.guest_count, reserved=invite.is_reserved
+    )
 
     await db.commit()
+    event_response_cache.invalidate(invite.event_id)
 
     return {"message": "Invite declined", "status": "declined"}
@@ -1,21 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, and_
 from sqlalchemy.orm import selectinload
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
 from app.models.user import User
 from app.models.event import Event, EventFoodItem, EventStatus
 from app.models.rsvp import RSVP, RSVPStatus
-from app.schemas.rsvp import RSVPCreate, RSVPResponse, RSVPUpdate, RSVPStatusUpdate, RSVPWithEventResponse
-from app.auth import get_current_user
+from app.models.trust_event import TrustEventKind
+from app.schemas.rsvp import (
+    RSVPCreate,
+    RSVPResponse,
+    RSVPUpdate,
+    RSVPStatusUpdate,
+    RSVPWithEventResponse,
+    RSVPBulkStatusUpdate,
+    RSVPBulkStatusResponse,
+    RSVPStatusResult,
+)
+from app.auth import get_current_user, get_current_principal, Principal
+from app.cache import event_response_cache
+from app.event_counters import (
+    ACTIVE_STATUSES,
+    admit_rsvp,
+    apply_rsvp_transition,
+    apply_counter_deltas,
+    apply_counter_deltas_if_room,
+    counter_deltas,
+)
+from app.food_claims import claim_food_item, release_food_item
+from app.trust import record_trust_events, trust_event
+from app.serialization import trusted, json_response
+from app.etags import PRIVATE_CACHE_CONTROL, make_etag, etag_matches, not_modified, set_etag, touch_events
 from app.config import get_settings
 
 router = APIRouter(prefix="/api/rsvps", tags=["RSVPs"])
 settings = get_settings()
 
+# Statuses a host may set on a guest's RSVP, each with the statuses it may
+# replace. Attendance is recorded once, so attended and no_show are final; a
+# declined guest can be confirmed again if their guests still fit.
+HOST_TRANSITIONS = {
+    RSVPStatus.CONFIRMED.value: (RSVPStatus.PENDING.value, RSVPStatus.DECLINED.value),
+    RSVPStatus.DECLINED.value: (RSVPStatus.PENDING.value, RSVPStatus.CONFIRMED.value),
+    RSVPStatus.ATTENDED.value: (RSVPStatus.PENDING.value, RSVPStatus.CONFIRMED.value),
+    RSVPStatus.NO_SHOW.value: (RSVPStatus.PENDING.value, RSVPStatus.CONFIRMED.value),
+}
+HOST_SETTABLE_STATUSES = list(HOST_TRANSITIONS)
+
+
+def host_transition_error(old_status: str, new_status: str) -> Optional[str]:
+    """Why the host can't move an RSVP from old_status to new_status, or None.
+    Keeping the current status is allowed (it changes nothing)."""
+    if new_status not in HOST_TRANSITIONS:
+        return f"Invalid status. Must be one of: {HOST_SETTABLE_STATUSES}"
+    if new_status != old_status and old_status not in HOST_TRANSITIONS[new_status]:
+        return f"Cannot change RSVP status from {old_status} to {new_status}"
+    return None
+
+
+def rsvp_to_response(rsvp: RSVP, user: Optional[User], private: bool = True) -> dict:
+    """Convert RSVP model to an RSVPResponse payload. With private=False the
+    message and the guest's trust details are left out (non-host view)."""
+    return trusted(
+        RSVPResponse,
+        id=rsvp.id,
+        user_id=rsvp.user_id,
+        event_id=rsvp.event_id,
+        status=rsvp.status,
+        guest_count=rsvp.guest_count,
+        message=rsvp.message if private else None,
+        bringing_food_item=rsvp.bringing_food_item,
+        food_notes=rsvp.food_notes,
+        food_item_id=rsvp.food_item_id,
+        is_reserved=rsvp.is_reserved,
+        created_at=rsvp.created_at,
+        confirmed_at=rsvp.confirmed_at,
+        user_username=user.username if user else None,
+        user_trust_score=user.trust_score if user and private else None,
+        user_reliability=user.reliability_percentage if user and private else None,
+    )
+
 
 @router.post("/", response_model=RSVPResponse, status_code=status.HTTP_201_CREATED)
 async def create_rsvp(
@@ -25,11 +93,7 @@ async def create_rsvp(
 ):
     """RSVP to an event"""
     # Get the event
-    result = await db.execute(
-        select(Event)
-        .options(selectinload(Event.rsvps), selectinload(Event.food_items))
-        .where(Event.id == rsvp_data.event_id)
-    )
+    result = await db.execute(select(Event).where(Event.id == rsvp_data.event_id))
     event = result.scalar_one_or_none()
 
     if not event:
@@ -53,11 +117,16 @@ async def create_rsvp(
         )
 
     # Check if user already RSVP'd
-    existing_rsvp = next(
-        (r for r in event.rsvps if r.user_id == current_user.id and r.status not in [RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value]),
-        None
+    result = await db.execute(
+        select(RSVP.id)
+        .where(
+            RSVP.event_id == event.id,
+            RSVP.user_id == current_user.id,
+            RSVP.status.notin_([RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value])
+        )
+        .limit(1)
     )
-    if existing_rsvp:
+    if result.scalar_one_or_none() is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You have already RSVP'd to this event"
@@ -70,31 +139,29 @@ async def create_rsvp(
             detail="Hosts cannot RSVP to their own events"
         )
 
-    # Check available spots
+    # Check available spots (a cheap early reject; admit_rsvp below decides)
     if event.available_spots < rsvp_data.guest_count:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Not enough spots available. Available: {event.available_spots}"
         )
 
-    # If claiming a food item, validate it
-    if rsvp_data.food_item_id:
-        food_item = next(
-            (fi for fi in event.food_items if fi.id == rsvp_data.food_item_id),
-            None
-        )
-        if not food_item:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Food item not found for this event"
-            )
-        if food_item.is_fully_claimed:
+    # Take the spots (capacity is checked by the same UPDATE that reserves them)
+    if not await admit_rsvp(db, event.id, rsvp_data.guest_count):
+        await db.refresh(event)
+        if event.status != EventStatus.OPEN.value:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="This food item has already been fully claimed"
+                detail=f"Cannot RSVP to event with status: {event.status}"
             )
-        # Increment claimed count
-        food_item.quantity_claimed += 1
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Not enough spots available. Available: {event.available_spots}"
+        )
+
+    # If claiming a food item, claim it (400 if missing or fully claimed)
+    if rsvp_data.food_item_id:
+        await claim_food_item(db, event.id, rsvp_data.food_item_id)
 
     # Create the RSVP
     new_rsvp = RSVP(
@@ -110,68 +177,60 @@ async def create_rsvp(
 
     db.add(new_rsvp)
     await db.commit()
+    event_response_cache.invalidate(event.id)
     await db.refresh(new_rsvp)
 
-    return RSVPResponse(
-        id=new_rsvp.id,
-        user_id=new_rsvp.user_id,
-        event_id=new_rsvp.event_id,
-        status=new_rsvp.status,
-        guest_count=new_rsvp.guest_count,
-        message=new_rsvp.message,
-        bringing_food_item=new_rsvp.bringing_food_item,
-        food_notes=new_rsvp.food_notes,
-        food_item_id=new_rsvp.food_item_id,
-        is_reserved=new_rsvp.is_reserved,
-        created_at=new_rsvp.created_at,
-        confirmed_at=new_rsvp.confirmed_at,
-        user_username=current_user.username,
-        user_trust_score=current_user.trust_score,
-        user_reliability=current_user.reliability_percentage,
-    )
+    return json_response(rsvp_to_response(new_rsvp, current_user), status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/my-rsvps", response_model=List[RSVPWithEventResponse])
 async def get_my_rsvps(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all RSVPs for the current user"""
+    """Get all RSVPs for the current user.
+
+    One projection query; the ETag covers its rows, so a matching
+    If-None-Match gets a 304 without building the response models.
+    """
     result = await db.execute(
-        select(RSVP)
-        .options(selectinload(RSVP.event))
-        .where(RSVP.user_id == current_user.id)
+        select(
+            RSVP.id,
+            RSVP.user_id,
+            RSVP.event_id,
+            RSVP.status,
+            RSVP.guest_count,
+            RSVP.message,
+            RSVP.bringing_food_item,
+            RSVP.food_notes,
+            RSVP.food_item_id,
+            RSVP.is_reserved,
+            RSVP.created_at,
+            RSVP.confirmed_at,
+            Event.title.label("event_title"),
+            Event.event_date,
+            Event.location_name.label("event_location"),
+            Event.status.label("event_status"),
+        )
+        .outerjoin(Event, Event.id == RSVP.event_id)
+        .where(RSVP.user_id == principal.user_id)
         .order_by(RSVP.created_at.desc())
     )
-    rsvps = result.scalars().all()
+    rows = result.all()
 
-    return [
-        RSVPWithEventResponse(
-            id=r.id,
-            user_id=r.user_id,
-            event_id=r.event_id,
-            status=r.status,
-            guest_count=r.guest_count,
-            message=r.message,
-            bringing_food_item=r.bringing_food_item,
-            food_notes=r.food_notes,
-            food_item_id=r.food_item_id,
-            is_reserved=r.is_reserved,
-            created_at=r.created_at,
-            confirmed_at=r.confirmed_at,
-            event_title=r.event.title if r.event else None,
-            event_date=r.event.event_date if r.event else None,
-            event_location=r.event.location_name if r.event else None,
-            event_status=r.event.status if r.event else None,
-        )
-        for r in rsvps
-    ]
+    etag = make_etag("my-rsvps", principal.user_id, [tuple(row) for row in rows])
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_CONTROL)
+    response = json_response([trusted(RSVPWithEventResponse, **row._mapping) for row in rows])
+    set_etag(response, etag, PRIVATE_CACHE_CONTROL)
+    return response
 
 
 @router.get("/event/{event_id}", response_model=List[RSVPResponse])
 async def get_event_rsvps(
     event_id: int,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all RSVPs for an event (host only sees full details, guests see limited info)"""
@@ -192,28 +251,9 @@ async def get_event_rsvps(
     )
     rsvps = result.scalars().all()
 
-    is_host = event.host_id == current_user.id
-
-    return [
-        RSVPResponse(
-            id=r.id,
-            user_id=r.user_id,
-            event_id=r.event_id,
-            status=r.status,
-            guest_count=r.guest_count,
-            message=r.message if is_host else None,
-            bringing_food_item=r.bringing_food_item,
-            food_notes=r.food_notes,
-            food_item_id=r.food_item_id,
-            is_reserved=r.is_reserved,
-            created_at=r.created_at,
-            confirmed_at=r.confirmed_at,
-            user_username=r.user.username if r.user else None,
-            user_trust_score=r.user.trust_score if r.user and is_host else None,
-            user_reliability=r.user.reliability_percentage if r.user and is_host else None,
-        )
-        for r in rsvps
-    ]
+    is_host = event.host_id == principal.user_id
+
+    return json_response([rsvp_to_response(r, r.user, private=is_host) for r in rsvps])
 
 
 @router.patch("/{rsvp_id}", response_model=RSVPResponse)
@@ -251,29 +291,30 @@ async def update_rsvp(
 
     # Update fields
     update_data = rsvp_update.model_dump(exclude_unset=True)
+
+    # Extra guests need room, checked by the same UPDATE that counts them
+    new_guest_count = update_data.get("guest_count") or rsvp.guest_count
+    deltas = counter_deltas(rsvp.status, rsvp.status, rsvp.guest_count, new_guest_count)
+    if not await apply_counter_deltas_if_room(db, rsvp.event_id, deltas):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Not enough spots available. Available: {rsvp.event.available_spots}"
+        )
+
+    # Move the food item claim if it changed
+    if "food_item_id" in update_data and update_data["food_item_id"] != rsvp.food_item_id:
+        if update_data["food_item_id"]:
+            await claim_food_item(db, rsvp.event_id, update_data["food_item_id"])
+        await release_food_item(db, rsvp.food_item_id)
+        await touch_events(db, Event.id == rsvp.event_id)
     for field, value in update_data.items():
         setattr(rsvp, field, value)
 
     await db.commit()
+    event_response_cache.invalidate(rsvp.event_id)
     await db.refresh(rsvp)
 
-    return RSVPResponse(
-        id=rsvp.id,
-        user_id=rsvp.user_id,
-        event_id=rsvp.event_id,
-        status=rsvp.status,
-        guest_count=rsvp.guest_count,
-        message=rsvp.message,
-        bringing_food_item=rsvp.bringing_food_item,
-        food_notes=rsvp.food_notes,
-        food_item_id=rsvp.food_item_id,
-        is_reserved=rsvp.is_reserved,
-        created_at=rsvp.created_at,
-        confirmed_at=rsvp.confirmed_at,
-        user_username=current_user.username,
-        user_trust_score=current_user.trust_score,
-        user_reliability=current_user.reliability_percentage,
-    )
+    return json_response(rsvp_to_response(rsvp, current_user))
 
 
 @router.post("/{rsvp_id}/cancel", response_model=RSVPResponse)
@@ -285,7 +326,7 @@ async def cancel_rsvp(
     """Cancel an RSVP (guest only)"""
     result = await db.execute(
         select(RSVP)
-        .options(selectinload(RSVP.event), selectinload(RSVP.food_item))
+        .options(selectinload(RSVP.event))
         .where(RSVP.id == rsvp_id)
     )
     rsvp = result.scalar_one_or_none()
@@ -308,39 +349,40 @@ async def cancel_rsvp(
             detail=f"Cannot cancel RSVP with status: {rsvp.status}"
         )
 
-    rsvp.status = RSVPStatus.CANCELLED.value
+    # Only the request that moves the RSVP out of the status it read gives
+    # back its spots and food claim; a concurrent duplicate matches no row
+    old_status = rsvp.status
+    result = await db.execute(
+        update(RSVP)
+        .where(RSVP.id == rsvp.id, RSVP.status == old_status)
+        .values(status=RSVPStatus.CANCELLED.value)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        await db.refresh(rsvp)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot cancel RSVP with status: {rsvp.status}"
+        )
+    await apply_rsvp_transition(
+        db, rsvp.event_id, old_status, RSVPStatus.CANCELLED.value, rsvp.guest_count, reserved=rsvp.is_reserved
+    )
 
     # Release the food item claim
-    if rsvp.food_item:
-        rsvp.food_item.quantity_claimed = max(0, rsvp.food_item.quantity_claimed - 1)
+    await release_food_item(db, rsvp.food_item_id)
 
     await db.commit()
+    event_response_cache.invalidate(rsvp.event_id)
     await db.refresh(rsvp)
 
-    return RSVPResponse(
-        id=rsvp.id,
-        user_id=rsvp.user_id,
-        event_id=rsvp.event_id,
-        status=rsvp.status,
-        guest_count=rsvp.guest_count,
-        message=rsvp.message,
-        bringing_food_item=rsvp.bringing_food_item,
-        food_notes=rsvp.food_notes,
-        food_item_id=rsvp.food_item_id,
-        is_reserved=rsvp.is_reserved,
-        created_at=rsvp.created_at,
-        confirmed_at=rsvp.confirmed_at,
-        user_username=current_user.username,
-        user_trust_score=current_user.trust_score,
-        user_reliability=current_user.reliability_percentage,
-    )
+    return json_response(rsvp_to_response(rsvp, current_user))
 
 
 @router.post("/{rsvp_id}/status", response_model=RSVPResponse)
 async def update_rsvp_status(
     rsvp_id: int,
     status_update: RSVPStatusUpdate,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update RSVP status (host only for confirm/decline/attended/no_show)"""
@@ -358,32 +400,50 @@ async def update_rsvp_status(
         )
 
     # Check if current user is the host
-    if rsvp.event.host_id != current_user.id:
+    if rsvp.event.host_id != principal.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the host can update RSVP status"
         )
 
     new_status = status_update.status.lower()
+    old_status = rsvp.status
 
     # Validate status transition
-    valid_statuses = ["confirmed", "declined", "attended", "no_show"]
-    if new_status not in valid_statuses:
+    error = host_transition_error(old_status, new_status)
+    if error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error
+        )
+    if new_status == old_status:
+        return json_response(rsvp_to_response(rsvp, rsvp.user))
+
+    # Confirming a declined RSVP takes its guests' spots (or, for an invite,
+    # its reserved spot) again, if they fit
+    deltas = counter_deltas(old_status, new_status, rsvp.guest_count, reserved=rsvp.is_reserved)
+    if not await apply_counter_deltas_if_room(db, rsvp.event_id, deltas):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {valid_statuses}"
+            detail=f"Not enough spots available. Available: {rsvp.event.available_spots}"
         )
 
-    # Handle attended/no_show - update user stats
+    # Handle attended/no_show - update user stats through the trust ledger
     if new_status == "attended":
         rsvp.mark_attended()
-        rsvp.user.events_attended += 1
-        rsvp.user.trust_score += settings.successful_event_bonus
+        await record_trust_events(db, [trust_event(
+            rsvp.user_id, TrustEventKind.ATTENDED,
+            trust=settings.successful_event_bonus, events_attended=1,
+            event_id=rsvp.event_id, rsvp_id=rsvp.id,
+        )])
 
     elif new_status == "no_show":
         rsvp.mark_no_show()
-        rsvp.user.flake_count += 1
-        rsvp.user.trust_score = max(0, rsvp.user.trust_score - settings.flake_penalty)
+        await record_trust_events(db, [trust_event(
+            rsvp.user_id, TrustEventKind.NO_SHOW,
+            trust=-settings.flake_penalty, flake_count=1,
+            event_id=rsvp.event_id, rsvp_id=rsvp.id,
+        )])
 
     elif new_status == "confirmed":
         rsvp.confirm()
@@ -392,22 +452,146 @@ async def update_rsvp_status(
         rsvp.status = new_status
 
     await db.commit()
+    event_response_cache.invalidate(rsvp.event_id)
     await db.refresh(rsvp)
+    await db.refresh(rsvp.user)
 
-    return RSVPResponse(
-        id=rsvp.id,
-        user_id=rsvp.user_id,
-        event_id=rsvp.event_id,
-        status=rsvp.status,
-        guest_count=rsvp.guest_count,
-        message=rsvp.message,
-        bringing_food_item=rsvp.bringing_food_item,
-        food_notes=rsvp.food_notes,
-        food_item_id=rsvp.food_item_id,
-        is_reserved=rsvp.is_reserved,
-        created_at=rsvp.created_at,
-        confirmed_at=rsvp.confirmed_at,
-        user_username=rsvp.user.username,
-        user_trust_score=rsvp.user.trust_score,
-        user_reliability=rsvp.user.reliability_percentage,
+    return json_response(rsvp_to_response(rsvp, rsvp.user))
+
+
+@router.post("/event/{event_id}/status", response_model=RSVPBulkStatusResponse)
+async def bulk_update_rsvp_status(
+    event_id: int,
+    bulk_update: RSVPBulkStatusUpdate,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Update the status of many RSVPs of one event at once (host only).
+
+    Each item succeeds or fails on its own; the successful ones are applied
+    together in one transaction with one UPDATE per target status, one
+    counter update for the event and one batch of user stat updates.
+    An item that already has the requested status is reported unchanged.
+    Items follow the same transition rules as the single-RSVP endpoint, and
+    declined RSVPs confirmed again go through the capacity guard one by one,
+    after the spots freed by the rest of the batch.
+    """
+    result = await db.execute(select(Event.host_id).where(Event.id == event_id))
+    host_id = result.scalar_one_or_none()
+
+    if host_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    if host_id != principal.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the host can update RSVP status"
+        )
+
+    requested_ids = [item.rsvp_id for item in bulk_update.updates]
+    result = await db.execute(
+        select(RSVP.id, RSVP.user_id, RSVP.status, RSVP.guest_count, RSVP.is_reserved)
+        .where(RSVP.event_id == event_id, RSVP.id.in_(set(requested_ids)))
     )
+    rsvps = {row.id: row for row in result.all()}
+
+    # Validate every item before writing anything
+    duplicates = {rsvp_id for rsvp_id, n in Counter(requested_ids).items() if n > 1}
+    results = []
+    result_index = {}  # rsvp id -> position in results
+    changes = {}  # rsvp id -> new status
+    for item in bulk_update.updates:
+        new_status = item.status.lower()
+        row = rsvps.get(item.rsvp_id)
+        if item.rsvp_id in duplicates:
+            error = "RSVP listed more than once"
+        elif row is None:
+            error = "RSVP not found for this event"
+        else:
+            error = host_transition_error(row.status, new_status)
+
+        if error:
+            results.append(trusted(RSVPStatusResult, rsvp_id=item.rsvp_id, ok=False, error=error))
+            continue
+
+        if new_status != row.status:
+            changes[row.id] = new_status
+        result_index[row.id] = len(results)
+        results.append(trusted(
+            RSVPStatusResult,
+            rsvp_id=row.id,
+            ok=True,
+            status=new_status,
+            previous_status=row.status,
+        ))
+
+    # Apply the spots freed by the batch first, then confirm declined RSVPs
+    # again one at a time, each only if its guests fit
+    event_deltas = Counter()
+    reactivated = []
+    for rsvp_id, new_status in changes.items():
+        row = rsvps[rsvp_id]
+        if row.status in ACTIVE_STATUSES:
+            event_deltas.update(counter_deltas(row.status, new_status, row.guest_count, reserved=row.is_reserved))
+        else:
+            reactivated.append(rsvp_id)
+    await apply_counter_deltas(db, event_id, {k: v for k, v in event_deltas.items() if v})
+    for rsvp_id in reactivated:
+        row = rsvps[rsvp_id]
+        deltas = counter_deltas(row.status, changes[rsvp_id], row.guest_count, reserved=row.is_reserved)
+        if not await apply_counter_deltas_if_room(db, event_id, deltas):
+            del changes[rsvp_id]
+            results[result_index[rsvp_id]] = trusted(
+                RSVPStatusResult, rsvp_id=rsvp_id, ok=False, error="Not enough spots available"
+            )
+
+    if changes:
+        now = datetime.utcnow()
+        ids_by_status = defaultdict(list)
+        trust_events = []
+        for rsvp_id, new_status in changes.items():
+            row = rsvps[rsvp_id]
+            ids_by_status[new_status].append(rsvp_id)
+            if new_status == RSVPStatus.ATTENDED.value:
+                trust_events.append(trust_event(
+                    row.user_id, TrustEventKind.ATTENDED,
+                    trust=settings.successful_event_bonus, events_attended=1,
+                    event_id=event_id, rsvp_id=rsvp_id,
+                ))
+            elif new_status == RSVPStatus.NO_SHOW.value:
+                trust_events.append(trust_event(
+                    row.user_id, TrustEventKind.NO_SHOW,
+                    trust=-settings.flake_penalty, flake_count=1,
+                    event_id=event_id, rsvp_id=rsvp_id,
+                ))
+
+        # RSVP rows: one UPDATE per target status
+        for new_status, ids in ids_by_status.items():
+            values = {"status": new_status}
+            if new_status == RSVPStatus.CONFIRMED.value:
+                values["confirmed_at"] = now
+            elif new_status == RSVPStatus.ATTENDED.value:
+                values["attended_at"] = now
+            await db.execute(
+                update(RSVP)
+                .where(RSVP.id.in_(ids))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+
+        # Guest stats: one ledger row per RSVP, applied with one executemany
+        await record_trust_events(db, trust_events)
+
+        await db.commit()
+        event_response_cache.invalidate(event_id)
+
+    return json_response(trusted(
+        RSVPBulkStatusResponse,
+        event_id=event_id,
+        updated=len(changes),
+        failed=sum(1 for r in results if not r["ok"]),
+        results=results,
+    ))
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -6,13 +6,23 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate, UserPublicResponse
 from app.auth import get_current_user
+from app.etags import PRIVATE_CACHE_CONTROL, make_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_my_profile(current_user: User = Depends(get_current_user)):
-    """Get current user's full profile"""
+async def get_my_profile(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+):
+    """Get current user's full profile (304 if If-None-Match still matches)"""
+    etag = make_etag("me", current_user.id, current_user.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_CONTROL)
+    set_etag(response, etag, PRIVATE_CACHE_CONTROL)
+
     return UserResponse(
         id=current_user.id,
         email=current_user.email,
@@ -0,0 +1,209 @@
+"""
+Background sweeps for event deadlines.
+
+Started from the app lifespan, the scheduler periodically runs set-based
+UPDATEs that move events along once their deadlines pass:
+  * close_rsvps           - flag events whose rsvp_deadline has passed
+  * cancel_unconfirmed    - cancel OPEN events that reach their
+                            confirmation_deadline short of min_guests
+                            (their RSVPs are cancelled too)
+  * flag_for_completion   - flag CONFIRMED events whose date has passed so
+                            the host is prompted to complete them
+
+Each sweep is one transaction whose WHERE clause only matches rows that
+still need the change, so sweeps are idempotent and running them from
+several workers at once is harmless. Every sweep is served by an index on
+its deadline column (see migration 0004).
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import event_response_cache
+from app.config import get_settings
+from app.database import async_session_maker
+from app.event_counters import ACTIVE_STATUSES
+from app.models.event import Event, EventStatus
+from app.models.rsvp import RSVP, RSVPStatus
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bound on the event ids put in one IN list
+SWEEP_CHUNK_SIZE = 500
+
+
+async def close_rsvps(db: AsyncSession, now: datetime) -> List[int]:
+    """Flag events whose RSVP deadline has passed"""
+    result = await db.execute(
+        update(Event)
+        .where(Event.rsvps_closed == False, Event.rsvp_deadline <= now)
+        .values(rsvps_closed=True)
+        .returning(Event.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
+
+
+async def cancel_unconfirmed(db: AsyncSession, now: datetime) -> List[int]:
+    """Cancel open events that missed min_guests by their confirmation deadline"""
+    result = await db.execute(
+        update(Event)
+        .where(
+            Event.status == EventStatus.OPEN.value,
+            Event.confirmation_deadline <= now,
+            Event.confirmed_rsvp_count < func.coalesce(Event.min_guests, 1),
+        )
+        .values(
+            status=EventStatus.CANCELLED.value,
+            pending_rsvp_count=0,
+            confirmed_rsvp_count=0,
+            active_guest_count=0,
+            reserved_rsvp_count=0,
+        )
+        .returning(Event.id)
+        .execution_options(synchronize_session=False)
+    )
+    event_ids = list(result.scalars().all())
+
+    for start in range(0, len(event_ids), SWEEP_CHUNK_SIZE):
+        await db.execute(
+            update(RSVP)
+            .where(
+                RSVP.event_id.in_(event_ids[start:start + SWEEP_CHUNK_SIZE]),
+                RSVP.status.in_(ACTIVE_STATUSES),
+            )
+            .values(status=RSVPStatus.CANCELLED.value)
+            .execution_options(synchronize_session=False)
+        )
+    return event_ids
+
+
+async def flag_for_completion(db: AsyncSession, now: datetime) -> List[int]:
+    """Flag confirmed events that have taken place"""
+    result = await db.execute(
+        update(Event)
+        .where(
+            Event.status == EventStatus.CONFIRMED.value,
+            Event.needs_completion == False,
+            Event.event_date <= now,
+        )
+        .values(needs_completion=True)
+        .returning(Event.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
+
+
+SWEEPS: List[Callable[[AsyncSession, datetime], Awaitable[List[int]]]] = [
+    close_rsvps,
+    cancel_unconfirmed,
+    flag_for_completion,
+]
+
+
+class SweepStats:
+    """Counters for one sweep"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.runs = 0
+        self.errors = 0
+        self.rows_affected = 0
+        self.last_rows_affected = 0
+        self.total_seconds = 0.0
+        self.last_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_run_at: Optional[datetime] = None
+
+    def record(self, seconds: float, rows: int):
+        self.runs += 1
+        self.rows_affected += rows
+        self.last_rows_affected = rows
+        self.total_seconds += seconds
+        self.last_seconds = seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_run_at = datetime.utcnow()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "rows_affected": self.rows_affected,
+            "last_rows_affected": self.last_rows_affected,
+            "last_duration_ms": round(self.last_seconds * 1000, 3),
+            "max_duration_ms": round(self.max_seconds * 1000, 3),
+            "avg_duration_ms": round(self.total_seconds / self.runs * 1000, 3) if self.runs else 0.0,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+class DeadlineScheduler:
+    """Runs the deadline sweeps every `interval` seconds on the event loop"""
+
+    def __init__(self, interval: float, enabled: bool = True, sweeps=SWEEPS):
+        self.interval = interval
+        self.enabled = enabled
+        self.sweeps = list(sweeps)
+        self.sweep_stats = {sweep.__name__: SweepStats(sweep.__name__) for sweep in self.sweeps}
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Run every sweep once, each in its own transaction. Returns rows affected per sweep."""
+        now = now or datetime.utcnow()
+        affected = {}
+        for sweep in self.sweeps:
+            stats = self.sweep_stats[sweep.__name__]
+            start = time.perf_counter()
+            try:
+                async with async_session_maker() as db:
+                    event_ids = await sweep(db, now)
+                    await db.commit()
+            except Exception:
+                stats.errors += 1
+                logger.exception("Deadline sweep %s failed", sweep.__name__)
+                continue
+            stats.record(time.perf_counter() - start, len(event_ids))
+            for event_id in event_ids:
+                event_response_cache.invalidate(event_id)
+            affected[sweep.__name__] = len(event_ids)
+            if event_ids:
+                logger.info("Deadline sweep %s updated %d events", sweep.__name__, len(event_ids))
+        return affected
+
+    async def _run_forever(self):
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run_forever(), name="deadline-scheduler")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "sweeps": {name: stats.as_dict() for name, stats in self.sweep_stats.items()},
+        }
+
+
+deadline_scheduler = DeadlineScheduler(
+    interval=settings.scheduler_interval_seconds,
+    enabled=settings.scheduler_enabled,
+)
@@ -11,6 +11,9 @@ from app.schemas.event import (
     EventResponse,
     EventUpdate,
     EventListResponse,
+    EventListPage,
+    NearbyEventResponse,
+    NearbyEventPage,
     FoodItemCreate,
     FoodItemResponse,
 )
@@ -19,6 +22,8 @@ from app.schemas.rsvp import (
     RSVPResponse,
     RSVPUpdate,
     RSVPStatusUpdate,
+    RSVPBulkStatusUpdate,
+    RSVPBulkStatusResponse,
 )
 
 __all__ = [
@@ -32,10 +37,15 @@ __all__ = [
     "EventResponse",
     "EventUpdate",
     "EventListResponse",
+    "EventListPage",
+    "NearbyEventResponse",
+    "NearbyEventPage",
     "FoodItemCreate",
     "FoodItemResponse",
     "RSVPCreate",
     "RSVPResponse",
     "RSVPUpdate",
     "RSVPStatusUpdate",
+    "RSVPBulkStatusUpdate",
+    "RSVPBulkStatusResponse",
 ]
@@ -1,6 +1,25 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive UTC, the form the columns store.
+
+    SQLite keeps whatever string it is given, but PostgreSQL (asyncpg)
+    rejects aware values for TIMESTAMP WITHOUT TIME ZONE columns, and they
+    can't be compared with datetime.utcnow().
+    """
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def require_both_coordinates(model):
+    """Coordinates come as a pair: latitude and longitude together, or neither"""
+    if (model.latitude is None) != (model.longitude is None):
+        raise ValueError("latitude and longitude must be given together")
+    return model
 
 
 class FoodItemCreate(BaseModel):
@@ -29,6 +48,8 @@ class EventCreate(BaseModel):
     location_name: str = Field(..., min_length=1, max_length=255)
     location_address: Optional[str] = None
     location_notes: Optional[str] = None
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)  # Geocoded from the address if omitted
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
     max_guests: int = Field(..., ge=1, le=100)
     reserved_spots: int = Field(default=0, ge=0)
     min_guests: int = Field(default=1, ge=1)
@@ -36,6 +57,9 @@ class EventCreate(BaseModel):
     is_public: bool = True
     food_items: List[FoodItemCreate] = []
 
+    _naive_dates = field_validator("event_date", "rsvp_deadline")(naive_utc)
+    _both_coordinates = model_validator(mode="after")(require_both_coordinates)
+
 
 class EventUpdate(BaseModel):
     title: Optional[str] = None
@@ -44,12 +68,17 @@ class EventUpdate(BaseModel):
     location_name: Optional[str] = None
     location_address: Optional[str] = None
     location_notes: Optional[str] = None
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
     max_guests: Optional[int] = None
     reserved_spots: Optional[int] = None
     min_guests: Optional[int] = None
     rsvp_deadline: Optional[datetime] = None
     is_public: Optional[bool] = None
 
+    _naive_dates = field_validator("event_date", "rsvp_deadline")(naive_utc)
+    _both_coordinates = model_validator(mode="after")(require_both_coordinates)
+
 
 class EventResponse(BaseModel):
     id: int
@@ -59,6 +88,8 @@ class EventResponse(BaseModel):
     location_name: str
     location_address: Optional[str]
     location_notes: Optional[str]
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     max_guests: int
     reserved_spots: int
     min_guests: int
@@ -72,6 +103,8 @@ class EventResponse(BaseModel):
     available_spots: int
     confirmed_guest_count: int
     can_be_confirmed: bool
+    rsvps_closed: bool = False
+    needs_completion: bool = False
     food_items: List[FoodItemResponse] = []
     created_at: datetime
 
@@ -93,3 +126,19 @@ class EventListResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class EventListPage(BaseModel):
+    """One page of an event list; pass next_cursor back to get the next page"""
+    items: List[EventListResponse]
+    next_cursor: Optional[str] = None
+
+
+class NearbyEventResponse(EventListResponse):
+    distance_km: float  # From the searched point, rounded to 100 m
+
+
+class NearbyEventPage(BaseModel):
+    """One page of events ordered by distance; pass next_cursor back to get the next page"""
+    items: List[NearbyEventResponse]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -24,6 +24,31 @@ class RSVPStatusUpdate(BaseModel):
     status: str  # confirmed, declined, cancelled, attended, no_show
 
 
+class RSVPStatusItem(BaseModel):
+    rsvp_id: int
+    status: str  # confirmed, declined, attended, no_show
+
+
+class RSVPBulkStatusUpdate(BaseModel):
+    """Status changes for many RSVPs of one event (e.g. attendance after a dinner)"""
+    updates: List[RSVPStatusItem] = Field(..., min_length=1, max_length=500)
+
+
+class RSVPStatusResult(BaseModel):
+    rsvp_id: int
+    ok: bool
+    status: Optional[str] = None  # Status after the call
+    previous_status: Optional[str] = None
+    error: Optional[str] = None
+
+
+class RSVPBulkStatusResponse(BaseModel):
+    event_id: int
+    updated: int  # RSVPs whose status changed
+    failed: int
+    results: List[RSVPStatusResult]  # One per requested item, in request order
+
+
 class RSVPResponse(BaseModel):
     id: int
     user_id: int
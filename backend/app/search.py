@@ -0,0 +1,73 @@
+"""
+Full-text search over events.
+
+Indexed text: title, description, location_name and location_address.
+
+  SQLite      events_fts, an external-content FTS5 table (porter stemming,
+              prefix indexes) kept in sync by triggers on events. Results
+              are ranked with bm25(), weighting title above location above
+              description.
+  PostgreSQL  events.search_vector, a stored generated tsvector of the same
+              columns with a GIN index, ranked with ts_rank_cd. Storing the
+              vector spares ranking a to_tsvector call per matching row.
+
+Both are created by migration 0007. Free text is reduced to plain word
+terms before it reaches the engine, so user input can never be a query
+syntax error: every term must match, and the last one also matches as a
+prefix ("taco ni" finds "taco night").
+
+The rank is a float where lower is better on both engines, so results page
+with a (rank, id) keyset cursor.
+"""
+import re
+from typing import List
+
+from sqlalchemy import Integer, column, func, literal_column, table, text
+
+from app.models.event import Event
+
+# bm25() column weights, in events_fts column order
+FTS5_WEIGHTS = (10.0, 1.0, 4.0, 4.0)  # title, description, location_name, location_address
+
+MAX_SEARCH_TERMS = 8
+
+events_fts = table("events_fts", column("rowid", Integer))
+# Generated by PostgreSQL and not mapped on Event, so ORM loads never fetch it
+search_vector = literal_column("events.search_vector")
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(q: str) -> List[str]:
+    """Split free text into lowercase word terms (at most MAX_SEARCH_TERMS)"""
+    return [term.lower() for term in _TERM.findall(q)][:MAX_SEARCH_TERMS]
+
+
+def fts5_query(terms: List[str]) -> str:
+    """FTS5 query matching every term, the last one as a prefix"""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def tsquery(terms: List[str]) -> str:
+    """to_tsquery input matching every term, the last one as a prefix"""
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+
+def apply_event_search(query, terms: List[str], sqlite: bool):
+    """Restrict an events query to rows matching `terms`.
+
+    Returns (query, rank) where rank orders best matches first (ascending).
+    """
+    if sqlite:
+        query = query.join(events_fts, events_fts.c.rowid == Event.id).where(
+            text("events_fts MATCH :search_query").bindparams(search_query=fts5_query(terms))
+        )
+        rank = func.bm25(literal_column("events_fts"), *FTS5_WEIGHTS)
+        return query, rank
+
+    ts_query = func.to_tsquery(literal_column("'english'::regconfig"), tsquery(terms))
+    query = query.where(search_vector.op("@@")(ts_query))
+    rank = -func.ts_rank_cd(search_vector, ts_query)
+    return query, rank
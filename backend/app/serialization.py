@@ -0,0 +1,68 @@
+"""
+Fast response serialization for trusted data.
+
+Routers build their responses from ORM objects and projected rows, that is,
+values the app wrote itself, so validating them is redundant. Returning a
+model through response_model costs a validation when the model is built and
+a second one when FastAPI checks it against response_model, and then
+FastAPI encodes it (older versions go through jsonable_encoder and the
+stdlib json module).
+
+trusted() builds the payload of a response model as a plain dict: the
+model's fields in declaration order, with defaults for anything not passed.
+It creates no model and runs no validation. json_response() encodes dicts
+and lists with orjson into a Response, and FastAPI passes a Response through
+as is. Routes keep response_model for the OpenAPI schema, and request
+bodies are still validated as usual.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Optional, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def _payload_template(model: Type[BaseModel]) -> Dict[str, Any]:
+    # Treat default values as read-only: the same objects end up in every payload
+    return {
+        name: None if field.is_required() else field.get_default(call_default_factory=True)
+        for name, field in model.model_fields.items()
+    }
+
+
+def trusted(model: Type[BaseModel], **fields) -> Dict[str, Any]:
+    """The JSON payload of `model` built from trusted values, without
+    creating or validating a model. `fields` must be fields of the model."""
+    payload = dict(_payload_template(model))
+    payload.update(fields)
+    return payload
+
+
+def _default(value: Any):
+    # orjson handles dicts, lists, str/int/float/bool/None and datetimes natively
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode a response body to JSON bytes"""
+    return orjson.dumps(content, default=_default)
+
+
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> ORJSONResponse:
+    """Serialize trusted content straight to a response"""
+    return ORJSONResponse(content, status_code=status_code, headers=headers)
@@ -0,0 +1,164 @@
+"""
+Trust ledger.
+
+Every change to a user's reputation counters (trust_score, events_attended,
+flake_count, events_hosted, successful_events, referral_points) is appended
+to trust_events and applied to the users row with one atomic increment, so
+concurrent writers never read-modify-write the row and every change can be
+audited. The users columns are a materialization of the ledger that
+rebuild_user_counters can recompute by replaying it.
+
+Trust is floored at 0 after each entry, both when applied and on replay.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select, insert, exists, func, case, bindparam, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import mark_users_changed
+from app.etags import mark_hosts_changed
+from app.models.user import User
+from app.models.trust_event import TrustEvent, TrustEventKind
+
+# users column -> trust_events delta column
+COUNTER_DELTAS = {
+    "trust_score": "trust_delta",
+    "events_attended": "events_attended_delta",
+    "flake_count": "flake_count_delta",
+    "events_hosted": "events_hosted_delta",
+    "successful_events": "successful_events_delta",
+    "referral_points": "referral_points_delta",
+}
+
+
+def trust_event(
+    user_id: int,
+    kind: TrustEventKind,
+    *,
+    trust: int = 0,
+    events_attended: int = 0,
+    flake_count: int = 0,
+    events_hosted: int = 0,
+    successful_events: int = 0,
+    referral_points: int = 0,
+    event_id: Optional[int] = None,
+    rsvp_id: Optional[int] = None,
+) -> Dict:
+    """Build one ledger entry"""
+    return {
+        "user_id": user_id,
+        "kind": kind.value,
+        "trust_delta": trust,
+        "events_attended_delta": events_attended,
+        "flake_count_delta": flake_count,
+        "events_hosted_delta": events_hosted,
+        "successful_events_delta": successful_events,
+        "referral_points_delta": referral_points,
+        "event_id": event_id,
+        "rsvp_id": rsvp_id,
+    }
+
+
+async def append_trust_events(db: AsyncSession, entries: List[Dict]):
+    """Insert ledger rows without touching users (for rows whose counters
+    already include the entry, e.g. a user created with the default score)"""
+    if not entries:
+        return
+    created_at = datetime.utcnow()
+    await db.execute(insert(TrustEvent), [{**entry, "created_at": created_at} for entry in entries])
+
+
+def _increment_statement():
+    users = User.__table__
+    trust_after = func.coalesce(users.c.trust_score, 0) + bindparam("trust_delta")
+    values = {
+        column: func.coalesce(users.c[column], 0) + bindparam(delta)
+        for column, delta in COUNTER_DELTAS.items()
+        if column != "trust_score"
+    }
+    return (
+        users.update()
+        .where(users.c.id == bindparam("b_user_id"))
+        .values(trust_score=case((trust_after < 0, 0), else_=trust_after), **values)
+    )
+
+
+async def record_trust_events(db: AsyncSession, entries: List[Dict]):
+    """Append ledger rows and apply them to users in the same transaction.
+
+    The increments run as one executemany in entry order, so several entries
+    for the same user are applied one after another exactly as a replay would.
+    """
+    if not entries:
+        return
+    await append_trust_events(db, entries)
+    await db.execute(
+        _increment_statement(),
+        [
+            {"b_user_id": entry["user_id"], **{delta: entry[delta] for delta in COUNTER_DELTAS.values()}}
+            for entry in entries
+        ],
+    )
+    user_ids = {entry["user_id"] for entry in entries}
+    mark_users_changed(db, user_ids)
+    # Event details show the host's trust score. Their ETag follows
+    # users.updated_at, so only the in-process cached copies need dropping
+    if any(entry["trust_delta"] for entry in entries):
+        mark_hosts_changed(db, user_ids)
+
+
+async def open_trust_ledger(db: AsyncSession) -> int:
+    """Give every user without ledger rows an opening balance equal to their
+    current counters. Returns the number of users opened."""
+    users = User.__table__
+    ledger = TrustEvent.__table__
+    columns = ["user_id", "kind", *COUNTER_DELTAS.values(), "created_at"]
+    source = select(
+        users.c.id,
+        literal(TrustEventKind.OPENING_BALANCE.value),
+        *(func.coalesce(users.c[column], 0) for column in COUNTER_DELTAS),
+        literal(datetime.utcnow()),
+    ).where(~exists().where(ledger.c.user_id == users.c.id))
+    result = await db.execute(insert(ledger).from_select(columns, source))
+    return result.rowcount
+
+
+async def rebuild_user_counters(db: AsyncSession, user_ids: Iterable[int]) -> int:
+    """Recompute the counters of the given users by replaying their ledger rows.
+
+    Users without ledger rows are left alone. Returns the number of users
+    rewritten. Meant to be run over users in chunks (see rebuild_trust.py).
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return 0
+
+    result = await db.execute(
+        select(TrustEvent.user_id, *(getattr(TrustEvent, delta) for delta in COUNTER_DELTAS.values()))
+        .where(TrustEvent.user_id.in_(user_ids))
+        .order_by(TrustEvent.user_id, TrustEvent.id)
+    )
+    totals: Dict[int, Dict[str, int]] = {}
+    for user_id, trust, *deltas in result.all():
+        counters = totals.setdefault(user_id, dict.fromkeys(COUNTER_DELTAS, 0))
+        counters["trust_score"] = max(0, counters["trust_score"] + trust)
+        for column, delta in zip(list(COUNTER_DELTAS)[1:], deltas):
+            counters[column] += delta
+
+    if not totals:
+        return 0
+
+    users = User.__table__
+    await db.execute(
+        users.update()
+        .where(users.c.id == bindparam("b_user_id"))
+        .values(**{column: bindparam(f"b_{column}") for column in COUNTER_DELTAS}),
+        [
+            {"b_user_id": user_id, **{f"b_{column}": value for column, value in counters.items()}}
+            for user_id, counters in totals.items()
+        ],
+    )
+    mark_users_changed(db, totals)
+    mark_hosts_changed(db, totals)
+    return len(totals)
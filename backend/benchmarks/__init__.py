@@ -0,0 +1 @@
+# FoodShare benchmarks and stress scripts (run from backend/: python -m benchmarks.<name>)
@@ -0,0 +1,203 @@
+"""
+Benchmark the event list query paths.
+
+Compares, on the same data set (default 10k events / 200k RSVPs):
+  * orm_selectinload - the original path: Event ORM objects with their host
+    and every RSVP loaded, counts computed in Python
+  * grouped_subquery - a projection with RSVP counts from a GROUP BY subquery
+  * counter_columns  - the projection used by list_events/list_my_events,
+    reading the denormalized counters (full list and one 20-row page)
+
+Usage (from backend/):
+    python -m benchmarks.bench_event_list --events 10000 --rsvps 200000
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure_environment, chunked, time_async, report
+
+configure_environment("event_list")
+
+from sqlalchemy import select, insert, func, case  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.database import async_session_maker, init_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.event import Event, EventStatus  # noqa: E402
+from app.models.rsvp import RSVP, RSVPStatus  # noqa: E402
+from app.schemas.event import EventListResponse  # noqa: E402
+from app.event_counters import recompute_event_counters  # noqa: E402
+from app.routers.events import event_list_query  # noqa: E402
+
+BATCH_SIZE = 5000
+LISTED_STATUSES = [EventStatus.OPEN.value, EventStatus.CONFIRMED.value]
+ACTIVE_RSVP_STATUSES = [RSVPStatus.PENDING.value, RSVPStatus.CONFIRMED.value]
+
+
+async def build_dataset(n_users: int, n_events: int, n_rsvps: int):
+    await init_db()
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    users = [
+        {
+            "email": f"bench{i}@example.com",
+            "username": f"bench_{i}",
+            "hashed_password": "x",
+            "referral_code": f"B{i:07d}",
+            "trust_score": rng.randint(50, 150),
+        }
+        for i in range(n_users)
+    ]
+    statuses = [EventStatus.OPEN.value] * 6 + [EventStatus.CONFIRMED.value] * 2 + [
+        EventStatus.COMPLETED.value, EventStatus.CANCELLED.value
+    ]
+    events = []
+    for i in range(n_events):
+        event_date = now + timedelta(days=rng.randint(-30, 90), minutes=rng.randint(0, 1440))
+        events.append({
+            "title": f"Dinner #{i}",
+            "event_date": event_date,
+            "location_name": f"Kitchen {i % 500}",
+            "max_guests": rng.randint(4, 40),
+            "reserved_spots": 0,
+            "min_guests": 2,
+            "rsvp_deadline": event_date - timedelta(days=2),
+            "confirmation_deadline": event_date - timedelta(days=3),
+            "status": rng.choice(statuses),
+            "is_public": rng.random() < 0.9,
+            "host_id": rng.randint(1, n_users),
+        })
+    rsvp_statuses = [RSVPStatus.PENDING.value] * 3 + [RSVPStatus.CONFIRMED.value] * 5 + [
+        RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value
+    ]
+    rsvps = [
+        {
+            "user_id": rng.randint(1, n_users),
+            "event_id": rng.randint(1, n_events),
+            "status": rng.choice(rsvp_statuses),
+            "guest_count": rng.randint(1, 3),
+            "is_reserved": False,
+        }
+        for _ in range(n_rsvps)
+    ]
+
+    async with async_session_maker() as db:
+        conn = await db.connection()
+        for model, rows in ((User, users), (Event, events), (RSVP, rsvps)):
+            for batch in chunked(rows, BATCH_SIZE):
+                await conn.execute(insert(model.__table__), batch)
+        await recompute_event_counters(db)
+        await db.commit()
+
+
+def listed(query):
+    return query.where(
+        Event.is_public == True,
+        Event.status.in_(LISTED_STATUSES),
+        Event.event_date > datetime.utcnow(),
+    )
+
+
+async def orm_selectinload():
+    """The original list_events path"""
+    async with async_session_maker() as db:
+        query = listed(
+            select(Event).options(selectinload(Event.host), selectinload(Event.rsvps))
+        ).order_by(Event.event_date, Event.id)
+        events = (await db.execute(query)).scalars().all()
+        items = []
+        for e in events:
+            active = sum(r.guest_count or 1 for r in e.rsvps if r.status in ACTIVE_RSVP_STATUSES)
+            confirmed = len([r for r in e.rsvps if r.status == RSVPStatus.CONFIRMED.value])
+            items.append(EventListResponse(
+                id=e.id,
+                title=e.title,
+                event_date=e.event_date,
+                location_name=e.location_name,
+                max_guests=e.max_guests,
+                available_spots=max(0, e.max_guests - e.reserved_spots - active),
+                confirmed_guest_count=confirmed,
+                status=e.status,
+                host_username=e.host.username if e.host else None,
+                host_trust_score=e.host.trust_score if e.host else None,
+            ))
+        return items
+
+
+async def grouped_subquery():
+    """Projection with counts from a grouped RSVP subquery"""
+    counts = (
+        select(
+            RSVP.event_id,
+            func.sum(case((RSVP.status == RSVPStatus.CONFIRMED.value, 1), else_=0)).label("confirmed"),
+            func.sum(case((RSVP.status.in_(ACTIVE_RSVP_STATUSES), func.coalesce(RSVP.guest_count, 1)), else_=0)).label("guests"),
+        )
+        .group_by(RSVP.event_id)
+        .subquery()
+    )
+    confirmed = func.coalesce(counts.c.confirmed, 0)
+    spots = Event.max_guests - Event.reserved_spots - func.coalesce(counts.c.guests, 0)
+    async with async_session_maker() as db:
+        query = listed(
+            select(
+                Event.id,
+                Event.title,
+                Event.event_date,
+                Event.location_name,
+                Event.max_guests,
+                case((spots > 0, spots), else_=0).label("available_spots"),
+                confirmed.label("confirmed_guest_count"),
+                Event.status,
+                User.username.label("host_username"),
+                User.trust_score.label("host_trust_score"),
+            )
+            .select_from(Event)
+            .outerjoin(counts, counts.c.event_id == Event.id)
+            .outerjoin(User, User.id == Event.host_id)
+        ).order_by(Event.event_date, Event.id)
+        rows = (await db.execute(query)).all()
+        return [EventListResponse(**row._mapping) for row in rows]
+
+
+async def counter_columns(limit=None):
+    """The projection used by list_events"""
+    async with async_session_maker() as db:
+        query = listed(event_list_query()).order_by(Event.event_date, Event.id)
+        if limit:
+            query = query.limit(limit + 1)
+        rows = (await db.execute(query)).all()
+        return [EventListResponse(**row._mapping) for row in rows[:limit]]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--rsvps", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Building data set: {args.users} users, {args.events} events, {args.rsvps} RSVPs...")
+    await build_dataset(args.users, args.events, args.rsvps)
+
+    baseline = await orm_selectinload()
+    for candidate in (await grouped_subquery(), await counter_columns()):
+        assert [item.model_dump() for item in candidate] == [item.model_dump() for item in baseline], \
+            "query paths disagree"
+    print(f"All paths return the same {len(baseline)} listed events\n")
+
+    for label, fn in (
+        ("orm_selectinload (original, full list)", orm_selectinload),
+        ("grouped_subquery (full list)", grouped_subquery),
+        ("counter_columns (full list)", counter_columns),
+        ("counter_columns (one 20-row page)", lambda: counter_columns(limit=20)),
+    ):
+        samples, _ = await time_async(fn, args.repeat)
+        report(label, samples)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,184 @@
+"""
+Benchmark the streaming NDJSON event export against a buffered export.
+
+Builds --events events for one host, each with --rsvps RSVPs and a few food
+items, then measures for both paths:
+  * time to the first byte and to the last byte
+  * peak Python memory while exporting (tracemalloc, in a separate run)
+
+  buffered  - load every event with its RSVPs and food items, then serialize
+              the whole list (what paging through the list APIs into one
+              file amounts to)
+  streaming - app.routers.exports.stream_event_export
+
+Both must produce the same records. Finally GET /api/export/my-events is
+fetched in-process to check the endpoint returns one line per event.
+
+Usage (from backend/):
+    python -m benchmarks.bench_export --events 5000 --rsvps 10
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure_environment, chunked
+
+configure_environment("export")
+
+import httpx  # noqa: E402
+from sqlalchemy import select, insert  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.auth import create_access_token  # noqa: E402
+from app.database import async_session_maker, init_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.event import Event, EventFoodItem, EventStatus  # noqa: E402
+from app.models.rsvp import RSVP, RSVPStatus  # noqa: E402
+from app.routers.exports import event_export_record, stream_event_export  # noqa: E402
+from app.serialization import dumps  # noqa: E402
+
+BATCH = 5000
+
+
+async def build_dataset(n_events: int, n_rsvps: int) -> int:
+    """One host with n_events events, each with n_rsvps RSVPs and three food items"""
+    await init_db()
+    now = datetime.utcnow()
+    async with async_session_maker() as db:
+        conn = await db.connection()
+        await conn.execute(insert(User.__table__), [
+            {
+                "email": f"export{i}@example.com",
+                "username": f"export_{i}",
+                "hashed_password": "x",
+                "referral_code": f"E{i:07d}",
+            }
+            for i in range(n_rsvps + 1)
+        ])
+        user_ids = (await db.execute(select(User.id).order_by(User.id))).scalars().all()
+        host_id, guest_ids = user_ids[0], user_ids[1:]
+
+        for start in range(0, n_events, BATCH):
+            await conn.execute(insert(Event.__table__), [
+                {
+                    "title": f"Export dinner #{i}",
+                    "description": "A long evening of food and talk " * 4,
+                    "event_date": now + timedelta(days=10, minutes=i),
+                    "location_name": f"Kitchen {i}",
+                    "location_address": f"{i} Export Street",
+                    "max_guests": n_rsvps + 2,
+                    "min_guests": 1,
+                    "rsvp_deadline": now + timedelta(days=5),
+                    "confirmation_deadline": now + timedelta(days=7),
+                    "status": EventStatus.OPEN.value,
+                    "is_public": True,
+                    "host_id": host_id,
+                    "confirmed_rsvp_count": n_rsvps,
+                }
+                for i in range(start, min(start + BATCH, n_events))
+            ])
+        event_ids = (await db.execute(select(Event.id).order_by(Event.id))).scalars().all()
+
+        food_items = [
+            {"event_id": event_id, "name": name, "quantity_needed": 2, "quantity_claimed": 1}
+            for event_id in event_ids
+            for name in ("Salad", "Dessert", "Wine")
+        ]
+        for rows in chunked(food_items, BATCH):
+            await conn.execute(insert(EventFoodItem.__table__), rows)
+
+        rsvps = [
+            {
+                "user_id": user_id,
+                "event_id": event_id,
+                "status": RSVPStatus.CONFIRMED.value,
+                "guest_count": 1,
+                "message": "Looking forward to it!",
+                "is_reserved": False,
+                "created_at": now,
+            }
+            for event_id in event_ids
+            for user_id in guest_ids
+        ]
+        for rows in chunked(rsvps, BATCH):
+            await conn.execute(insert(RSVP.__table__), rows)
+        await db.commit()
+        return host_id
+
+
+async def buffered_export(host_id: int):
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Event)
+            .options(
+                selectinload(Event.host),
+                selectinload(Event.food_items),
+                selectinload(Event.rsvps).selectinload(RSVP.user),
+            )
+            .where(Event.host_id == host_id)
+            .order_by(Event.id)
+        )
+        events = result.scalars().all()
+        yield b"".join(dumps(event_export_record(event)) + b"\n" for event in events)
+
+
+async def drain(chunks):
+    """Consume an export; returns (seconds to first chunk, seconds to last, bytes, chunks)"""
+    start = time.perf_counter()
+    first = None
+    size = count = 0
+    async for chunk in chunks:
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+        count += 1
+    return first, time.perf_counter() - start, size, count
+
+
+async def measure(label: str, make_chunks):
+    first, total, size, count = await drain(make_chunks())
+    # Timed without tracing; tracemalloc slows Python code down noticeably
+    tracemalloc.start()
+    await drain(make_chunks())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"  {label:<10} first byte {first * 1000:9.1f} ms   last byte {total * 1000:9.1f} ms"
+        f"   {size / 2**20:6.1f} MiB in {count:5d} chunks   peak memory {peak / 2**20:7.1f} MiB"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--rsvps", type=int, default=10, help="RSVPs per event")
+    args = parser.parse_args()
+
+    print(f"Building data set: {args.events} events x {args.rsvps} RSVPs...")
+    host_id = await build_dataset(args.events, args.rsvps)
+
+    buffered = b"".join([chunk async for chunk in buffered_export(host_id)])
+    streamed = b"".join([chunk async for chunk in stream_event_export(Event.host_id == host_id)])
+    assert buffered.splitlines() == streamed.splitlines(), "exports disagree"
+
+    print("\nExport of all events:")
+    await measure("buffered", lambda: buffered_export(host_id))
+    await measure("streaming", lambda: stream_event_export(Event.host_id == host_id))
+
+    auth = {"Authorization": f"Bearer {create_access_token({'sub': str(host_id)})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        response = await client.get("/api/export/my-events", headers=auth)
+        assert response.status_code == 200, response.text
+        records = [json.loads(line) for line in response.content.splitlines()]
+        assert len(records) == args.events
+        assert all(len(record["rsvps"]) == args.rsvps for record in records)
+    print(f"\nGET /api/export/my-events: {len(records)} lines, {response.headers['content-type']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+"""
+Benchmark the per-request cost of the middleware stack.
+
+Builds small FastAPI apps with a hello-world route and a streamed route (a
+body sent in --chunks pieces), each with a different middleware stack:
+  * none       - no middleware
+  * base-http  - the old HTTPSRedirectMiddleware, a BaseHTTPMiddleware
+    subclass that only rewrites scope["scheme"]
+  * proxy      - app.middleware.ProxyHeadersMiddleware doing the same job
+  * pure-asgi  - proxy headers, request IDs and timing (app.middleware), as
+    app.main installs them
+
+Requests are driven as raw ASGI calls (no HTTP client or server), so the
+numbers are the framework and middleware cost alone. Reported per request
+in microseconds, with the overhead over "none".
+
+Usage (from backend/):
+    python -m benchmarks.bench_middleware --requests 20000
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware import ProxyHeadersMiddleware, RequestIDMiddleware, TimingMiddleware
+
+ROUNDS = 5
+
+
+class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
+    """The middleware app.main used before app.middleware (for comparison)"""
+    async def dispatch(self, request: Request, call_next):
+        if request.headers.get("x-forwarded-proto") == "https":
+            request.scope["scheme"] = "https"
+        return await call_next(request)
+
+
+def build_app(stack: str, chunks: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/hello")
+    async def hello():
+        return {"message": "Hello, world"}
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for _ in range(chunks):
+                yield b"x" * 64
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    if stack == "base-http":
+        app.add_middleware(HTTPSRedirectMiddleware)
+    elif stack == "proxy":
+        app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=["*"])
+    elif stack == "pure-asgi":
+        app.add_middleware(TimingMiddleware)
+        app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=["*"])
+        app.add_middleware(RequestIDMiddleware)
+    return app
+
+
+async def call(app, path: str):
+    """One request as a raw ASGI call; returns (status, body bytes)"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"x-forwarded-proto", b"https"),
+            (b"x-forwarded-for", b"203.0.113.7"),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+    status = None
+    size = 0
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        # Like a server: the request body, then a disconnect once the response is done
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(scope, receive, send)
+    return status, size
+
+
+async def time_requests(app, path: str, n: int) -> float:
+    """Best of ROUNDS runs of n sequential requests, in microseconds per request"""
+    runs = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(n):
+            await call(app, path)
+        runs.append((time.perf_counter() - start) / n * 1_000_000)
+    return min(runs)
+
+
+async def main(args):
+    stacks = ["none", "base-http", "proxy", "pure-asgi"]
+    apps = {stack: build_app(stack, args.chunks) for stack in stacks}
+    for stack, app in apps.items():
+        for path in ("/hello", "/stream"):
+            status, _ = await call(app, path)  # Builds the middleware stack
+            assert status == 200, (stack, path, status)
+            await time_requests(app, path, min(args.requests, 1000))  # Warm up
+
+    print(f"{args.requests} requests per run, best of {ROUNDS}, {args.chunks} chunks per streamed body")
+    for path in ("/hello", "/stream"):
+        print(f"\nGET {path}")
+        baseline = None
+        for stack in stacks:
+            per_request = await time_requests(apps[stack], path, args.requests)
+            if baseline is None:
+                baseline = per_request
+            overhead = per_request - baseline
+            print(f"  {stack:<12} {per_request:9.1f} us/request   overhead {overhead:+8.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per timed run")
+    parser.add_argument("--chunks", type=int, default=100, help="Chunks in the streamed body")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,169 @@
+"""
+Benchmark the "events near me" search on a large, clustered data set.
+
+Builds --events public located events (default 100k): most around a dozen
+US metro areas, the rest scattered across the continental US. Then times
+GET /api/events/nearby in-process for small and large radii in a dense city,
+a sparse area and a map viewport, plus a second page, against the same
+distance filter without the geohash ranges (a scan of every located row).
+
+On PostgreSQL (BENCH_DATABASE_URL) the table is ANALYZEd first so the
+planner sees real statistics.
+
+Usage (from backend/):
+    python -m benchmarks.bench_nearby --events 100000 --repeat 20
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure_environment, time_async, report, percentile
+
+configure_environment("nearby")
+
+import httpx  # noqa: E402
+from sqlalchemy import select, insert  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import async_session_maker, init_db, engine, is_sqlite  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.event import Event, EventStatus  # noqa: E402
+from app.geo import encode_geohash, squared_distance_km  # noqa: E402
+
+BATCH = 5000
+METRO_SHARE = 0.8
+
+# (name, latitude, longitude, relative size)
+METROS = [
+    ("New York", 40.7128, -74.0060, 10),
+    ("Los Angeles", 34.0522, -118.2437, 7),
+    ("Chicago", 41.8781, -87.6298, 5),
+    ("Houston", 29.7604, -95.3698, 4),
+    ("Phoenix", 33.4484, -112.0740, 3),
+    ("Philadelphia", 39.9526, -75.1652, 3),
+    ("San Francisco", 37.7749, -122.4194, 4),
+    ("Seattle", 47.6062, -122.3321, 3),
+    ("Denver", 39.7392, -104.9903, 2),
+    ("Atlanta", 33.7490, -84.3880, 3),
+    ("Austin", 30.2672, -97.7431, 2),
+    ("Boston", 42.3601, -71.0589, 3),
+]
+
+SEARCHES = [
+    ("dense city, 2 km", {"lat": 40.7128, "lng": -74.0060, "radius_km": 2}),
+    ("dense city, 10 km", {"lat": 40.7128, "lng": -74.0060, "radius_km": 10}),
+    ("mid-size city, 25 km", {"lat": 39.7392, "lng": -104.9903, "radius_km": 25}),
+    ("sparse area, 50 km", {"lat": 44.0, "lng": -100.0, "radius_km": 50}),
+    ("sparse area, 200 km", {"lat": 44.0, "lng": -100.0, "radius_km": 200}),
+    ("map viewport (SF)", {
+        "lat": 37.7749, "lng": -122.4194, "south": 37.70, "west": -122.52, "north": 37.82, "east": -122.35,
+    }),
+]
+
+
+async def build_dataset(n_events: int, seed: int = 7):
+    await init_db()
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    weights = [size for *_, size in METROS]
+    async with async_session_maker() as db:
+        host = User(email="nearby_host@example.com", username="nearby_host", hashed_password="x")
+        db.add(host)
+        await db.flush()
+        conn = await db.connection()
+        for start in range(0, n_events, BATCH):
+            rows = []
+            for i in range(start, min(start + BATCH, n_events)):
+                if rng.random() < METRO_SHARE:
+                    _, lat, lng, _ = rng.choices(METROS, weights)[0]
+                    latitude, longitude = rng.gauss(lat, 0.15), rng.gauss(lng, 0.15)
+                else:
+                    latitude, longitude = rng.uniform(25.0, 49.0), rng.uniform(-124.0, -67.0)
+                rows.append({
+                    "title": f"Dinner #{i}",
+                    "event_date": now + timedelta(days=1 + i % 60, minutes=i),
+                    "location_name": "Somewhere",
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "geohash": encode_geohash(latitude, longitude),
+                    "max_guests": 8,
+                    "min_guests": 1,
+                    "rsvp_deadline": now + timedelta(days=1 + i % 60),
+                    "confirmation_deadline": now + timedelta(days=1 + i % 60),
+                    "status": EventStatus.OPEN.value,
+                    "is_public": True,
+                    "host_id": host.id,
+                })
+            await conn.execute(insert(Event.__table__), rows)
+        await db.commit()
+    async with engine.connect() as conn:
+        if is_sqlite():
+            await conn.exec_driver_sql("ANALYZE")
+        else:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql("ANALYZE events")
+
+
+def scan_query(params: dict):
+    """The same radius filter with no spatial index to narrow it down"""
+    distance = squared_distance_km(params["lat"], params["lng"])
+    radius = params.get("radius_km", 10)
+    return (
+        select(Event.id, Event.title, distance.label("squared_distance"))
+        .where(
+            Event.latitude.isnot(None),
+            distance <= radius * radius,
+            Event.is_public == True,
+            Event.status.in_([EventStatus.OPEN.value, EventStatus.CONFIRMED.value]),
+            Event.event_date > datetime.utcnow(),
+        )
+        .order_by(distance, Event.id)
+        .limit(20)
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Building data set: {args.events} events...")
+    await build_dataset(args.events)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        print("\nGET /api/events/nearby (20 per page) vs full scan:")
+        for label, params in SEARCHES:
+            async def nearby(params=params):
+                response = await client.get("/api/events/nearby", params=params)
+                assert response.status_code == 200, response.text
+                return response.json()
+
+            async def scan(params=params):
+                async with async_session_maker() as db:
+                    return (await db.execute(scan_query(params))).all()
+
+            samples, page = await time_async(nearby, args.repeat)
+            items = page["items"]
+            farthest = f", farthest {items[-1]['distance_km']} km" if items else ""
+            print(f" {label}: {len(items)} results on page 1{farthest}")
+            report("nearby", samples, f"p95 {percentile(samples, 95):7.2f} ms")
+            if "radius_km" in params:
+                scan_samples, _ = await time_async(scan, max(3, args.repeat // 4))
+                report("full scan", scan_samples)
+
+        params = {"lat": 40.7128, "lng": -74.0060, "radius_km": 10}
+        first = (await client.get("/api/events/nearby", params=params)).json()
+
+        async def second_page():
+            return await client.get("/api/events/nearby", params={**params, "cursor": first["next_cursor"]})
+
+        samples, _ = await time_async(second_page, args.repeat)
+        print(" dense city, 10 km, page 2 (cursor):")
+        report("nearby", samples, f"p95 {percentile(samples, 95):7.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+"""
+Benchmark full-text event search on a large corpus.
+
+Builds --events public events (default 100k) whose titles, descriptions and
+locations are drawn from food, occasion and neighborhood word lists, then
+times GET /api/events/search in-process for a set of queries (common and
+rare terms, two-term queries, prefixes, a second page) against the same
+filter done with LIKE '%term%' on every column, which is what searching
+without an index amounts to.
+
+On PostgreSQL (BENCH_DATABASE_URL) the table is ANALYZEd first so the
+planner sees real statistics.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search --events 100000 --repeat 20
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure_environment, time_async, report, percentile
+
+configure_environment("search")
+
+import httpx  # noqa: E402
+from sqlalchemy import select, insert, and_, or_, text  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import async_session_maker, init_db, engine, is_sqlite  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.event import Event, EventStatus  # noqa: E402
+from app.search import search_terms  # noqa: E402
+
+BATCH = 5000
+
+FOODS = [
+    "taco", "pasta", "ramen", "curry", "dumpling", "pizza", "paella", "sushi", "barbecue", "brunch",
+    "pho", "tamale", "lasagna", "risotto", "falafel", "kimchi", "gumbo", "pierogi", "biryani", "fondue",
+]
+OCCASIONS = ["night", "party", "potluck", "dinner", "feast", "supper", "picnic", "social", "club", "tasting"]
+NEIGHBORHOODS = [
+    "Mission", "Castro", "Sunset", "Richmond", "Marina", "Nob Hill", "SoMa", "Dogpatch", "Excelsior", "Haight",
+    "Bernal Heights", "Noe Valley", "Potrero", "Chinatown", "North Beach", "Presidio", "Tenderloin", "Bayview",
+]
+STREETS = ["Valencia", "Mission", "Market", "Divisadero", "Irving", "Clement", "Geary", "Folsom", "Castro", "Church"]
+FILLER = (
+    "bring a dish to share and meet the neighbors over a long table with good music "
+    "vegetarian options available please let the host know about allergies"
+).split()
+
+QUERIES = [
+    ("common term", "taco"),
+    ("two terms", "taco night"),
+    ("neighborhood", "bernal heights"),
+    ("street", "valencia"),
+    ("prefix (type-ahead)", "dump"),
+    ("rare combination", "fondue picnic presidio"),
+    ("no match", "croissant"),
+]
+
+
+async def build_dataset(n_events: int, seed: int = 7):
+    await init_db()
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    async with async_session_maker() as db:
+        host = User(email="search_host@example.com", username="search_host", hashed_password="x")
+        db.add(host)
+        await db.flush()
+        conn = await db.connection()
+        for start in range(0, n_events, BATCH):
+            rows = []
+            for i in range(start, min(start + BATCH, n_events)):
+                food, occasion = rng.choice(FOODS), rng.choice(OCCASIONS)
+                neighborhood = rng.choice(NEIGHBORHOODS)
+                rows.append({
+                    "title": f"{food.title()} {occasion} #{i}",
+                    "description": " ".join(rng.sample(FILLER, 12) + [rng.choice(FOODS), rng.choice(FOODS)]),
+                    "event_date": now + timedelta(days=1 + i % 60, minutes=i),
+                    "location_name": f"{neighborhood} {rng.choice(['loft', 'garden', 'kitchen', 'rooftop'])}",
+                    "location_address": f"{rng.randint(1, 3000)} {rng.choice(STREETS)} St",
+                    "max_guests": 8,
+                    "min_guests": 1,
+                    "rsvp_deadline": now + timedelta(days=1 + i % 60),
+                    "confirmation_deadline": now + timedelta(days=1 + i % 60),
+                    "status": EventStatus.OPEN.value,
+                    "is_public": True,
+                    "host_id": host.id,
+                })
+            await conn.execute(insert(Event.__table__), rows)
+        await db.commit()
+    if not is_sqlite():
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql("ANALYZE events")
+
+
+def like_query(q: str):
+    """The unindexed equivalent: every term somewhere in the four columns"""
+    columns = [Event.title, Event.description, Event.location_name, Event.location_address]
+    return (
+        select(Event.id, Event.title)
+        .where(
+            and_(*(or_(*(column.ilike(f"%{term}%") for column in columns)) for term in search_terms(q))),
+            Event.is_public == True,
+            Event.status.in_([EventStatus.OPEN.value, EventStatus.CONFIRMED.value]),
+            Event.event_date > datetime.utcnow(),
+        )
+        .order_by(Event.event_date, Event.id)
+        .limit(20)
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Building data set: {args.events} events...")
+    await build_dataset(args.events)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        print("\nGET /api/events/search (20 per page) vs LIKE scan:")
+        for label, q in QUERIES:
+            async def search(q=q):
+                response = await client.get("/api/events/search", params={"q": q})
+                assert response.status_code == 200, response.text
+                return response.json()
+
+            async def like(q=q):
+                async with async_session_maker() as db:
+                    return (await db.execute(like_query(q))).all()
+
+            samples, page = await time_async(search, args.repeat)
+            like_samples, _ = await time_async(like, max(3, args.repeat // 4))
+            print(f" {label} ({q!r}), {len(page['items'])} results on page 1:")
+            report("search", samples, f"p95 {percentile(samples, 95):7.2f} ms")
+            report("LIKE scan", like_samples)
+
+        first = (await client.get("/api/events/search", params={"q": "taco"})).json()
+
+        async def second_page():
+            return await client.get("/api/events/search", params={"q": "taco", "cursor": first["next_cursor"]})
+
+        samples, _ = await time_async(second_page, args.repeat)
+        print(" 'taco', page 2 (cursor):")
+        report("search", samples, f"p95 {percentile(samples, 95):7.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,294 @@
+"""
+Benchmark response serialization for list endpoints.
+
+Compares, for lists of N items (default 1000):
+  * validated - the original path: response models built with validation,
+    then validated again against response_model and encoded by FastAPI,
+    either with pydantic's dump_json (recent FastAPI) or jsonable_encoder
+    plus the stdlib json module (older FastAPI)
+  * fast      - app.serialization: plain payload dicts built with
+    trusted() (no model, no validation) and encoded with orjson
+
+Serialization alone is timed on preloaded data for the host's RSVP list
+(RSVPResponse), a user's RSVP list (RSVPWithEventResponse) and event list
+rows (EventListResponse); both paths must produce the same JSON. Then the
+full GET /api/rsvps/event/{id} and /api/rsvps/my-rsvps requests are timed
+in-process against copies of those routes that return validated models.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --items 1000 --repeat 30
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+from benchmarks.common import configure_environment, time_async, report
+
+configure_environment("serialization")
+
+import httpx  # noqa: E402
+from fastapi import APIRouter, Depends  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select, insert  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.auth import create_access_token, get_current_user  # noqa: E402
+from app.database import async_session_maker, init_db, get_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.event import Event, EventStatus  # noqa: E402
+from app.models.rsvp import RSVP, RSVPStatus  # noqa: E402
+from app.schemas.event import EventListResponse  # noqa: E402
+from app.schemas.rsvp import RSVPResponse, RSVPWithEventResponse  # noqa: E402
+from app.serialization import trusted, dumps  # noqa: E402
+from app.routers.events import event_list_query  # noqa: E402
+from app.routers.rsvps import rsvp_to_response  # noqa: E402
+
+
+async def build_dataset(n_items: int):
+    """A host with one event holding n_items RSVPs, and one guest with
+    n_items RSVPs on n_items other events. Returns (host_id, guest_id, event_id)."""
+    await init_db()
+    now = datetime.utcnow()
+    async with async_session_maker() as db:
+        conn = await db.connection()
+        await conn.execute(insert(User.__table__), [
+            {
+                "email": f"ser{i}@example.com",
+                "username": f"ser_{i}",
+                "hashed_password": "x",
+                "referral_code": f"S{i:07d}",
+                "trust_score": 100 + i % 50,
+                "events_attended": i % 7,
+                "flake_count": i % 3,
+            }
+            for i in range(n_items + 1)
+        ])
+        user_ids = (await db.execute(select(User.id).order_by(User.id))).scalars().all()
+        host_id, guest_ids = user_ids[0], user_ids[1:]
+
+        await conn.execute(insert(Event.__table__), [
+            {
+                "title": f"Serialization dinner #{i}",
+                "description": "A long evening of food and talk " * 4,
+                "event_date": now + timedelta(days=10, minutes=i),
+                "location_name": f"Kitchen {i}",
+                "max_guests": n_items + 1,
+                "reserved_spots": 0,
+                "min_guests": 1,
+                "rsvp_deadline": now + timedelta(days=5),
+                "confirmation_deadline": now + timedelta(days=7),
+                "status": EventStatus.OPEN.value,
+                "is_public": True,
+                "host_id": host_id,
+            }
+            for i in range(n_items + 1)
+        ])
+        event_ids = (await db.execute(select(Event.id).order_by(Event.id))).scalars().all()
+        big_event_id, guest_event_ids = event_ids[0], event_ids[1:]
+
+        rsvps = [
+            {
+                "user_id": user_id,
+                "event_id": big_event_id,
+                "status": RSVPStatus.CONFIRMED.value,
+                "guest_count": 1,
+                "message": "Looking forward to it!",
+                "bringing_food_item": "Salad",
+                "food_notes": None,
+                "is_reserved": False,
+                "created_at": now,
+            }
+            for user_id in guest_ids
+        ] + [
+            {
+                "user_id": guest_ids[0],
+                "event_id": event_id,
+                "status": RSVPStatus.PENDING.value,
+                "guest_count": 2,
+                "message": None,
+                "bringing_food_item": None,
+                "food_notes": "Vegan option too",
+                "is_reserved": False,
+                "created_at": now + timedelta(seconds=i),
+            }
+            for i, event_id in enumerate(guest_event_ids)
+        ]
+        await conn.execute(insert(RSVP.__table__), rsvps)
+        await db.commit()
+        return host_id, guest_ids[0], big_event_id
+
+
+async def load_event_rsvps(event_id: int):
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(RSVP).options(selectinload(RSVP.user)).where(RSVP.event_id == event_id).order_by(RSVP.created_at)
+        )
+        return result.scalars().all()
+
+
+def my_rsvps_query(user_id: int):
+    """The projection GET /api/rsvps/my-rsvps runs"""
+    return (
+        select(
+            RSVP.id, RSVP.user_id, RSVP.event_id, RSVP.status, RSVP.guest_count, RSVP.message,
+            RSVP.bringing_food_item, RSVP.food_notes, RSVP.food_item_id, RSVP.is_reserved,
+            RSVP.created_at, RSVP.confirmed_at,
+            Event.title.label("event_title"),
+            Event.event_date,
+            Event.location_name.label("event_location"),
+            Event.status.label("event_status"),
+        )
+        .outerjoin(Event, Event.id == RSVP.event_id)
+        .where(RSVP.user_id == user_id)
+        .order_by(RSVP.created_at.desc())
+    )
+
+
+async def load_my_rsvps(user_id: int):
+    async with async_session_maker() as db:
+        return (await db.execute(my_rsvps_query(user_id))).all()
+
+
+async def load_event_rows():
+    async with async_session_maker() as db:
+        return (await db.execute(event_list_query().order_by(Event.event_date, Event.id))).all()
+
+
+def validated_rsvp(r: RSVP) -> RSVPResponse:
+    """The hand-built, validating RSVPResponse the routers used to return"""
+    return RSVPResponse(
+        id=r.id,
+        user_id=r.user_id,
+        event_id=r.event_id,
+        status=r.status,
+        guest_count=r.guest_count,
+        message=r.message,
+        bringing_food_item=r.bringing_food_item,
+        food_notes=r.food_notes,
+        food_item_id=r.food_item_id,
+        is_reserved=r.is_reserved,
+        created_at=r.created_at,
+        confirmed_at=r.confirmed_at,
+        user_username=r.user.username,
+        user_trust_score=r.user.trust_score,
+        user_reliability=r.user.reliability_percentage,
+    )
+
+
+def fastapi_dump_json(adapter: TypeAdapter, models) -> bytes:
+    """Recent FastAPI: validate against response_model, then pydantic's JSON serializer"""
+    return adapter.dump_json(adapter.validate_python(models, from_attributes=True))
+
+
+def fastapi_stdlib_json(adapter: TypeAdapter, models) -> bytes:
+    """Older FastAPI: validate against response_model, dump to JSON-ready
+    python, jsonable_encoder, then JSONResponse.render"""
+    value = adapter.validate_python(models, from_attributes=True)
+    content = jsonable_encoder(adapter.dump_python(value, mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def add_validated_routes():
+    """Copies of the two RSVP list routes that return validated models"""
+    router = APIRouter(prefix="/bench/validated")
+
+    @router.get("/event/{event_id}", response_model=List[RSVPResponse])
+    async def event_rsvps(event_id: int, current_user: User = Depends(get_current_user), db=Depends(get_db)):
+        await db.execute(select(Event).where(Event.id == event_id))
+        result = await db.execute(
+            select(RSVP).options(selectinload(RSVP.user)).where(RSVP.event_id == event_id).order_by(RSVP.created_at)
+        )
+        return [validated_rsvp(r) for r in result.scalars().all()]
+
+    @router.get("/my-rsvps", response_model=List[RSVPWithEventResponse])
+    async def my_rsvps(current_user: User = Depends(get_current_user), db=Depends(get_db)):
+        result = await db.execute(my_rsvps_query(current_user.id))
+        return [RSVPWithEventResponse(**row._mapping) for row in result.all()]
+
+    app.include_router(router)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000, help="items per list")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"Building data set: lists of {args.items} items...")
+    host_id, guest_id, event_id = await build_dataset(args.items)
+    event_rsvps = await load_event_rsvps(event_id)
+    my_rsvps = await load_my_rsvps(guest_id)
+    event_rows = await load_event_rows()
+
+    cases = [
+        (
+            f"host RSVP list ({len(event_rsvps)} RSVPResponse)",
+            TypeAdapter(List[RSVPResponse]),
+            lambda: [validated_rsvp(r) for r in event_rsvps],
+            lambda: [rsvp_to_response(r, r.user) for r in event_rsvps],
+        ),
+        (
+            f"my RSVPs ({len(my_rsvps)} RSVPWithEventResponse)",
+            TypeAdapter(List[RSVPWithEventResponse]),
+            lambda: [RSVPWithEventResponse(**row._mapping) for row in my_rsvps],
+            lambda: [trusted(RSVPWithEventResponse, **row._mapping) for row in my_rsvps],
+        ),
+        (
+            f"event list rows ({len(event_rows)} EventListResponse)",
+            TypeAdapter(List[EventListResponse]),
+            lambda: [EventListResponse(**row._mapping) for row in event_rows],
+            lambda: [trusted(EventListResponse, **row._mapping) for row in event_rows],
+        ),
+    ]
+
+    print("\nSerialization only (data preloaded):")
+    for label, adapter, build_validated, build_trusted in cases:
+        paths = [
+            ("validated + pydantic dump_json", lambda: fastapi_dump_json(adapter, build_validated())),
+            ("validated + jsonable_encoder + json", lambda: fastapi_stdlib_json(adapter, build_validated())),
+            ("fast (trusted dicts + orjson)", lambda: dumps(build_trusted())),
+        ]
+        bodies = [json.loads(encode()) for _, encode in paths]
+        assert all(body == bodies[0] for body in bodies), f"{label}: paths disagree"
+        print(f" {label}, {len(dumps(build_trusted())) / 1024:.0f} KiB:")
+        for path_label, encode in paths:
+            async def run(encode=encode):
+                return encode()
+
+            samples, _ = await time_async(run, args.repeat)
+            report(path_label, samples)
+
+    add_validated_routes()
+    host_auth = {"Authorization": f"Bearer {create_access_token({'sub': str(host_id)})}"}
+    guest_auth = {"Authorization": f"Bearer {create_access_token({'sub': str(guest_id)})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        requests = [
+            (
+                "GET /api/rsvps/event/{id}",
+                lambda: client.get(f"/bench/validated/event/{event_id}", headers=host_auth),
+                lambda: client.get(f"/api/rsvps/event/{event_id}", headers=host_auth),
+            ),
+            (
+                "GET /api/rsvps/my-rsvps",
+                lambda: client.get("/bench/validated/my-rsvps", headers=guest_auth),
+                lambda: client.get("/api/rsvps/my-rsvps", headers=guest_auth),
+            ),
+        ]
+        print("\nFull requests (in-process ASGI):")
+        for label, validated, fast in requests:
+            old, new = await validated(), await fast()  # Also warms the user cache
+            assert old.json() == new.json(), f"{label}: responses disagree"
+            slow_samples, _ = await time_async(validated, args.repeat)
+            fast_samples, _ = await time_async(fast, args.repeat)
+            print(f" {label} ({len(new.json())} items):")
+            report("validated route", slow_samples)
+            report("app route (trusted dicts + orjson)", fast_samples)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""
+Shared helpers for the benchmark scripts.
+
+configure_environment() must run before anything from `app` is imported,
+because app.database builds its engine from the settings at import time.
+"""
+import os
+import statistics
+import tempfile
+import time
+
+
+def configure_environment(name: str) -> str:
+    """Point the app at a scratch SQLite file and turn off SQL echo.
+
+    BENCH_DATABASE_URL (e.g. postgresql+asyncpg://...) overrides the SQLite
+    file; it must name an empty database. Returns the database URL in use."""
+    url = os.environ.get("BENCH_DATABASE_URL")
+    if not url:
+        path = os.path.join(tempfile.gettempdir(), f"foodshare_bench_{name}.db")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        url = f"sqlite+aiosqlite:///{path}"
+    os.environ["DATABASE_URL"] = url
+    os.environ["DEBUG"] = "false"
+    return url
+
+
+def chunked(rows, size):
+    """Yield successive lists of at most `size` rows"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def time_async(fn, repeat: int):
+    """Run an async callable `repeat` times; returns (samples in ms, last result)"""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, result
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def report(label: str, samples, extra: str = ""):
+    """Print one aligned summary line for a set of timings (ms)"""
+    print(
+        f"  {label:<42} median {statistics.median(samples):9.2f} ms"
+        f"   min {min(samples):9.2f} ms   max {max(samples):9.2f} ms"
+        + (f"   {extra}" if extra else "")
+    )
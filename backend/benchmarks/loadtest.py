@@ -0,0 +1,447 @@
+"""
+End-to-end load test: concurrent virtual users replaying user journeys.
+
+Each of --concurrency virtual users logs in as a generated account and then,
+until --duration runs out, picks one journey at a time:
+  browse    list events (a few pages), open details, search, look nearby
+  guest     check their account, RSVP to an open event, review their
+            RSVPs and sometimes cancel
+  host      create an event, have other virtual users RSVP, confirm them,
+            confirm the event, record attendance and complete it
+  newcomer  register a new account and log in
+
+Every request is timed under its route template ("GET /api/events/{id}"),
+and the report gives count, throughput and p50/p95/p99 latency per route.
+
+Targets:
+  in-process (default)  app.main:app through httpx's ASGI transport, so
+                        the numbers are the app alone (no lifespan: the
+                        deadline scheduler does not run)
+  --server              a real uvicorn on 127.0.0.1 started for the run
+                        (--workers processes)
+  --url URL             an already running server; pass --database-url too,
+                        so accounts can be picked from the same database
+
+Data: by default a fresh database is filled with generate_data.py
+(--users, --events, --rsvps-per-event). --database-url reuses an existing
+database instead, e.g. one built once with generate_data.py at full size;
+it is only generated into when it has no events.
+
+Gating: --save writes the per-route results as JSON. --baseline compares a
+run against a saved one, and the harness exits non-zero when any route's
+p95 is more than --tolerance slower (routes with at least
+MIN_COMPARE_SAMPLES requests in both runs), or when server errors (5xx or failed
+connections) exceed --max-error-rate.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --concurrency 50 --duration 30
+    python -m benchmarks.loadtest --server --workers 4 --concurrency 100
+    python -m benchmarks.loadtest --database-url sqlite+aiosqlite:////tmp/large.db \\
+        --baseline loadtest_baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import configure_environment, percentile
+
+FOOD_TERMS = ["taco", "pasta", "ramen", "curry", "dumpling", "pizza", "brunch", "potluck", "night", "feast"]
+# (latitude, longitude) to search around
+PLACES = [(40.7128, -74.0060), (34.0522, -118.2437), (41.8781, -87.6298), (37.7749, -122.4194)]
+
+JOURNEY_WEIGHTS = {"browse": 60, "guest": 25, "host": 10, "newcomer": 5}
+
+MIN_COMPARE_SAMPLES = 20  # Rarer routes are too noisy to gate on
+
+
+class RouteStats:
+    def __init__(self):
+        self.samples: List[float] = []
+        self.statuses: Counter = Counter()
+
+    @property
+    def server_errors(self) -> int:
+        return sum(count for code, count in self.statuses.items() if code == 0 or code >= 500)
+
+    @property
+    def client_errors(self) -> int:
+        return sum(count for code, count in self.statuses.items() if 400 <= code < 500)
+
+
+class LoadClient:
+    """An httpx client that times every request under its route template"""
+
+    def __init__(self, http: httpx.AsyncClient, stats: Dict[str, RouteStats]):
+        self.http = http
+        self.stats = stats
+
+    async def call(self, method: str, route: str, *, path: Optional[str] = None,
+                   token: Optional[str] = None, **kwargs) -> Optional[httpx.Response]:
+        """Send a request; returns the response, or None if it never completed"""
+        headers = {"Authorization": f"Bearer {token}"} if token else None
+        stats = self.stats[f"{method} {route}"]
+        start = time.perf_counter()
+        try:
+            response = await self.http.request(method, path or route, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            stats.samples.append((time.perf_counter() - start) * 1000)
+            stats.statuses[0] += 1
+            return None
+        stats.samples.append((time.perf_counter() - start) * 1000)
+        stats.statuses[response.status_code] += 1
+        return response
+
+
+class Session:
+    """A logged-in account"""
+
+    def __init__(self, user_id: int, token: str):
+        self.user_id = user_id
+        self.token = token
+
+
+async def login(client: LoadClient, email: str, password: str) -> Optional[Session]:
+    response = await client.call("POST", "/api/auth/login", data={"username": email, "password": password})
+    if response is None or response.status_code != 200:
+        return None
+    token = response.json()["access_token"]
+    me = await client.call("GET", "/api/auth/me", token=token)
+    if me is None or me.status_code != 200:
+        return None
+    return Session(me.json()["id"], token)
+
+
+async def open_events(client: LoadClient, rng: random.Random) -> List[dict]:
+    """One page of upcoming public events, at a random point of the list"""
+    params = {"limit": 20}
+    if rng.random() < 0.3:
+        params["date_from"] = (datetime.utcnow() + timedelta(days=rng.randint(1, 60))).isoformat()
+    response = await client.call("GET", "/api/events/", params=params)
+    if response is None or response.status_code != 200:
+        return []
+    return response.json()["items"]
+
+
+async def browse(client: LoadClient, rng: random.Random, world: dict, session: Session):
+    response = await client.call("GET", "/api/events/", params={"limit": 20})
+    items = response.json()["items"] if response is not None and response.status_code == 200 else []
+    cursor = response.json().get("next_cursor") if items else None
+    for _ in range(rng.randint(0, 2)):
+        if not cursor:
+            break
+        response = await client.call("GET", "/api/events/", params={"limit": 20, "cursor": cursor})
+        if response is None or response.status_code != 200:
+            break
+        items = response.json()["items"]
+        cursor = response.json().get("next_cursor")
+
+    for item in rng.sample(items, min(len(items), rng.randint(1, 3))):
+        await client.call("GET", "/api/events/{id}", path=f"/api/events/{item['id']}")
+
+    if rng.random() < 0.3:
+        await client.call("GET", "/api/events/search", params={"q": rng.choice(FOOD_TERMS)})
+    if rng.random() < 0.3:
+        latitude, longitude = rng.choice(PLACES)
+        await client.call("GET", "/api/events/nearby", params={
+            "lat": latitude, "lng": longitude, "radius_km": rng.choice([2, 5, 10, 25]),
+        })
+
+
+async def guest(client: LoadClient, rng: random.Random, world: dict, session: Session):
+    await client.call("GET", "/api/users/me", token=session.token)
+    items = [item for item in await open_events(client, rng) if item["available_spots"] > 0 and item["status"] == "open"]
+    if items:
+        event = rng.choice(items)
+        await client.call("GET", "/api/events/{id}", path=f"/api/events/{event['id']}")
+        response = await client.call(
+            "POST", "/api/rsvps/", token=session.token, json={"event_id": event["id"], "message": "Count me in!"},
+        )
+        if response is not None and response.status_code == 201 and rng.random() < 0.25:
+            rsvp_id = response.json()["id"]
+            await client.call("POST", "/api/rsvps/{id}/cancel", path=f"/api/rsvps/{rsvp_id}/cancel", token=session.token)
+    await client.call("GET", "/api/rsvps/my-rsvps", token=session.token)
+
+
+async def host(client: LoadClient, rng: random.Random, world: dict, session: Session):
+    now = datetime.utcnow()
+    response = await client.call("POST", "/api/events/", token=session.token, json={
+        "title": f"Load test {rng.choice(FOOD_TERMS)} dinner",
+        "description": "Created by the load test",
+        "event_date": (now + timedelta(days=14)).isoformat(),
+        "location_name": "Test Kitchen",
+        "max_guests": 8,
+        "min_guests": 2,
+        "rsvp_deadline": (now + timedelta(days=7)).isoformat(),
+        "food_items": [{"name": "Salad"}, {"name": "Dessert"}],
+    })
+    if response is None or response.status_code != 201:
+        return
+    event_id = response.json()["id"]
+
+    guests = [other for other in world["sessions"] if other.user_id != session.user_id]
+    rsvp_ids = []
+    for other in rng.sample(guests, min(len(guests), rng.randint(2, 5))):
+        response = await client.call("POST", "/api/rsvps/", token=other.token, json={"event_id": event_id})
+        if response is not None and response.status_code == 201:
+            rsvp_ids.append(response.json()["id"])
+
+    for rsvp_id in rsvp_ids:
+        await client.call(
+            "POST", "/api/rsvps/{id}/status", path=f"/api/rsvps/{rsvp_id}/status", token=session.token,
+            json={"status": "confirmed"},
+        )
+    await client.call("GET", "/api/rsvps/event/{id}", path=f"/api/rsvps/event/{event_id}", token=session.token)
+    response = await client.call(
+        "POST", "/api/events/{id}/confirm", path=f"/api/events/{event_id}/confirm", token=session.token,
+    )
+    if response is None or response.status_code != 200:
+        return
+    await client.call(
+        "POST", "/api/rsvps/event/{id}/status", path=f"/api/rsvps/event/{event_id}/status", token=session.token,
+        json={"updates": [
+            {"rsvp_id": rsvp_id, "status": "attended" if rng.random() < 0.85 else "no_show"}
+            for rsvp_id in rsvp_ids
+        ]},
+    )
+    await client.call("POST", "/api/events/{id}/complete", path=f"/api/events/{event_id}/complete", token=session.token)
+
+
+async def newcomer(client: LoadClient, rng: random.Random, world: dict, session: Session):
+    name = f"loadtest_{os.getpid()}_{rng.getrandbits(40):x}"
+    response = await client.call("POST", "/api/auth/register", json={
+        "email": f"{name}@example.com", "username": name, "password": world["password"],
+    })
+    if response is not None and response.status_code == 201:
+        await login(client, f"{name}@example.com", world["password"])
+
+
+JOURNEYS = {"browse": browse, "guest": guest, "host": host, "newcomer": newcomer}
+
+
+async def virtual_user(client: LoadClient, rng: random.Random, world: dict, session: Session,
+                       deadline: float, think_ms: float, journeys: Counter):
+    names, weights = list(JOURNEY_WEIGHTS), list(JOURNEY_WEIGHTS.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        await JOURNEYS[name](client, rng, world, session)
+        journeys[name] += 1
+        if think_ms:
+            await asyncio.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+
+
+async def pick_accounts(n: int, seed: int) -> List[str]:
+    """Emails of n active accounts that may host (generated or demo)"""
+    from sqlalchemy import select
+    from app.config import get_settings
+    from app.database import async_session_maker
+    from app.models.user import User
+
+    async with async_session_maker() as db:
+        emails = (await db.execute(
+            select(User.email)
+            .where(User.is_active == True, User.trust_score >= get_settings().min_trust_score_to_host)
+            .order_by(User.id)
+            .limit(max(n * 20, 1000))
+        )).scalars().all()
+    return random.Random(seed).sample(list(emails), min(n, len(emails)))
+
+
+async def prepare_database(args):
+    from sqlalchemy import select, func
+    from app.database import async_session_maker, init_db
+    from app.models.event import Event
+    from generate_data import generate_data
+
+    await init_db()
+    async with async_session_maker() as db:
+        has_events = (await db.execute(select(func.count()).select_from(Event))).scalar() > 0
+    if not has_events:
+        print(f"Generating data: {args.users} users, {args.events} events, ~{args.rsvps_per_event} RSVPs per event")
+        await generate_data(args.users, args.events, args.rsvps_per_event, args.password, seed=args.seed)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_server(workers: int) -> (subprocess.Popen, str):
+    """uvicorn app.main:app on a free local port; returns (process, base URL) once healthy"""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        env={**os.environ, "SEED_DATA": "false"},
+    )
+    url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=url) as client:
+        for _ in range(300):
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return process, url
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30 s")
+
+
+def summarize(stats: Dict[str, RouteStats], elapsed: float) -> Dict[str, dict]:
+    results = {}
+    for route, route_stats in sorted(stats.items(), key=lambda item: -len(item[1].samples)):
+        samples = route_stats.samples
+        results[route] = {
+            "count": len(samples),
+            "rps": len(samples) / elapsed,
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+            "max_ms": max(samples),
+            "client_errors": route_stats.client_errors,
+            "server_errors": route_stats.server_errors,
+        }
+    return results
+
+
+def print_report(results: Dict[str, dict], elapsed: float, journeys: Counter):
+    print(f"\n{'route':<40} {'count':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'4xx':>5} {'5xx':>5}")
+    for route, row in results.items():
+        print(
+            f"{route:<40} {row['count']:>7} {row['rps']:>8.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f}"
+            f" {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f} {row['client_errors']:>5} {row['server_errors']:>5}"
+        )
+    total = sum(row["count"] for row in results.values())
+    print(f"\n{total} requests in {elapsed:.1f} s ({total / elapsed:.1f} req/s); journeys: {dict(journeys)}")
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Routes whose p95 regressed by more than `tolerance` against the baseline"""
+    regressions = []
+    for route, row in results.items():
+        before = baseline.get(route)
+        if not before or min(row["count"], before["count"]) < MIN_COMPARE_SAMPLES:
+            continue
+        if row["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{route}: p95 {before['p95_ms']:.1f} -> {row['p95_ms']:.1f} ms")
+    return regressions
+
+
+async def run(args) -> int:
+    await prepare_database(args)
+
+    process = None
+    url = args.url
+    if args.server:
+        process, url = await start_server(args.workers)
+    if url:
+        print(f"Target: {url}")
+        http = httpx.AsyncClient(base_url=url, timeout=args.timeout,
+                                 limits=httpx.Limits(max_connections=args.concurrency))
+    else:
+        from app.main import app
+        print("Target: app.main:app in-process (ASGI)")
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest",
+                                 timeout=args.timeout)
+
+    try:
+        async with http:
+            stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+            client = LoadClient(http, stats)
+            emails = await pick_accounts(args.concurrency, args.seed)
+            sessions = [
+                session for session in await asyncio.gather(*(login(client, email, args.password) for email in emails))
+                if session
+            ]
+            if len(sessions) < 2:
+                print("Could not log in enough accounts; is --password the one the data was generated with?")
+                return 1
+            print(f"{len(sessions)} virtual users logged in; running for {args.duration} s...")
+            stats.clear()  # Report the steady state, not the login burst
+
+            world = {"sessions": sessions, "password": args.password}
+            journeys: Counter = Counter()
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(
+                virtual_user(client, random.Random(args.seed * 1000 + i), world, session,
+                             deadline, args.think_ms, journeys)
+                for i, session in enumerate(sessions)
+            ))
+            elapsed = time.perf_counter() - started
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    results = summarize(stats, elapsed)
+    print_report(results, elapsed, journeys)
+
+    status = 0
+    total = sum(row["count"] for row in results.values())
+    server_errors = sum(row["server_errors"] for row in results.values())
+    if total and server_errors / total > args.max_error_rate:
+        print(f"FAIL: {server_errors} server errors ({server_errors / total:.2%} of requests)")
+        status = 1
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.save}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            status = 1
+        else:
+            print(f"No route's p95 regressed by more than {args.tolerance:.0%} against {args.baseline}")
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load after login")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between journeys")
+    parser.add_argument("--server", action="store_true", help="start uvicorn and load it over HTTP")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --server")
+    parser.add_argument("--url", help="load an already running server")
+    parser.add_argument("--database-url", help="use this database instead of a fresh one")
+    parser.add_argument("--users", type=int, default=10_000, help="generated users for a fresh database")
+    parser.add_argument("--events", type=int, default=2_000, help="generated events for a fresh database")
+    parser.add_argument("--rsvps-per-event", type=int, default=10)
+    parser.add_argument("--password", default="demo1234", help="password of the generated accounts")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds")
+    parser.add_argument("--save", help="write per-route results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 slowdown per route")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="allowed share of 5xx/failed requests")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ["DEBUG"] = "false"
+    else:
+        configure_environment("loadtest")
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Concurrency test for food item claims.
+
+Fires N simultaneous claims at one food item that needs K units and checks
+that exactly K win, that quantity_claimed ends at K and that it matches the
+RSVPs holding the item. Two paths run against fresh items:
+  * read_modify_write - the original logic (load item, check, += 1, commit),
+    reproduced directly on sessions to show lost updates / over-claims
+  * api (guarded UPDATE) - N concurrent POST /api/rsvps/ requests
+
+Exits non-zero if the API path over- or under-claims.
+
+Usage (from backend/):
+    python -m benchmarks.stress_food_claims --claims 300 --quantity 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure_environment
+
+configure_environment("food_claims")
+
+import httpx  # noqa: E402
+from sqlalchemy import select, insert, func  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.auth import create_access_token  # noqa: E402
+from app.database import async_session_maker, init_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.event import Event, EventFoodItem, EventStatus  # noqa: E402
+from app.models.rsvp import RSVP  # noqa: E402
+
+
+async def build_dataset(n_guests: int, quantity: int):
+    """One host, n_guests users and an open event with two items needing `quantity`"""
+    await init_db()
+    now = datetime.utcnow()
+    async with async_session_maker() as db:
+        conn = await db.connection()
+        await conn.execute(insert(User.__table__), [
+            {
+                "email": f"claim{i}@example.com",
+                "username": f"claim_{i}",
+                "hashed_password": "x",
+                "referral_code": f"C{i:07d}",
+            }
+            for i in range(n_guests + 1)
+        ])
+        host_id = (await db.execute(select(User.id).where(User.username == "claim_0"))).scalar_one()
+        event = Event(
+            title="Stress potluck",
+            event_date=now + timedelta(days=10),
+            location_name="Somewhere",
+            max_guests=n_guests + 1,
+            min_guests=1,
+            rsvp_deadline=now + timedelta(days=5),
+            confirmation_deadline=now + timedelta(days=7),
+            status=EventStatus.OPEN.value,
+            host_id=host_id,
+        )
+        event.food_items = [
+            EventFoodItem(name="Read-modify-write dish", quantity_needed=quantity),
+            EventFoodItem(name="Guarded dish", quantity_needed=quantity),
+        ]
+        db.add(event)
+        await db.commit()
+        guest_ids = (await db.execute(
+            select(User.id).where(User.id != host_id).order_by(User.id)
+        )).scalars().all()
+        return event.id, [fi.id for fi in event.food_items], guest_ids
+
+
+async def read_modify_write_claim(food_item_id: int) -> bool:
+    """The original create_rsvp claim logic, on its own session"""
+    async with async_session_maker() as db:
+        item = await db.get(EventFoodItem, food_item_id)
+        if item.is_fully_claimed:
+            return False
+        await asyncio.sleep(0)  # Another request gets scheduled between read and write
+        item.quantity_claimed += 1
+        await db.commit()
+        return True
+
+
+async def claimed_quantity(food_item_id: int) -> int:
+    async with async_session_maker() as db:
+        return (await db.execute(
+            select(EventFoodItem.quantity_claimed).where(EventFoodItem.id == food_item_id)
+        )).scalar_one()
+
+
+async def claiming_rsvps(food_item_id: int) -> int:
+    async with async_session_maker() as db:
+        return (await db.execute(
+            select(func.count(RSVP.id)).where(RSVP.food_item_id == food_item_id)
+        )).scalar_one()
+
+
+async def run_read_modify_write(food_item_id: int, n_claims: int, quantity: int):
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(read_modify_write_claim(food_item_id) for _ in range(n_claims)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    won = sum(1 for r in results if r is True)
+    errors = sum(1 for r in results if isinstance(r, Exception))
+    final = await claimed_quantity(food_item_id)
+    print(
+        f"  read_modify_write: {won} claims reported success, {errors} errors, "
+        f"quantity_claimed={final} (needed {quantity}), "
+        f"lost updates={max(0, won - final)}, {n_claims / elapsed:.0f} claims/s"
+    )
+
+
+async def run_api(event_id: int, food_item_id: int, guest_ids, quantity: int) -> bool:
+    tokens = [create_access_token({"sub": str(user_id)}) for user_id in guest_ids]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def claim(token):
+            return await client.post(
+                "/api/rsvps/",
+                json={"event_id": event_id, "food_item_id": food_item_id},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(claim(token) for token in tokens))
+        elapsed = time.perf_counter() - start
+
+    won = sum(1 for r in responses if r.status_code == 201)
+    full = sum(1 for r in responses if r.status_code == 400 and "fully claimed" in r.text)
+    other = len(responses) - won - full
+    final = await claimed_quantity(food_item_id)
+    holders = await claiming_rsvps(food_item_id)
+    print(
+        f"  api (guarded UPDATE): {won} claimed, {full} rejected as fully claimed, {other} other, "
+        f"quantity_claimed={final}, RSVPs holding it={holders} (needed {quantity}), "
+        f"{len(responses) / elapsed:.0f} requests/s"
+    )
+    if other:
+        print("    unexpected responses:", {r.status_code for r in responses} - {201, 400})
+    return won == final == holders == min(quantity, len(tokens)) and not other
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=300, help="simultaneous claims per path")
+    parser.add_argument("--quantity", type=int, default=50, help="units the item needs")
+    args = parser.parse_args()
+
+    event_id, (rmw_item_id, guarded_item_id), guest_ids = await build_dataset(args.claims, args.quantity)
+    print(f"{args.claims} simultaneous claims on an item needing {args.quantity}:")
+    await run_read_modify_write(rmw_item_id, args.claims, args.quantity)
+    ok = await run_api(event_id, guarded_item_id, guest_ids, args.quantity)
+    print("PASS" if ok else "FAIL")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main()) else 1)
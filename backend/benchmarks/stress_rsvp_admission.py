@@ -0,0 +1,181 @@
+"""
+Throughput of RSVP admission under contention.
+
+Fires N simultaneous RSVPs from different users at one event with C free
+spots, each bringing 1 to G guests (cycling through the sizes), and reports
+RSVPs/s and latency percentiles along with how many guests got in. Two paths
+run against fresh events:
+  * check_then_insert - the original logic (read available_spots, insert,
+    commit), reproduced directly on sessions to show overbooking
+  * api (conditional UPDATE) - N concurrent POST /api/rsvps/ requests
+
+Correctness (no overbooking, counters matching the rsvps table) is asserted
+by tests/test_rsvp_admission.py; this script is for the numbers.
+
+Usage (from backend/):
+    python -m benchmarks.stress_rsvp_admission --rsvps 500 --capacity 100 --guests 3 --rounds 3
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure_environment, percentile
+
+configure_environment("rsvp_admission")
+
+import httpx  # noqa: E402
+from sqlalchemy import select, insert, func  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.auth import create_access_token  # noqa: E402
+from app.database import async_session_maker, init_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.event import Event, EventStatus  # noqa: E402
+from app.models.rsvp import RSVP, RSVPStatus  # noqa: E402
+from app.event_counters import ACTIVE_STATUSES, apply_rsvp_transition  # noqa: E402
+
+
+async def create_users(n_guests: int):
+    """A host plus n_guests users; returns (host_id, guest ids)"""
+    await init_db()
+    async with async_session_maker() as db:
+        conn = await db.connection()
+        await conn.execute(insert(User.__table__), [
+            {
+                "email": f"rsvp{i}@example.com",
+                "username": f"rsvp_{i}",
+                "hashed_password": "x",
+                "referral_code": f"R{i:07d}",
+            }
+            for i in range(n_guests + 1)
+        ])
+        await db.commit()
+        ids = (await db.execute(select(User.id).order_by(User.id))).scalars().all()
+        return ids[0], ids[1:]
+
+
+async def create_event(host_id: int, capacity: int) -> int:
+    now = datetime.utcnow()
+    async with async_session_maker() as db:
+        event = Event(
+            title="Stress dinner",
+            event_date=now + timedelta(days=10),
+            location_name="Somewhere",
+            max_guests=capacity,
+            reserved_spots=0,
+            min_guests=1,
+            rsvp_deadline=now + timedelta(days=5),
+            confirmation_deadline=now + timedelta(days=7),
+            status=EventStatus.OPEN.value,
+            host_id=host_id,
+        )
+        db.add(event)
+        await db.commit()
+        return event.id
+
+
+async def check_then_insert(event_id: int, user_id: int, guest_count: int) -> bool:
+    """The original create_rsvp capacity logic, on its own session"""
+    async with async_session_maker() as db:
+        event = await db.get(Event, event_id)
+        if event.available_spots < guest_count:
+            return False
+        await asyncio.sleep(0)  # Another request gets scheduled between check and insert
+        db.add(RSVP(user_id=user_id, event_id=event_id, guest_count=guest_count, status=RSVPStatus.PENDING.value))
+        await apply_rsvp_transition(db, event_id, None, RSVPStatus.PENDING.value, guest_count)
+        await db.commit()
+        return True
+
+
+async def event_state(event_id: int):
+    """((active RSVPs, their guests) in the rsvps table, the same from the
+    event's counters, and the event's available spots)"""
+    async with async_session_maker() as db:
+        active = tuple((await db.execute(
+            select(func.count(RSVP.id), func.coalesce(func.sum(RSVP.guest_count), 0))
+            .where(RSVP.event_id == event_id, RSVP.status.in_(ACTIVE_STATUSES))
+        )).one())
+        event = await db.get(Event, event_id)
+        counted = ((event.pending_rsvp_count or 0) + (event.confirmed_rsvp_count or 0), event.active_guest_count or 0)
+        return active, counted, event.available_spots
+
+
+async def run_check_then_insert(host_id: int, guest_ids, sizes, capacity: int):
+    event_id = await create_event(host_id, capacity)
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(check_then_insert(event_id, user_id, size) for user_id, size in zip(guest_ids, sizes)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    admitted = sum(1 for r in results if r is True)
+    errors = sum(1 for r in results if isinstance(r, Exception))
+    (_, guests), _, _ = await event_state(event_id)
+    print(
+        f"  check_then_insert: {admitted} admitted, {errors} errors, "
+        f"{guests} guests for {capacity} spots, overbooked by {max(0, guests - capacity)}, "
+        f"{len(guest_ids) / elapsed:.0f} RSVPs/s"
+    )
+
+
+async def run_api_round(client, host_id: int, tokens, sizes, capacity: int):
+    event_id = await create_event(host_id, capacity)
+    latencies = []
+
+    async def rsvp(token, guest_count):
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/rsvps/",
+            json={"event_id": event_id, "guest_count": guest_count},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        return response
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(rsvp(token, size) for token, size in zip(tokens, sizes)))
+    elapsed = time.perf_counter() - start
+
+    admitted = [size for r, size in zip(responses, sizes) if r.status_code == 201]
+    full = [size for r, size in zip(responses, sizes) if r.status_code == 400 and "Not enough spots" in r.text]
+    other = len(responses) - len(admitted) - len(full)
+    active, counted, available = await event_state(event_id)
+    guests = active[1]
+    overbooked = max(0, guests - capacity)
+    # Spots only ever shrink, so an RSVP rejected as full must not fit what is left at the end
+    wrongly_rejected = sum(1 for size in full if size <= available)
+    print(
+        f"  api (conditional UPDATE): {len(admitted)} admitted, {len(full)} rejected as full "
+        f"({wrongly_rejected} that fit), {other} other, "
+        f"{guests} guests in {active[0]} active RSVPs for {capacity} spots, overbooked by {overbooked}, "
+        f"counters {'match' if counted == active else f'DRIFT ({counted})'}; "
+        f"{len(responses) / elapsed:.0f} RSVPs/s, "
+        f"p50 {percentile(latencies, 50):.1f} ms, p99 {percentile(latencies, 99):.1f} ms"
+    )
+    if other:
+        print("    unexpected responses:", {r.status_code for r in responses} - {201, 400})
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rsvps", type=int, default=500, help="simultaneous RSVPs per event")
+    parser.add_argument("--capacity", type=int, default=100, help="spots (guests) on each event")
+    parser.add_argument("--guests", type=int, default=3, help="largest guest_count; RSVPs cycle through 1..guests")
+    parser.add_argument("--rounds", type=int, default=3, help="events hammered through the API")
+    args = parser.parse_args()
+
+    host_id, guest_ids = await create_users(args.rsvps)
+    tokens = [create_access_token({"sub": str(user_id)}) for user_id in guest_ids]
+    sizes = [1 + i % args.guests for i in range(args.rsvps)]
+    print(f"{args.rsvps} simultaneous RSVPs of 1-{args.guests} guests on an event with {args.capacity} spots:")
+    await run_check_then_insert(host_id, guest_ids, sizes, args.capacity)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for _ in range(args.rounds):
+            await run_api_round(client, host_id, tokens, sizes, args.capacity)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+"""
+Assert that the hot router queries are served by the composite indexes.
+
+Migrates the configured database (DATABASE_URL), asks the planner for each
+query's plan and fails if none of the expected indexes is used.
+Run manually or in CI: python check_query_plans.py
+
+On PostgreSQL sequential scans are disabled for the check, since tiny or
+empty tables would otherwise always be scanned.
+"""
+import asyncio
+import sys
+from datetime import datetime
+
+from sqlalchemy import select, func, tuple_
+
+from app.database import engine, init_db, is_sqlite
+from app.models.event import Event, EventStatus
+from app.models.rsvp import RSVP, RSVPStatus
+from app.models.referral import Referral
+from app.routers.events import event_list_query
+from app.search import apply_event_search
+from app.geo import bounding_box, within_box
+from app.revocation import revoked_users_query
+
+# Probe with the current time so deadline and date predicates are as
+# selective as they are in production
+NOW = datetime.utcnow()
+
+PLAN_CHECKS = [
+    (
+        "list_events (public, status, upcoming, keyset)",
+        event_list_query()
+        .where(
+            Event.is_public == True,
+            Event.status.in_([EventStatus.OPEN.value, EventStatus.CONFIRMED.value]),
+            Event.event_date > NOW,
+            tuple_(Event.event_date, Event.id) > tuple_(NOW, 10),
+        )
+        .order_by(Event.event_date, Event.id)
+        .limit(21),
+        "ix_events_is_public_status_event_date",
+    ),
+    (
+        "list_my_events (host_id, newest first)",
+        event_list_query()
+        .where(Event.host_id == 1)
+        .order_by(Event.event_date.desc(), Event.id.desc())
+        .limit(21),
+        "ix_events_host_id_event_date",
+    ),
+    (
+        "search_events (events_fts MATCH / GIN tsvector)",
+        apply_event_search(event_list_query(), ["taco", "night"], is_sqlite())[0].limit(21),
+        ("events_fts", "ix_events_search"),
+    ),
+    (
+        "nearby_events area (geohash ranges)",
+        select(Event.id).where(within_box(*bounding_box(37.7749, -122.4194, 5))),
+        "ix_events_geohash",
+    ),
+    (
+        "get_event_rsvps (event_id)",
+        select(RSVP).where(RSVP.event_id == 1).order_by(RSVP.created_at),
+        "ix_rsvps_event_id_status",
+    ),
+    (
+        "create_rsvp duplicate check (event_id, user_id, status)",
+        select(RSVP.id)
+        .where(
+            RSVP.event_id == 1,
+            RSVP.user_id == 1,
+            RSVP.status.notin_([RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value]),
+        )
+        .limit(1),
+        ("ix_rsvps_event_id_status", "ix_rsvps_user_id_is_reserved_status", "ix_rsvps_user_id_created_at"),
+    ),
+    (
+        "get_my_rsvps (user_id ORDER BY created_at)",
+        select(RSVP).where(RSVP.user_id == 1).order_by(RSVP.created_at.desc()),
+        ("ix_rsvps_user_id_created_at", "ix_rsvps_user_id_is_reserved_status"),
+    ),
+    (
+        "get_my_invites (user_id, is_reserved, status)",
+        select(RSVP).where(
+            RSVP.user_id == 1,
+            RSVP.is_reserved == True,
+            RSVP.status == RSVPStatus.PENDING.value,
+        ),
+        ("ix_rsvps_user_id_is_reserved_status", "ix_rsvps_user_id_created_at"),
+    ),
+    (
+        "get_referral_stats (referrer_id)",
+        select(Referral).where(Referral.referrer_id == 1).order_by(Referral.created_at.desc()),
+        "ix_referrals_referrer_id_created_at",
+    ),
+    (
+        "register referral limit (referrer_id count)",
+        select(func.count(Referral.id)).where(Referral.referrer_id == 1),
+        "ix_referrals_referrer_id_created_at",
+    ),
+    (
+        "scheduler close_rsvps (rsvps_closed, rsvp_deadline)",
+        select(Event.id).where(Event.rsvps_closed == False, Event.rsvp_deadline <= NOW),
+        "ix_events_rsvps_closed_rsvp_deadline",
+    ),
+    (
+        "scheduler cancel_unconfirmed (status, confirmation_deadline)",
+        select(Event.id).where(
+            Event.status == EventStatus.OPEN.value,
+            Event.confirmation_deadline <= NOW,
+            Event.confirmed_rsvp_count < func.coalesce(Event.min_guests, 1),
+        ),
+        "ix_events_status_confirmation_deadline",
+    ),
+    (
+        "scheduler flag_for_completion (status, needs_completion, event_date)",
+        select(Event.id).where(
+            Event.status == EventStatus.CONFIRMED.value,
+            Event.needs_completion == False,
+            Event.event_date <= NOW,
+        ),
+        "ix_events_status_needs_completion_event_date",
+    ),
+    (
+        "token revocation refresh (inactive or token_version > 0)",
+        revoked_users_query(),
+        "ix_users_revoked",
+    ),
+]
+
+
+async def explain(conn, stmt) -> str:
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row[-1] for row in result.all())
+    result = await conn.exec_driver_sql(f"EXPLAIN {sql}")
+    return "\n".join(row[0] for row in result.all())
+
+
+async def check_query_plans(checks=PLAN_CHECKS) -> bool:
+    await init_db()
+
+    failures = 0
+    async with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+        for label, stmt, index_names in checks:
+            if isinstance(index_names, str):
+                index_names = (index_names,)
+            plan = await explain(conn, stmt)
+            ok = any(name in plan for name in index_names)
+            failures += not ok
+            print(f"[{'ok' if ok else 'FAIL'}] {label}: expects {' or '.join(index_names)}")
+            if not ok:
+                print("       " + plan.replace("\n", "\n       "))
+
+    print(f"\n{len(checks) - failures}/{len(checks)} queries use their index")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check_query_plans()) else 1)
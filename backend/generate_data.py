@@ -0,0 +1,452 @@
+"""
+Generate a large synthetic data set for capacity and load testing.
+
+Builds on seed_data.py: the demo accounts are seeded first (so you can still
+log in as demo@example.com), then --users users, --events events with food
+items, and around --rsvps-per-event RSVPs per event are bulk inserted with
+executemany, --batch-size rows at a time. Every generated user shares one
+precomputed password hash (--password), so no time goes into bcrypt.
+
+    python generate_data.py --users 100000 --events 20000 --rsvps-per-event 30
+
+The data follows the shape of production rather than a uniform spread:
+  - hosts and referrers have a long tail (a few users do most of it), and
+    nobody refers more than MAX_REFERRALS_PER_USER people
+  - events span the last six months and the next three, clustered around a
+    dozen metro areas; past events are mostly completed, upcoming ones open
+  - RSVPs arrive until the event is full, host invites fill reserved spots,
+    some guests cancel or are declined, and past events record attendance
+  - every reputation change goes into the trust ledger, and user counters
+    are replayed from it afterwards, as rebuild_trust.py does
+
+Run it against an otherwise idle database. --seed makes the data repeatable.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, select, func
+
+from app.auth import get_password_hash
+from app.config import get_settings
+from app.database import async_session_maker, init_db
+from app.event_counters import recompute_event_counters
+from app.geo import encode_geohash
+from app.models.user import User
+from app.models.event import Event, EventFoodItem, EventStatus
+from app.models.rsvp import RSVP, RSVPStatus
+from app.models.referral import Referral
+from app.models.trust_event import TrustEvent, TrustEventKind
+from app.trust import trust_event, rebuild_user_counters
+from seed_data import seed_database
+
+settings = get_settings()
+
+BATCH_SIZE = 5000
+REBUILD_CHUNK_SIZE = 1000
+
+REFERRED_SHARE = 0.3  # Users who signed up with someone's code
+PUBLIC_SHARE = 0.85
+LONG_TAIL = 2  # Higher skews hosting and referring towards fewer users
+
+FIRST_NAMES = [
+    "Maya", "Jordan", "Sam", "Priya", "Alex", "Luna", "Noah", "Aisha", "Diego", "Mei", "Omar", "Zoe",
+    "Kenji", "Sofia", "Malik", "Ingrid", "Ravi", "Chloe", "Mateo", "Hana", "Leo", "Amara", "Ivan", "Nia",
+]
+LAST_NAMES = [
+    "Chen", "Rivera", "Nakamura", "Sharma", "Thompson", "Garcia", "Okafor", "Kim", "Novak", "Haddad",
+    "Silva", "Murphy", "Tanaka", "Patel", "Larsen", "Dubois", "Rossi", "Mensah", "Cohen", "Nguyen",
+]
+FOODS = [
+    "Taco", "Pasta", "Ramen", "Curry", "Dumpling", "Pizza", "Paella", "Sushi", "Barbecue", "Brunch",
+    "Pho", "Tamale", "Lasagna", "Risotto", "Falafel", "Kimchi", "Gumbo", "Pierogi", "Biryani", "Fondue",
+]
+OCCASIONS = ["Night", "Party", "Potluck", "Dinner", "Feast", "Supper", "Picnic", "Social", "Club", "Tasting"]
+PLACES = ["Kitchen", "Loft", "Backyard", "Rooftop", "Apartment", "Garden", "Patio", "Place"]
+STREETS = ["Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Washington", "Lake", "Hill", "Park", "Market"]
+DISHES = [
+    "Salad", "Bread", "Dessert", "Wine", "Beer", "Sparkling Water", "Cheese Plate", "Dips & Chips",
+    "Fruit", "Ice Cream", "Roasted Vegetables", "Rice", "Lemonade", "Cookies", "Pickles", "Hot Sauce",
+]
+# (latitude, longitude, relative size)
+METROS = [
+    (40.7128, -74.0060, 10), (34.0522, -118.2437, 7), (41.8781, -87.6298, 5), (29.7604, -95.3698, 4),
+    (33.4484, -112.0740, 3), (39.9526, -75.1652, 3), (37.7749, -122.4194, 4), (47.6062, -122.3321, 3),
+    (39.7392, -104.9903, 2), (33.7490, -84.3880, 3), (30.2672, -97.7431, 2), (42.3601, -71.0589, 3),
+]
+
+
+def long_tail_choice(rng: random.Random, items: List):
+    """Pick from items, favouring the front of the list"""
+    return items[int(len(items) * rng.random() ** LONG_TAIL)]
+
+
+def weighted(rng: random.Random, options: Dict[str, float]) -> str:
+    return rng.choices(list(options), list(options.values()))[0]
+
+
+async def insert_many(db, table, rows: List[dict]) -> List[int]:
+    """executemany INSERT; returns the new primary keys in row order.
+
+    The keys are read back as the block above the previous maximum, which
+    is why nothing else may write to the database meanwhile. (INSERT ...
+    RETURNING in parameter order would avoid that, but SQLite then runs
+    one statement per row.)
+    """
+    if not rows:
+        return []
+    last_id = (await db.execute(select(func.coalesce(func.max(table.c.id), 0)))).scalar()
+    await db.execute(insert(table), rows)
+    ids = list((await db.execute(
+        select(table.c.id).where(table.c.id > last_id).order_by(table.c.id)
+    )).scalars().all())
+    if len(ids) != len(rows):
+        raise RuntimeError(f"{table.name}: inserted {len(rows)} rows but found {len(ids)}; is something else writing?")
+    return ids
+
+
+def progress(label: str, done: int, total: int, started: float):
+    elapsed = time.perf_counter() - started
+    print(f"  {label}: {done}/{total} ({elapsed:.1f} s, {done / max(elapsed, 1e-9):,.0f}/s)")
+
+
+async def generate_users(rng, n_users: int, hashed_password: str, now: datetime, batch_size: int):
+    """Insert users (with referrals and their ledger rows). Returns their ids, oldest first."""
+    async with async_session_maker() as db:
+        offset = (await db.execute(select(func.coalesce(func.max(User.id), 0)))).scalar()
+
+    user_ids: List[int] = []
+    referral_codes: List[str] = []
+    referral_counts: Dict[int, int] = {}
+    signup_start = now - timedelta(days=365)
+    started = time.perf_counter()
+
+    for start in range(0, n_users, batch_size):
+        rows, referrers = [], []
+        for i in range(start, min(start + batch_size, n_users)):
+            number = offset + i + 1
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            username = f"{first.lower()}_{last.lower()}{number}"
+            created_at = signup_start + timedelta(days=365 * i / n_users)
+
+            referrer = None
+            if user_ids and rng.random() < REFERRED_SHARE:
+                index = int(len(user_ids) * rng.random() ** LONG_TAIL)
+                if referral_counts.get(user_ids[index], 0) < settings.max_referrals_per_user:
+                    referrer = index
+                    referral_counts[user_ids[index]] = referral_counts.get(user_ids[index], 0) + 1
+            referrers.append(referrer)
+
+            rows.append({
+                "email": f"{username}@example.com",
+                "username": username,
+                "hashed_password": hashed_password,
+                "full_name": f"{first} {last}",
+                "trust_score": settings.default_trust_score,
+                "events_hosted": 0,
+                "events_attended": 0,
+                "flake_count": 0,
+                "successful_events": 0,
+                "referral_code": f"GEN{number:07d}",
+                "referred_by_id": user_ids[referrer] if referrer is not None else None,
+                "referral_points": 0,
+                "is_active": True,
+                "is_verified": rng.random() < 0.6,
+                "is_admin": False,
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+
+        async with async_session_maker() as db:
+            ids = await insert_many(db, User.__table__, rows)
+            referrals, ledger = [], []
+            for user_id, row, referrer in zip(ids, rows, referrers):
+                ledger.append({
+                    **trust_event(user_id, TrustEventKind.ACCOUNT_CREATED, trust=settings.default_trust_score),
+                    "created_at": row["created_at"],
+                })
+                if referrer is None:
+                    continue
+                referrals.append({
+                    "referrer_id": user_ids[referrer],
+                    "referred_user_id": user_id,
+                    "referral_code_used": referral_codes[referrer],
+                    "bonus_awarded": True,
+                    "bonus_amount": settings.referral_bonus_points,
+                    "created_at": row["created_at"],
+                    "bonus_awarded_at": row["created_at"],
+                })
+                ledger.append({
+                    **trust_event(
+                        user_ids[referrer], TrustEventKind.REFERRAL_BONUS,
+                        referral_points=settings.referral_bonus_points,
+                    ),
+                    "created_at": row["created_at"],
+                })
+            if referrals:
+                await db.execute(insert(Referral.__table__), referrals)
+            await db.execute(insert(TrustEvent.__table__), ledger)
+            await db.commit()
+
+        user_ids.extend(ids)
+        referral_codes.extend(row["referral_code"] for row in rows)
+        progress("users", len(user_ids), n_users, started)
+
+    return user_ids
+
+
+def event_row(rng, host_id: int, now: datetime, number: int, rsvps_per_event: int) -> dict:
+    event_date = now + timedelta(days=rng.uniform(-180, 90))
+    event_date = event_date.replace(minute=0, second=0, microsecond=0, hour=rng.choice([12, 17, 18, 19, 20]))
+    created_at = min(now, event_date - timedelta(days=rng.uniform(7, 45)))
+    rsvp_deadline = event_date - timedelta(days=rng.uniform(1, 3))
+
+    if event_date <= now:
+        status = weighted(rng, {EventStatus.COMPLETED.value: 0.75, EventStatus.CANCELLED.value: 0.15,
+                                EventStatus.CONFIRMED.value: 0.10})
+    else:
+        status = weighted(rng, {EventStatus.OPEN.value: 0.75, EventStatus.CONFIRMED.value: 0.15,
+                                EventStatus.CANCELLED.value: 0.05, EventStatus.DRAFT.value: 0.05})
+
+    # Sized so that busy events fill up and quiet ones don't
+    max_guests = rng.randint(max(4, rsvps_per_event // 2), max(8, rsvps_per_event * 3 // 2))
+    latitude, longitude, _ = rng.choices(METROS, [size for *_, size in METROS])[0]
+    latitude, longitude = rng.gauss(latitude, 0.15), rng.gauss(longitude, 0.15)
+    food, occasion = rng.choice(FOODS), rng.choice(OCCASIONS)
+    return {
+        "title": f"{food} {occasion} #{number}",
+        "description": f"{food} {occasion.lower()} hosted at home. Bring something from the list!",
+        "event_date": event_date,
+        "location_name": f"{rng.choice(FIRST_NAMES)}'s {rng.choice(PLACES)}",
+        "location_address": f"{rng.randint(1, 3000)} {rng.choice(STREETS)} St",
+        "latitude": latitude,
+        "longitude": longitude,
+        "geohash": encode_geohash(latitude, longitude),
+        "max_guests": max_guests,
+        "reserved_spots": rng.randint(1, max(1, max_guests // 4)) if rng.random() < 0.3 else 0,
+        "min_guests": rng.randint(1, min(4, max_guests)),
+        "rsvp_deadline": rsvp_deadline,
+        "confirmation_deadline": event_date - timedelta(days=settings.min_days_before_event_to_confirm),
+        "status": status,
+        "is_public": rng.random() < PUBLIC_SHARE,
+        "rsvps_closed": rsvp_deadline <= now,
+        "needs_completion": status == EventStatus.CONFIRMED.value and event_date <= now,
+        "host_id": host_id,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def admitted_status(rng, event_status: str) -> str:
+    """Status of an RSVP that got a spot, given where its event ended up"""
+    if event_status == EventStatus.COMPLETED.value:
+        return RSVPStatus.ATTENDED.value if rng.random() < 0.85 else RSVPStatus.NO_SHOW.value
+    if event_status == EventStatus.CONFIRMED.value:
+        return RSVPStatus.CONFIRMED.value
+    return RSVPStatus.CONFIRMED.value if rng.random() < 0.6 else RSVPStatus.PENDING.value
+
+
+def plan_event(rng, event: dict, user_ids: List[int], rsvps_per_event: int):
+    """Food items and RSVPs for one event (RSVPs name items by list index)"""
+    food_items = [
+        {"name": name, "description": None, "quantity_needed": rng.randint(1, 3), "quantity_claimed": 0}
+        for name in rng.sample(DISHES, rng.randint(2, 6))
+    ]
+    if event["status"] == EventStatus.DRAFT.value:
+        return food_items, []
+
+    wanted = min(round(rng.triangular(0, 2 * rsvps_per_event, rsvps_per_event)), len(user_ids) - 1)
+    guests = [user_id for user_id in rng.sample(user_ids, wanted + 1) if user_id != event["host_id"]][:wanted]
+    window = max((event["rsvp_deadline"] - event["created_at"]).total_seconds(), 60)
+    arrivals = sorted(
+        (event["created_at"] + timedelta(seconds=rng.uniform(0, window)), user_id) for user_id in guests
+    )
+
+    invites_left = event["reserved_spots"]
+    public_left = event["max_guests"] - event["reserved_spots"]
+    rsvps = []
+    for created_at, user_id in arrivals:
+        is_reserved = invites_left > 0
+        guest_count = 1 if is_reserved or rng.random() >= 0.2 else 2  # Invites are for one guest
+        if not is_reserved and public_left < guest_count:
+            break  # Full: later requests were turned away
+        if event["status"] == EventStatus.CANCELLED.value:
+            status = RSVPStatus.CANCELLED.value
+        else:
+            roll = rng.random()
+            if roll < 0.08:
+                status = RSVPStatus.CANCELLED.value
+            elif roll < 0.12 and not is_reserved:
+                status = RSVPStatus.DECLINED.value
+            else:
+                status = admitted_status(rng, event["status"])
+        if is_reserved:
+            invites_left -= 1
+        elif status not in (RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value):
+            public_left -= guest_count
+
+        food_item = None
+        if status not in (RSVPStatus.CANCELLED.value, RSVPStatus.DECLINED.value) and rng.random() < 0.4:
+            open_items = [i for i, item in enumerate(food_items) if item["quantity_claimed"] < item["quantity_needed"]]
+            if open_items:
+                food_item = rng.choice(open_items)
+                food_items[food_item]["quantity_claimed"] += 1
+
+        accepted = status in (RSVPStatus.CONFIRMED.value, RSVPStatus.ATTENDED.value, RSVPStatus.NO_SHOW.value)
+        rsvps.append({
+            "user_id": user_id,
+            "food_item": food_item,
+            "status": status,
+            "guest_count": guest_count,
+            "message": None,
+            "bringing_food_item": food_items[food_item]["name"] if food_item is not None else None,
+            "food_notes": None,
+            "is_reserved": is_reserved,
+            "invited_at": created_at if is_reserved else None,
+            "created_at": created_at,
+            "updated_at": created_at,
+            "confirmed_at": created_at + timedelta(hours=rng.uniform(1, 48)) if accepted else None,
+            "attended_at": event["event_date"] if status == RSVPStatus.ATTENDED.value else None,
+        })
+    return food_items, rsvps
+
+
+def attendance_entry(rsvp: dict, rsvp_id: int, event_id: int, created_at: datetime):
+    if rsvp["status"] == RSVPStatus.ATTENDED.value:
+        entry = trust_event(
+            rsvp["user_id"], TrustEventKind.ATTENDED, trust=settings.successful_event_bonus,
+            events_attended=1, event_id=event_id, rsvp_id=rsvp_id,
+        )
+    elif rsvp["status"] == RSVPStatus.NO_SHOW.value:
+        entry = trust_event(
+            rsvp["user_id"], TrustEventKind.NO_SHOW, trust=-settings.flake_penalty,
+            flake_count=1, event_id=event_id, rsvp_id=rsvp_id,
+        )
+    else:
+        return None
+    return {**entry, "created_at": created_at}
+
+
+async def generate_events(rng, user_ids: List[int], n_events: int, rsvps_per_event: int, now: datetime,
+                          batch_size: int):
+    """Insert events with their food items, RSVPs and ledger rows. Returns (food items, RSVPs) created."""
+    # Hosts are the long tail over a shuffled copy, so heavy hosts aren't just the oldest accounts
+    hosts = user_ids[:]
+    rng.shuffle(hosts)
+    n_food_items = n_rsvps = 0
+    started = time.perf_counter()
+
+    # Batches hold roughly batch_size RSVPs
+    events_per_batch = max(1, batch_size // max(rsvps_per_event, 1))
+    for start in range(0, n_events, events_per_batch):
+        events = [
+            event_row(rng, long_tail_choice(rng, hosts), now, number, rsvps_per_event)
+            for number in range(start + 1, min(start + events_per_batch, n_events) + 1)
+        ]
+        plans = [plan_event(rng, event, user_ids, rsvps_per_event) for event in events]
+
+        async with async_session_maker() as db:
+            event_ids = await insert_many(db, Event.__table__, events)
+
+            food_rows = [
+                {**item, "event_id": event_id}
+                for event_id, (food_items, _) in zip(event_ids, plans)
+                for item in food_items
+            ]
+            food_ids = iter(await insert_many(db, EventFoodItem.__table__, food_rows))
+            item_ids = [[next(food_ids) for _ in food_items] for food_items, _ in plans]
+
+            rsvp_rows = []
+            for event_id, (_, rsvps), ids in zip(event_ids, plans, item_ids):
+                for rsvp in rsvps:
+                    row = {key: value for key, value in rsvp.items() if key != "food_item"}
+                    row["event_id"] = event_id
+                    row["food_item_id"] = ids[rsvp["food_item"]] if rsvp["food_item"] is not None else None
+                    rsvp_rows.append(row)
+            rsvp_ids = iter(await insert_many(db, RSVP.__table__, rsvp_rows))
+
+            ledger = []
+            for event_id, event, (_, rsvps) in zip(event_ids, events, plans):
+                for rsvp in rsvps:
+                    entry = attendance_entry(rsvp, next(rsvp_ids), event_id, event["event_date"])
+                    if entry:
+                        ledger.append(entry)
+                if event["status"] == EventStatus.COMPLETED.value:
+                    ledger.append({
+                        **trust_event(
+                            event["host_id"], TrustEventKind.HOSTED_EVENT, trust=settings.successful_event_bonus,
+                            events_hosted=1, successful_events=1, event_id=event_id,
+                        ),
+                        "created_at": event["event_date"],
+                    })
+            if ledger:
+                await db.execute(insert(TrustEvent.__table__), ledger)
+
+            await recompute_event_counters(db, event_ids)
+            await db.commit()
+
+        n_food_items += len(food_rows)
+        n_rsvps += len(rsvp_rows)
+        progress(f"events ({n_rsvps} RSVPs)", start + len(events), n_events, started)
+
+    return n_food_items, n_rsvps
+
+
+async def replay_user_counters(user_ids: List[int], chunk_size: int = REBUILD_CHUNK_SIZE):
+    started = time.perf_counter()
+    for start in range(0, len(user_ids), chunk_size):
+        async with async_session_maker() as db:
+            await rebuild_user_counters(db, user_ids[start:start + chunk_size])
+            await db.commit()
+    progress("user counters replayed", len(user_ids), len(user_ids), started)
+
+
+async def generate_data(n_users: int, n_events: int, rsvps_per_event: int, password: str = "demo1234",
+                        batch_size: int = BATCH_SIZE, seed: int = 1, demo: bool = True):
+    if demo:
+        await seed_database()
+    else:
+        await init_db()
+
+    if n_users < 2:
+        print("Need at least 2 users to generate events.")
+        return
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    hashed_password = get_password_hash(password)
+    started = time.perf_counter()
+
+    print(f"Generating {n_users} users, {n_events} events, ~{rsvps_per_event} RSVPs per event...")
+    user_ids = await generate_users(rng, n_users, hashed_password, now, batch_size)
+    n_food_items, n_rsvps = await generate_events(rng, user_ids, n_events, rsvps_per_event, now, batch_size)
+    await replay_user_counters(user_ids)
+
+    print(
+        f"Generated {len(user_ids)} users, {n_events} events, {n_food_items} food items and "
+        f"{n_rsvps} RSVPs in {time.perf_counter() - started:.1f} s"
+    )
+    print(f"Generated users log in with password {password!r}, e.g. {await sample_email(user_ids[0])}")
+
+
+async def sample_email(user_id: int) -> str:
+    async with async_session_maker() as db:
+        return (await db.execute(select(User.email).where(User.id == user_id))).scalar_one()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--rsvps-per-event", type=int, default=10)
+    parser.add_argument("--password", default="demo1234", help="password shared by every generated user")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per executemany")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--no-demo", action="store_true", help="skip the demo accounts from seed_data.py")
+    args = parser.parse_args()
+    asyncio.run(generate_data(
+        args.users, args.events, args.rsvps_per_event, args.password, args.batch_size, args.seed, not args.no_demo,
+    ))
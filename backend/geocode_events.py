@@ -0,0 +1,61 @@
+"""
+Geocode events that have an address but no coordinates, using the
+configured geocoder (GEOCODER). Runs in chunks of events, one transaction
+per chunk: python geocode_events.py [--chunk-size N] [--delay SECONDS]
+
+Addresses the geocoder can't place are left unlocated (and tried again on
+the next run). Nominatim allows about one request per second, so that is
+the default delay when it is configured.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import async_session_maker, init_db
+from app.models.event import Event
+from app.geocoding import get_geocoder, locate_event
+
+CHUNK_SIZE = 200
+
+
+async def geocode_events(chunk_size=CHUNK_SIZE, delay=0.0):
+    await init_db()
+    geocoder = get_geocoder()
+
+    located = failed = 0
+    last_id = 0
+    while True:
+        async with async_session_maker() as db:
+            events = (await db.execute(
+                select(Event)
+                .where(Event.id > last_id, Event.latitude.is_(None), Event.location_address.isnot(None))
+                .order_by(Event.id)
+                .limit(chunk_size)
+            )).scalars().all()
+            if not events:
+                break
+            for event in events:
+                if delay:
+                    await asyncio.sleep(delay)
+                await locate_event(event, None, None, event.location_address, geocoder)
+                if event.latitude is None:
+                    failed += 1
+                else:
+                    located += 1
+            await db.commit()
+        last_id = events[-1].id
+
+    print(f"Geocoded {located} events ({failed} addresses could not be located)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--delay", type=float, default=1.0 if get_settings().geocoder == "nominatim" else 0.0,
+        help="seconds to wait before each geocoder call",
+    )
+    args = parser.parse_args()
+    asyncio.run(geocode_events(args.chunk_size, args.delay))
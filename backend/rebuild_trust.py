@@ -0,0 +1,49 @@
+"""
+Recompute users' reputation counters (trust_score, events_attended, ...) by
+replaying the trust_events ledger. Runs in chunks of users, one transaction
+per chunk: python rebuild_trust.py [--chunk-size N] [user_id ...]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from app.database import async_session_maker, init_db
+from app.models.user import User
+from app.trust import rebuild_user_counters
+
+CHUNK_SIZE = 1000
+
+
+async def rebuild_trust(user_ids=None, chunk_size=CHUNK_SIZE):
+    await init_db()
+
+    rebuilt = 0
+    if user_ids is not None:
+        for start in range(0, len(user_ids), chunk_size):
+            async with async_session_maker() as db:
+                rebuilt += await rebuild_user_counters(db, user_ids[start:start + chunk_size])
+                await db.commit()
+    else:
+        last_id = 0
+        while True:
+            async with async_session_maker() as db:
+                chunk = (await db.execute(
+                    select(User.id).where(User.id > last_id).order_by(User.id).limit(chunk_size)
+                )).scalars().all()
+                if not chunk:
+                    break
+                rebuilt += await rebuild_user_counters(db, chunk)
+                await db.commit()
+            last_id = chunk[-1]
+
+    scope = "all users" if user_ids is None else f"users {user_ids}"
+    print(f"Replayed the trust ledger for {scope} ({rebuilt} users rebuilt)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("user_ids", nargs="*", type=int)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+    asyncio.run(rebuild_trust(args.user_ids or None, args.chunk_size))
@@ -0,0 +1,25 @@
+"""
+Recompute the denormalized RSVP counters on events from the rsvps table.
+Run after manual data fixes or imports: python repair_counters.py [event_id ...]
+"""
+import asyncio
+import sys
+
+from app.database import async_session_maker, init_db
+from app.event_counters import recompute_event_counters
+
+
+async def repair_counters(event_ids=None):
+    await init_db()
+
+    async with async_session_maker() as db:
+        updated = await recompute_event_counters(db, event_ids)
+        await db.commit()
+
+    scope = "all events" if event_ids is None else f"events {event_ids}"
+    print(f"Recomputed RSVP counters for {scope} ({updated} rows updated)")
+
+
+if __name__ == "__main__":
+    ids = [int(arg) for arg in sys.argv[1:]] or None
+    asyncio.run(repair_counters(ids))
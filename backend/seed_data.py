@@ -12,6 +12,9 @@ from app.models.user import User
 from app.models.event import Event, EventFoodItem, EventStatus
 from app.models.rsvp import RSVP, RSVPStatus
 from app.auth import get_password_hash
+from app.event_counters import recompute_event_counters
+from app.trust import open_trust_ledger
+from app.geo import set_event_location
 
 
 async def seed_database():
@@ -242,6 +245,19 @@ async def seed_database():
             ),
         ]
 
+        # Demo coordinates around San Francisco (Jordan hosts both at one address)
+        coordinates = [
+            (37.7793, -122.4193),  # Sam's Kitchen
+            (37.7529, -122.4184),  # Jordan's Place
+            (37.7941, -122.4078),  # Maya's Apartment
+            (37.7599, -122.4148),  # Priya's Home
+            (37.7694, -122.4862),  # Alex's Backyard
+            (37.7609, -122.4350),  # Luna's Loft
+            (37.7529, -122.4184),  # Jordan's Patio
+        ]
+        for event, (latitude, longitude) in zip(events, coordinates):
+            set_event_location(event, latitude, longitude)
+
         for event in events:
             db.add(event)
         await db.flush()
@@ -351,6 +367,8 @@ async def seed_database():
                 db.add(rsvp)
             print(f"Created {len(rsvps)} RSVPs")
 
+        await recompute_event_counters(db)
+        await open_trust_ledger(db)
         await db.commit()
         print("DATABASE SEEDED SUCCESSFULLY!")
         print("\nDemo Accounts (password: demo1234):")
@@ -0,0 +1,145 @@
+"""Event lifecycle through the API: create, RSVP, confirm, complete, search"""
+import pytest
+
+from app.config import get_settings
+
+pytestmark = pytest.mark.anyio
+
+settings = get_settings()
+
+
+async def test_register_and_login(client):
+    response = await client.post("/api/auth/register", json={
+        "email": "host@example.com", "username": "host", "password": "password123",
+    })
+    assert response.status_code == 201, response.text
+    assert response.json()["trust_score"] == settings.default_trust_score
+
+    response = await client.post("/api/auth/login", data={"username": "host@example.com", "password": "password123"})
+    assert response.status_code == 200, response.text
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await client.get("/api/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["username"] == "host"
+
+
+async def test_create_event(client, create_users, create_event):
+    host_id, = await create_users(1)
+    event = await create_event(host_id, max_guests=4, reserved_spots=1, food_items=[{"name": "Pie"}])
+
+    assert event["status"] == "open"
+    assert event["host_id"] == host_id
+    assert event["available_spots"] == 3
+    assert [item["name"] for item in event["food_items"]] == ["Pie"]
+
+    response = await client.get(f"/api/events/{event['id']}")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Test dinner"
+
+
+async def test_rsvp_and_cancel(client, create_users, create_event, auth_headers):
+    host_id, guest_id = await create_users(2)
+    event = await create_event(host_id, max_guests=4)
+
+    response = await client.post(
+        "/api/rsvps/", json={"event_id": event["id"], "guest_count": 2}, headers=auth_headers(guest_id)
+    )
+    assert response.status_code == 201, response.text
+    rsvp = response.json()
+    assert rsvp["status"] == "pending"
+
+    response = await client.get(f"/api/events/{event['id']}")
+    assert response.json()["available_spots"] == 2
+
+    response = await client.post(
+        "/api/rsvps/", json={"event_id": event["id"]}, headers=auth_headers(guest_id)
+    )
+    assert response.status_code == 400
+
+    response = await client.post(f"/api/rsvps/{rsvp['id']}/cancel", headers=auth_headers(guest_id))
+    assert response.status_code == 200, response.text
+
+    response = await client.get(f"/api/events/{event['id']}")
+    assert response.json()["available_spots"] == 4
+
+
+async def test_rsvp_rejected_when_full(client, create_users, create_event, auth_headers):
+    host_id, first_id, second_id = await create_users(3)
+    event = await create_event(host_id, max_guests=2)
+
+    response = await client.post(
+        "/api/rsvps/", json={"event_id": event["id"], "guest_count": 2}, headers=auth_headers(first_id)
+    )
+    assert response.status_code == 201, response.text
+
+    response = await client.post("/api/rsvps/", json={"event_id": event["id"]}, headers=auth_headers(second_id))
+    assert response.status_code == 400
+    assert "Not enough spots" in response.json()["detail"]
+
+
+async def test_confirm_and_complete(client, create_users, create_event, auth_headers):
+    host_id, guest_id = await create_users(2)
+    host = auth_headers(host_id)
+    event = await create_event(host_id, min_guests=1)
+
+    response = await client.post(f"/api/events/{event['id']}/confirm", headers=host)
+    assert response.status_code == 400  # No confirmed guests yet
+
+    response = await client.post("/api/rsvps/", json={"event_id": event["id"]}, headers=auth_headers(guest_id))
+    rsvp_id = response.json()["id"]
+    response = await client.post(f"/api/rsvps/{rsvp_id}/status", json={"status": "confirmed"}, headers=host)
+    assert response.status_code == 200, response.text
+
+    response = await client.post(f"/api/events/{event['id']}/confirm", headers=host)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "confirmed"
+    assert response.json()["confirmed_guest_count"] == 1
+
+    response = await client.post(f"/api/rsvps/{rsvp_id}/status", json={"status": "attended"}, headers=host)
+    assert response.status_code == 200, response.text
+
+    response = await client.post(f"/api/events/{event['id']}/complete", headers=host)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "completed"
+
+    response = await client.post(f"/api/events/{event['id']}/complete", headers=host)
+    assert response.status_code == 400
+
+    response = await client.get("/api/users/me", headers=host)
+    assert response.json()["events_hosted"] == 1
+    assert response.json()["trust_score"] == settings.default_trust_score + settings.successful_event_bonus
+
+    response = await client.get("/api/users/me", headers=auth_headers(guest_id))
+    assert response.json()["events_attended"] == 1
+    assert response.json()["trust_score"] == settings.default_trust_score + settings.successful_event_bonus
+
+
+async def test_only_the_host_can_confirm(client, create_users, create_event, auth_headers):
+    host_id, other_id = await create_users(2)
+    event = await create_event(host_id)
+
+    response = await client.post(f"/api/events/{event['id']}/confirm", headers=auth_headers(other_id))
+    assert response.status_code == 403
+
+
+async def test_search(client, create_users, create_event):
+    host_id, = await create_users(1)
+    tacos = await create_event(host_id, title="Taco night", description="Tortillas from scratch")
+    ramen = await create_event(host_id, title="Ramen evening", location_name="Noodle bar")
+    await create_event(host_id, title="Secret taco party", is_public=False)
+
+    response = await client.get("/api/events/search", params={"q": "taco"})
+    assert response.status_code == 200, response.text
+    assert [item["id"] for item in response.json()["items"]] == [tacos["id"]]
+
+    # The last term also matches as a prefix
+    response = await client.get("/api/events/search", params={"q": "nood"})
+    assert [item["id"] for item in response.json()["items"]] == [ramen["id"]]
+
+    response = await client.get("/api/events/search", params={"q": "sushi"})
+    assert response.json()["items"] == []
+
+    # Operators are plain text, never query syntax
+    response = await client.get("/api/events/search", params={"q": 'taco" OR *'})
+    assert response.status_code == 200
@@ -0,0 +1,99 @@
+"""Concurrent food item claims through the API (see app.food_claims)"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import async_session_maker
+from app.event_counters import ACTIVE_STATUSES
+from app.models.event import EventFoodItem
+from app.models.rsvp import RSVP
+
+pytestmark = pytest.mark.anyio
+
+CLAIMS = 300
+QUANTITY = 25
+
+
+async def claim_state(food_item_id: int):
+    """(quantity_claimed, quantity_needed, active RSVPs holding the item)"""
+    async with async_session_maker() as db:
+        claimed, needed = (await db.execute(
+            select(EventFoodItem.quantity_claimed, EventFoodItem.quantity_needed)
+            .where(EventFoodItem.id == food_item_id)
+        )).one()
+        holders = (await db.execute(
+            select(func.count(RSVP.id))
+            .where(RSVP.food_item_id == food_item_id, RSVP.status.in_(ACTIVE_STATUSES))
+        )).scalar_one()
+        return claimed, needed, holders
+
+
+@pytest.fixture
+async def potluck(create_users, create_event):
+    """An event with room for everyone and one dish needing QUANTITY units"""
+    host_id, = await create_users(1)
+    event = await create_event(
+        host_id, max_guests=100, food_items=[{"name": "Dumplings", "quantity_needed": QUANTITY}],
+    )
+    return event["id"], event["food_items"][0]["id"]
+
+
+async def claim_all(client, auth_headers, event_id, food_item_id, user_ids):
+    return await asyncio.gather(*(
+        client.post(
+            "/api/rsvps/",
+            json={"event_id": event_id, "food_item_id": food_item_id},
+            headers=auth_headers(user_id),
+        )
+        for user_id in user_ids
+    ))
+
+
+async def test_concurrent_claims_stop_at_quantity_needed(client, potluck, create_users, auth_headers):
+    event_id, food_item_id = potluck
+    user_ids = await create_users(CLAIMS)
+
+    responses = await claim_all(client, auth_headers, event_id, food_item_id, user_ids)
+
+    accepted = [r for r in responses if r.status_code == 201]
+    rejected = [r for r in responses if r.status_code == 400 and "fully claimed" in r.text]
+    assert len(accepted) == QUANTITY
+    assert len(rejected) == CLAIMS - QUANTITY
+    assert await claim_state(food_item_id) == (QUANTITY, QUANTITY, QUANTITY)
+
+    # A claim that lost leaves no RSVP behind, so the event only counts the winners
+    response = await client.get(f"/api/events/{event_id}")
+    assert response.json()["available_spots"] == 100 - QUANTITY
+
+
+async def test_claims_racing_cancellations_never_overclaim(client, potluck, create_users, auth_headers):
+    event_id, food_item_id = potluck
+    first_wave = await create_users(QUANTITY)
+    responses = await claim_all(client, auth_headers, event_id, food_item_id, first_wave)
+    rsvps = {user_id: r.json()["id"] for user_id, r in zip(first_wave, responses) if r.status_code == 201}
+    assert len(rsvps) == QUANTITY
+
+    # Ten claimants cancel (each twice at once) while hundreds of others try to claim
+    leaving = list(rsvps.items())[:10]
+    second_wave = await create_users(CLAIMS)
+    cancels = [
+        client.post(f"/api/rsvps/{rsvp_id}/cancel", headers=auth_headers(user_id))
+        for user_id, rsvp_id in leaving
+        for _ in range(2)
+    ]
+    results = await asyncio.gather(*cancels, claim_all(client, auth_headers, event_id, food_item_id, second_wave))
+    cancel_responses, claim_responses = results[:-1], results[-1]
+
+    assert sum(1 for r in cancel_responses if r.status_code == 200) == len(leaving)
+    accepted = sum(1 for r in claim_responses if r.status_code == 201)
+    assert accepted <= len(leaving)
+    claimed, needed, holders = await claim_state(food_item_id)
+    assert claimed <= needed
+    assert claimed == holders == QUANTITY - len(leaving) + accepted
+
+    # Whatever the race left over is claimable, and no more
+    third_wave = await create_users(CLAIMS)
+    responses = await claim_all(client, auth_headers, event_id, food_item_id, third_wave)
+    assert sum(1 for r in responses if r.status_code == 201) == QUANTITY - claimed
+    assert await claim_state(food_item_id) == (QUANTITY, QUANTITY, QUANTITY)
@@ -0,0 +1,73 @@
+"""Invites hold reserved spots (events.reserved_rsvp_count)"""
+import asyncio
+
+import pytest
+
+from app.database import async_session_maker
+from app.event_counters import recompute_event_counters
+from app.models.event import Event
+
+pytestmark = pytest.mark.anyio
+
+RESERVED_SPOTS = 5
+
+
+async def reserved_count(event_id: int) -> int:
+    async with async_session_maker() as db:
+        return (await db.get(Event, event_id)).reserved_rsvp_count
+
+
+async def test_concurrent_invites_stay_within_reserved_spots(client, create_users, create_event, auth_headers):
+    host_id, *guest_ids = await create_users(41)
+    host = auth_headers(host_id)
+    event = await create_event(host_id, max_guests=20, reserved_spots=RESERVED_SPOTS)
+    usernames = [f"user_{i}" for i in range(1, 41)]
+
+    singles = [
+        client.post("/api/invites/", json={"event_id": event["id"], "username": name}, headers=host)
+        for name in usernames[:20]
+    ]
+    batches = [
+        client.post("/api/invites/batch", json={"event_id": event["id"], "usernames": usernames[start:start + 5]}, headers=host)
+        for start in range(20, 40, 5)
+    ]
+    responses = await asyncio.gather(*singles, *batches)
+
+    invited = sum(1 for r in responses[:20] if r.status_code == 201)
+    invited += sum(r.json()["invited"] for r in responses[20:])
+    assert invited == RESERVED_SPOTS
+    assert all(r.status_code in (201, 400) for r in responses[:20])
+    for r in responses[20:]:
+        assert {o["error"] for o in r.json()["results"] if not o["ok"]} <= {"No more reserved spots available"}
+
+    response = await client.get(f"/api/invites/event/{event['id']}", headers=host)
+    assert len(response.json()) == RESERVED_SPOTS
+    assert await reserved_count(event["id"]) == RESERVED_SPOTS
+
+
+async def test_declined_invite_frees_its_spot(client, create_users, create_event, auth_headers):
+    host_id, first_id, second_id = await create_users(3)
+    host = auth_headers(host_id)
+    event = await create_event(host_id, reserved_spots=1)
+
+    response = await client.post("/api/invites/", json={"event_id": event["id"], "username": "user_1"}, headers=host)
+    assert response.status_code == 201, response.text
+    invite_id = response.json()["id"]
+
+    response = await client.post("/api/invites/", json={"event_id": event["id"], "username": "user_2"}, headers=host)
+    assert response.status_code == 400
+
+    response = await client.post(f"/api/invites/{invite_id}/decline", headers=auth_headers(first_id))
+    assert response.status_code == 200
+    assert await reserved_count(event["id"]) == 0
+
+    response = await client.post("/api/invites/", json={"event_id": event["id"], "username": "user_2"}, headers=host)
+    assert response.status_code == 201, response.text
+    response = await client.post(f"/api/invites/{response.json()['id']}/accept", headers=auth_headers(second_id))
+    assert response.status_code == 200
+
+    before = await reserved_count(event["id"])
+    async with async_session_maker() as db:
+        await recompute_event_counters(db, [event["id"]])
+        await db.commit()
+    assert before == await reserved_count(event["id"]) == 1
@@ -0,0 +1,34 @@
+"""Referral codes at registration and the referrer's stats"""
+import pytest
+
+from app.config import get_settings
+
+pytestmark = pytest.mark.anyio
+
+settings = get_settings()
+
+
+async def test_referral_stats(client, create_users, auth_headers):
+    referrer_id, = await create_users(1)
+    headers = auth_headers(referrer_id)
+    code = (await client.get("/api/referrals/my-code", headers=headers)).json()["referral_code"]
+
+    response = await client.post("/api/auth/register", json={
+        "email": "friend@example.com", "username": "friend", "password": "password123", "referral_code": code.lower(),
+    })
+    assert response.status_code == 201, response.text
+
+    response = await client.get("/api/referrals/stats", headers=headers)
+    assert response.status_code == 200, response.text
+    stats = response.json()
+    assert stats["referral_code"] == code
+    assert stats["total_referrals"] == 1
+    assert stats["total_points_earned"] == settings.referral_bonus_points
+    assert [r["referred_username"] for r in stats["referrals"]] == ["friend"]
+
+
+async def test_invalid_referral_code(client):
+    response = await client.post("/api/auth/register", json={
+        "email": "friend@example.com", "username": "friend", "password": "password123", "referral_code": "NOPE",
+    })
+    assert response.status_code == 400
@@ -0,0 +1,102 @@
+"""Concurrent RSVP admission with mixed guest counts (see app.event_counters)"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import async_session_maker
+from app.event_counters import ACTIVE_STATUSES, recompute_event_counters
+from app.models.event import Event
+from app.models.rsvp import RSVP
+
+pytestmark = pytest.mark.anyio
+
+RSVPS = 300
+MAX_GUESTS = 60
+RESERVED_SPOTS = 5
+CAPACITY = MAX_GUESTS - RESERVED_SPOTS
+COUNTERS = ("pending_rsvp_count", "confirmed_rsvp_count", "active_guest_count", "reserved_rsvp_count")
+
+
+async def event_counters(event_id: int) -> dict:
+    async with async_session_maker() as db:
+        event = await db.get(Event, event_id)
+        return {column: getattr(event, column) for column in COUNTERS}
+
+
+async def recomputed_counters(event_id: int) -> dict:
+    """The counters as recompute_event_counters rebuilds them from the rsvps table"""
+    async with async_session_maker() as db:
+        await recompute_event_counters(db, [event_id])
+        await db.commit()
+    return await event_counters(event_id)
+
+
+async def active_guests(event_id: int) -> int:
+    async with async_session_maker() as db:
+        return (await db.execute(
+            select(func.coalesce(func.sum(RSVP.guest_count), 0))
+            .where(RSVP.event_id == event_id, RSVP.status.in_(ACTIVE_STATUSES))
+        )).scalar_one()
+
+
+@pytest.fixture
+async def event_id(create_users, create_event):
+    host_id, = await create_users(1)
+    event = await create_event(host_id, max_guests=MAX_GUESTS, reserved_spots=RESERVED_SPOTS)
+    return event["id"]
+
+
+async def rsvp_all(client, auth_headers, event_id, user_ids, sizes):
+    return await asyncio.gather(*(
+        client.post("/api/rsvps/", json={"event_id": event_id, "guest_count": size}, headers=auth_headers(user_id))
+        for user_id, size in zip(user_ids, sizes)
+    ))
+
+
+async def test_concurrent_rsvps_never_overbook(client, event_id, create_users, auth_headers):
+    user_ids = await create_users(RSVPS)
+    sizes = [1 + i % 3 for i in range(RSVPS)]
+
+    responses = await rsvp_all(client, auth_headers, event_id, user_ids, sizes)
+
+    admitted = [size for r, size in zip(responses, sizes) if r.status_code == 201]
+    full = [size for r, size in zip(responses, sizes) if r.status_code == 400 and "Not enough spots" in r.text]
+    assert len(admitted) + len(full) == RSVPS
+
+    counters = await event_counters(event_id)
+    assert counters["active_guest_count"] == sum(admitted) == await active_guests(event_id)
+    assert counters["active_guest_count"] <= CAPACITY
+    # Spots only shrink, so every RSVP turned away as full must not fit what is left
+    assert all(size > CAPACITY - sum(admitted) for size in full)
+    assert counters == await recomputed_counters(event_id)
+
+
+async def test_counters_hold_under_mixed_changes(client, event_id, create_users, auth_headers):
+    user_ids = await create_users(RSVPS)
+    sizes = [1 + i % 3 for i in range(RSVPS)]
+    first, second = user_ids[:40], user_ids[40:]
+    responses = await rsvp_all(client, auth_headers, event_id, first, sizes[:40])
+    admitted = [(user_id, r.json()["id"]) for user_id, r in zip(first, responses) if r.status_code == 201]
+
+    # Some guests cancel, some bring more people, while new RSVPs keep arriving
+    cancels = [
+        client.post(f"/api/rsvps/{rsvp_id}/cancel", headers=auth_headers(user_id))
+        for user_id, rsvp_id in admitted[0::3]
+    ]
+    grows = [
+        client.patch(f"/api/rsvps/{rsvp_id}", json={"guest_count": 3}, headers=auth_headers(user_id))
+        for user_id, rsvp_id in admitted[1::3]
+    ]
+    results = await asyncio.gather(
+        *cancels, *grows, rsvp_all(client, auth_headers, event_id, second, sizes[40:])
+    )
+
+    assert {r.status_code for r in results[:len(cancels)]} == {200}
+    assert {r.status_code for r in results[len(cancels):-1]} <= {200, 400}
+    assert {r.status_code for r in results[-1]} <= {201, 400}
+
+    counters = await event_counters(event_id)
+    assert counters["active_guest_count"] == await active_guests(event_id)
+    assert counters["active_guest_count"] <= CAPACITY
+    assert counters == await recomputed_counters(event_id)
@@ -13,10 +13,13 @@ export default function InviteGuestModal({ eventId, onClose }: InviteGuestModalP
   const [username, setUsername] = useState('')
   const queryClient = useQueryClient()
 
+  // Several usernames can be separated by commas or spaces
+  const usernames = username.split(/[\s,]+/).filter(Boolean)
+
   const inviteMutation = useMutation({
-    mutationFn: () => invitesApi.create(eventId, username),
+    mutationFn: () => invitesApi.create(eventId, usernames[0]),
     onSuccess: () => {
-      toast.success(`Invited ${username}!`)
+      toast.success(`Invited ${usernames[0]}!`)
       queryClient.invalidateQueries({ queryKey: ['event-rsvps', eventId] })
       setUsername('')
       onClose()
@@ -26,10 +29,39 @@ export default function InviteGuestModal({ eventId, onClose }: InviteGuestModalP
     },
   })
 
+  const batchInviteMutation = useMutation({
+    mutationFn: () => invitesApi.createBatch(eventId, usernames),
+    onSuccess: (data) => {
+      queryClient.invalidateQueries({ queryKey: ['event-rsvps', eventId] })
+      if (data.invited > 0) {
+        toast.success(`Invited ${data.invited} guest${data.invited === 1 ? '' : 's'}!`)
+      }
+      data.results
+        .filter((outcome) => !outcome.ok)
+        .forEach((outcome) => toast.error(`${outcome.username}: ${outcome.error}`))
+      if (data.failed === 0) {
+        setUsername('')
+        onClose()
+      } else {
+        // Leave the ones that failed in the box
+        setUsername(data.results.filter((outcome) => !outcome.ok).map((outcome) => outcome.username).join(', '))
+      }
+    },
+    onError: (error: any) => {
+      toast.error(error.response?.data?.detail || 'Failed to invite users')
+    },
+  })
+
+  const isPending = inviteMutation.isPending || batchInviteMutation.isPending
+
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault()
-    if (!username.trim()) return
-    inviteMutation.mutate()
+    if (usernames.length === 0) return
+    if (usernames.length === 1) {
+      inviteMutation.mutate()
+    } else {
+      batchInviteMutation.mutate()
+    }
   }
 
   return (
@@ -50,13 +82,13 @@ export default function InviteGuestModal({ eventId, onClose }: InviteGuestModalP
 
         <form onSubmit={handleSubmit}>
           <div className="mb-4">
-            <label className="label">Username</label>
+            <label className="label">Username(s)</label>
             <input
               type="text"
               value={username}
               onChange={(e) => setUsername(e.target.value)}
               className="input"
-              placeholder="Enter username to invite"
+              placeholder="Enter usernames to invite, separated by commas"
               autoFocus
             />
             <p className="text-sm text-gray-500 mt-1">
@@ -74,15 +106,15 @@ export default function InviteGuestModal({ eventId, onClose }: InviteGuestModalP
             </button>
             <button
               type="submit"
-              disabled={!username.trim() || inviteMutation.isPending}
+              disabled={usernames.length === 0 || isPending}
               className="btn-primary flex items-center"
             >
-              {inviteMutation.isPending ? (
+              {isPending ? (
                 <Loader2 className="h-5 w-5 animate-spin" />
               ) : (
                 <>
                   <UserPlus className="h-4 w-4 mr-1" />
-                  Send Invite
+                  {usernames.length > 1 ? `Send ${usernames.length} Invites` : 'Send Invite'}
                 </>
               )}
             </button>
@@ -2,11 +2,12 @@ import axios from 'axios'
 import type {
   User,
   Event,
-  EventListItem,
+  EventListPage,
   EventCreate,
   RSVP,
   RSVPWithEvent,
   RSVPCreate,
+  RSVPBulkStatusResponse,
   AuthResponse,
   ReferralStats,
   FoodItem,
@@ -100,13 +101,22 @@ export const usersApi = {
 
 // Events
 export const eventsApi = {
-  list: async (params?: { status?: string; upcoming_only?: boolean }): Promise<EventListItem[]> => {
+  list: async (params?: {
+    status?: string
+    upcoming_only?: boolean
+    date_from?: string
+    date_to?: string
+    min_available_spots?: number
+    host_id?: number
+    limit?: number
+    cursor?: string
+  }): Promise<EventListPage> => {
     const res = await api.get('/events', { params })
     return res.data
   },
 
-  getMyEvents: async (): Promise<EventListItem[]> => {
-    const res = await api.get('/events/my-events')
+  getMyEvents: async (params?: { limit?: number; cursor?: string }): Promise<EventListPage> => {
+    const res = await api.get('/events/my-events', { params })
     return res.data
   },
 
@@ -177,6 +187,14 @@ export const rsvpsApi = {
     const res = await api.post(`/rsvps/${rsvpId}/status`, { status })
     return res.data
   },
+
+  bulkUpdateStatus: async (
+    eventId: number,
+    updates: { rsvp_id: number; status: string }[]
+  ): Promise<RSVPBulkStatusResponse> => {
+    const res = await api.post(`/rsvps/event/${eventId}/status`, { updates })
+    return res.data
+  },
 }
 
 // Invites
@@ -189,12 +207,31 @@ export interface Invite {
   invited_at: string
 }
 
+export interface InviteOutcome {
+  username: string
+  ok: boolean
+  invite: Invite | null
+  error: string | null
+}
+
+export interface InviteBatchResponse {
+  event_id: number
+  invited: number
+  failed: number
+  results: InviteOutcome[]
+}
+
 export const invitesApi = {
   create: async (eventId: number, username: string): Promise<Invite> => {
     const res = await api.post('/invites', { event_id: eventId, username })
     return res.data
   },
 
+  createBatch: async (eventId: number, usernames: string[]): Promise<InviteBatchResponse> => {
+    const res = await api.post('/invites/batch', { event_id: eventId, usernames })
+    return res.data
+  },
+
   getEventInvites: async (eventId: number): Promise<Invite[]> => {
     const res = await api.get(`/invites/event/${eventId}`)
     return res.data
@@ -7,9 +7,9 @@ import { format } from 'date-fns'
 export default function Dashboard() {
   const { user } = useAuthStore()
 
-  const { data: myEvents } = useQuery({
+  const { data: myEventsPage } = useQuery({
     queryKey: ['my-events'],
-    queryFn: eventsApi.getMyEvents,
+    queryFn: () => eventsApi.getMyEvents(),
   })
 
   const { data: myRsvps } = useQuery({
@@ -17,7 +17,7 @@ export default function Dashboard() {
     queryFn: rsvpsApi.getMyRsvps,
   })
 
-  const upcomingHostedEvents = myEvents?.filter(
+  const upcomingHostedEvents = myEventsPage?.items.filter(
     (e) => e.status === 'open' || e.status === 'confirmed'
   ) || []
 
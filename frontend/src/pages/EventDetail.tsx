@@ -88,6 +88,17 @@ export default function EventDetail() {
     },
   })
 
+  const completeEventMutation = useMutation({
+    mutationFn: () => eventsApi.complete(Number(id)),
+    onSuccess: () => {
+      toast.success('Event marked as completed!')
+      queryClient.invalidateQueries({ queryKey: ['event', id] })
+    },
+    onError: (error: any) => {
+      toast.error(error.response?.data?.detail || 'Failed to complete event')
+    },
+  })
+
   const cancelEventMutation = useMutation({
     mutationFn: () => eventsApi.cancel(Number(id)),
     onSuccess: () => {
@@ -374,6 +385,20 @@ export default function EventDetail() {
                 </>
               )}
 
+              {event.needs_completion && (
+                <button
+                  onClick={() => completeEventMutation.mutate()}
+                  disabled={completeEventMutation.isPending}
+                  className="btn-primary w-full"
+                >
+                  {completeEventMutation.isPending ? (
+                    <Loader2 className="h-5 w-5 animate-spin mx-auto" />
+                  ) : (
+                    'Mark as Completed'
+                  )}
+                </button>
+              )}
+
               {['open', 'confirmed'].includes(event.status) && (
                 <button
                   onClick={() => {
@@ -414,7 +439,7 @@ export default function EventDetail() {
                     </button>
                   )}
                 </div>
-              ) : event.status === 'open' && event.available_spots > 0 ? (
+              ) : event.status === 'open' && !event.rsvps_closed && event.available_spots > 0 ? (
                 showRsvpForm ? (
                   <div className="space-y-4">
                     <h3 className="font-medium text-gray-900">RSVP to this event</h3>
@@ -502,7 +527,9 @@ export default function EventDetail() {
                 <p className="text-center text-gray-500">
                   {event.status !== 'open'
                     ? 'This event is not accepting RSVPs'
-                    : 'No spots available'}
+                    : event.rsvps_closed
+                      ? 'RSVPs are closed'
+                      : 'No spots available'}
                 </p>
               )}
             </div>
@@ -1,6 +1,6 @@
 import { useState } from 'react'
 import { Link } from 'react-router-dom'
-import { useQuery } from '@tanstack/react-query'
+import { useInfiniteQuery } from '@tanstack/react-query'
 import { eventsApi } from '../lib/api'
 import { useAuthStore } from '../store/authStore'
 import { format } from 'date-fns'
@@ -10,11 +10,15 @@ export default function Events() {
   const [statusFilter, setStatusFilter] = useState<string>('')
   const [searchQuery, setSearchQuery] = useState('')
 
-  const { data: events, isLoading } = useQuery({
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['events', statusFilter],
-    queryFn: () => eventsApi.list({ status: statusFilter || undefined }),
+    queryFn: ({ pageParam }) => eventsApi.list({ status: statusFilter || undefined, cursor: pageParam }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
   })
 
+  const events = data?.pages.flatMap((page) => page.items)
+
   const filteredEvents = events?.filter((event) =>
     event.title.toLowerCase().includes(searchQuery.toLowerCase()) ||
     event.location_name.toLowerCase().includes(searchQuery.toLowerCase())
@@ -99,6 +103,15 @@ export default function Events() {
               </div>
             </Link>
           ))}
+          {hasNextPage && (
+            <button
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+              className="btn-secondary w-full"
+            >
+              {isFetchingNextPage ? 'Loading...' : 'Load more'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -1,15 +1,19 @@
 import { Link } from 'react-router-dom'
-import { useQuery } from '@tanstack/react-query'
+import { useInfiniteQuery } from '@tanstack/react-query'
 import { eventsApi } from '../lib/api'
 import { Calendar, Users, Clock, Plus, Loader2 } from 'lucide-react'
 import { format } from 'date-fns'
 
 export default function MyEvents() {
-  const { data: events, isLoading } = useQuery({
-    queryKey: ['my-events'],
-    queryFn: eventsApi.getMyEvents,
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
+    queryKey: ['my-events', 'pages'],
+    queryFn: ({ pageParam }) => eventsApi.getMyEvents({ cursor: pageParam }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
   })
 
+  const events = data?.pages.flatMap((page) => page.items)
+
   const getStatusBadge = (status: string) => {
     switch (status) {
       case 'draft':
@@ -92,6 +96,15 @@ export default function MyEvents() {
               </div>
             </Link>
           ))}
+          {hasNextPage && (
+            <button
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+              className="btn-secondary w-full"
+            >
+              {isFetchingNextPage ? 'Loading...' : 'Load more'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -61,6 +61,8 @@ export interface Event {
   available_spots: number
   confirmed_guest_count: number
   can_be_confirmed: boolean
+  rsvps_closed: boolean
+  needs_completion: boolean
   food_items: FoodItem[]
   created_at: string
 }
@@ -78,6 +80,11 @@ export interface EventListItem {
   host_trust_score: number | null
 }
 
+export interface EventListPage {
+  items: EventListItem[]
+  next_cursor: string | null
+}
+
 export type EventStatus = 'draft' | 'open' | 'confirmed' | 'cancelled' | 'completed'
 
 export interface EventCreate {
@@ -131,6 +138,21 @@ export interface RSVPCreate {
   food_notes?: string
 }
 
+export interface RSVPStatusResult {
+  rsvp_id: number
+  ok: boolean
+  status: RSVPStatus | null
+  previous_status: RSVPStatus | null
+  error: string | null
+}
+
+export interface RSVPBulkStatusResponse {
+  event_id: number
+  updated: number
+  failed: number
+  results: RSVPStatusResult[]
+}
+
 export interface ReferralStats {
   referral_code: string
   total_referrals: number